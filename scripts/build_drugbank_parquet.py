@@ -11,22 +11,30 @@ from __future__ import annotations
 import argparse
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, List, Optional
 
 import pandas as pd
 
+ROW_GROUP_SIZE = 8192
+
 try:
     from lxml import etree as ET
 except Exception:
     import xml.etree.ElementTree as ET
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Converters map this over every cell of multi-million-row columns where the same
+# drug and side-effect names repeat, so the string path is memoized.
+@lru_cache(maxsize=1 << 16)
+def _norm_str(s: str) -> str:
+    return _WHITESPACE_RE.sub(" ", s.replace("\xa0", " ").strip())
+
 def _norm_name(s: Optional[str]) -> Optional[str]:
     if s is None:
         return None
-    s = str(s)
-    s = s.replace("\xa0", " ").strip()
-    s = re.sub(r"\s+", " ", s)
-    return s
+    return _norm_str(s if isinstance(s, str) else str(s))
 
 def _norm_name_lower(s: Optional[str]) -> Optional[str]:
     s = _norm_name(s)
@@ -451,7 +459,9 @@ def convert_drugbank_xml(xml_path: str, out_parquet: str, xsd_path: Optional[str
         df.loc[df["enzyme_action_map"] == "nan", "enzyme_action_map"] = "[]"
 
     Path(out_parquet).parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(out_parquet, index=False)
+    # Name-sorted small row groups let DuckDB prune by min/max stats on `name_lower = ?`.
+    df = df.sort_values("name_lower", kind="stable").reset_index(drop=True)
+    df.to_parquet(out_parquet, index=False, row_group_size=ROW_GROUP_SIZE)
     print(f"[OK] DrugBank â†’ {out_parquet}  (rows={len(df)})")
 
 
@@ -526,7 +536,10 @@ def add_enzyme_action_map(parquet_path: str, output_path: str | None = None) ->
 
     df["enzyme_action_map"] = df["enzyme_action_map"].fillna("[]").astype(str)
     output.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(output, index=False)
+    # Keep the name-sorted row-group layout of build_drugbank_parquet.
+    if "name_lower" in df.columns:
+        df = df.sort_values("name_lower", kind="stable").reset_index(drop=True)
+    df.to_parquet(output, index=False, row_group_size=ROW_GROUP_SIZE)
     print(f"[OK] patched DrugBank enzyme_action_map -> {output} (rows={len(df)})")
 
 def _build_cli() -> argparse.ArgumentParser:
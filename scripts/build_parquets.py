@@ -19,6 +19,7 @@ from __future__ import annotations
 import argparse
 import re
 import zipfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
@@ -27,13 +28,18 @@ import pandas as pd
 ################################################################################
 # Utilities
 ################################################################################
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Converters map this over every cell of multi-million-row columns where the same
+# drug and side-effect names repeat, so the string path is memoized.
+@lru_cache(maxsize=1 << 16)
+def _norm_str(s: str) -> str:
+    return _WHITESPACE_RE.sub(" ", s.replace("\xa0", " ").strip())
+
 def _norm_name(s: Optional[str]) -> Optional[str]:
     if s is None:
         return None
-    s = str(s)
-    s = s.replace("\xa0", " ").strip()
-    s = re.sub(r"\s+", " ", s)
-    return s
+    return _norm_str(s if isinstance(s, str) else str(s))
 
 def _norm_name_lower(s: Optional[str]) -> Optional[str]:
     s = _norm_name(s)
@@ -61,6 +67,15 @@ def _choose_first_nonnull(df: pd.DataFrame, candidates: Iterable[str]) -> Option
             return c
     return None
 
+# Small row groups over name-sorted rows give tight per-group min/max statistics, so
+# DuckDB can skip every row group but the matching one for `WHERE drug_name = ?`.
+ROW_GROUP_SIZE = 8192
+
+def _write_sorted_parquet(df: pd.DataFrame, out_parquet: str, sort_by: List[str]) -> None:
+    # Stable sort keeps duplicate names in source order (the row LIMIT 1 lookups return).
+    out = df.sort_values(sort_by, kind="stable").reset_index(drop=True)
+    out.to_parquet(out_parquet, index=False, row_group_size=ROW_GROUP_SIZE)
+
 def convert_twosides_csv(csv_path: str, out_parquet: str) -> None:
     """
     Normalize TwoSides to tidy long format:
@@ -148,9 +163,17 @@ def convert_twosides_csv(csv_path: str, out_parquet: str) -> None:
     out = out[out["drug_a"] != out["drug_b"]].reset_index(drop=True)
 
     Path(out_parquet).parent.mkdir(parents=True, exist_ok=True)
-    out.to_parquet(out_parquet, index=False)
+    _write_sorted_parquet(out, out_parquet, ["drug_a", "drug_b"])
     print(f"[OK] TwoSides â†’ {out_parquet}  (rows={len(out)})")
 
+    # Both orderings of every pair, sorted by drug_a: the retrieval layer reads this directly
+    # instead of a UNION ALL over twosides, and row-group stats prune `drug_a = ?` lookups.
+    sym_parquet = str(Path(out_parquet).with_name("twosides_sym.parquet"))
+    swapped = out.rename(columns={"drug_a": "drug_b", "drug_b": "drug_a"})[out.columns]
+    sym = pd.concat([out, swapped], ignore_index=True)
+    _write_sorted_parquet(sym, sym_parquet, ["drug_a", "drug_b"])
+    print(f"[OK] TwoSides (symmetric) â†’ {sym_parquet}  (rows={len(sym)})")
+
 
 ################################################################################
 # DICTRank Excel â†’ Parquet
@@ -185,7 +208,7 @@ def convert_offsides_csv(csv_path: str, out_parquet: str) -> None:
     out = out[(out["drug_name"] != "") & (out["side_effect"] != "")]
     out = out.drop_duplicates(subset=["drug_name", "side_effect"])
     Path(out_parquet).parent.mkdir(parents=True, exist_ok=True)
-    out.to_parquet(out_parquet, index=False)
+    _write_sorted_parquet(out, out_parquet, ["drug_name"])
     print(f"[OK] OFFSIDES -> {out_parquet}  (rows={len(out)})")
 
 
@@ -230,7 +253,7 @@ def convert_sider_label_side_effects(
     out = out[(out["drug_name"] != "") & (out["side_effect"] != "")]
     out = out.drop_duplicates(subset=["drug_name", "side_effect"])
     Path(out_parquet).parent.mkdir(parents=True, exist_ok=True)
-    out.to_parquet(out_parquet, index=False)
+    _write_sorted_parquet(out, out_parquet, ["drug_name"])
     print(f"[OK] SIDER label SE -> {out_parquet}  (rows={len(out)})")
 
 
@@ -286,7 +309,8 @@ def convert_nci_almanac_zip(
     compound_out_p.parent.mkdir(parents=True, exist_ok=True)
 
     compounds = _load_nci_compound_names(compound_names_path)
-    compounds.to_parquet(compound_out_p, index=False)
+    # Sorted copy for `drug_name = ?` row-group pruning; the NSC maps below keep source order.
+    _write_sorted_parquet(compounds, str(compound_out_p), ["drug_name", "nsc"])
     canonical_by_nsc: Dict[str, str] = compounds.drop_duplicates(subset=["nsc"], keep="first").set_index("nsc")["drug_name"].to_dict()
     display_by_nsc: Dict[str, str] = compounds.drop_duplicates(subset=["nsc"], keep="first").set_index("nsc")["display_name"].to_dict()
 
@@ -445,7 +469,7 @@ def convert_dictrank_excel(xlsx_path: str, out_parquet: str) -> None:
     out = out.dropna(subset=["drug_name"])
 
     Path(out_parquet).parent.mkdir(parents=True, exist_ok=True)
-    out.to_parquet(out_parquet, index=False)
+    _write_sorted_parquet(out, out_parquet, ["drug_name"])
     print(f"[OK] DICTRank â†’ {out_parquet}  (rows={len(out)}, with_score={out['score'].notna().sum()})")
 
 ################################################################################
@@ -526,7 +550,7 @@ def convert_dilirank_excel(xlsx_path: str, out_parquet: str) -> None:
     out = out.dropna(subset=["drug_name"])
 
     Path(out_parquet).parent.mkdir(parents=True, exist_ok=True)
-    out.to_parquet(out_parquet, index=False)
+    _write_sorted_parquet(out, out_parquet, ["drug_name"])
     print(f"[OK] DILIRank â†’ {out_parquet}  (rows={len(out)}, with_score={out['dili_score'].notna().sum()})")
 
 ################################################################################
@@ -600,7 +624,7 @@ def convert_diqt_excel(xlsx_path: str, out_parquet: str) -> None:
     ).dropna(subset=["drug_name", "score"])  # Only keep rows with both name and score
 
     Path(out_parquet).parent.mkdir(parents=True, exist_ok=True)
-    out.to_parquet(out_parquet, index=False)
+    _write_sorted_parquet(out, out_parquet, ["drug_name"])
     print(f"[OK] DIQT â†’ {out_parquet}  (rows={len(out)}, with_score={out['score'].notna().sum()})")
 
 ################################################################################
@@ -162,11 +162,17 @@ class Settings:
     data_manifest_path: str = "data_manifest.yaml"
     duckdb_dir: str = "data/duckdb"
     openfda_cache_dir: str = "data/cache/openfda"
+    chembl_cache_dir: str = "data/cache/chembl"
+    kegg_cache_dir: str = "data/cache/kegg"
     cache_backend: str = "file"
     sqlite_cache_path: str = "data/cache/infermed_cache.sqlite"
     enable_event_store: bool = False
+    pretty_context_cache: bool = False
     openfda_ttl_days: int = 30
     chembl_timeout_s: int = 10
+    duckdb_threads: int = 0  # 0 = one per CPU
+    duckdb_memory_limit: str = ""  # empty = DuckDB's default (80% of RAM)
+    duckdb_refresh_seconds: int = 3600  # how often to re-check parquet files; 0 = never
 
     enable_duckdb: bool = True
     enable_drugbank: bool = False
@@ -234,11 +240,19 @@ def get_settings() -> Settings:
         data_manifest_path=_config_str(config, "runtime.data_manifest_path", _DEFAULT_DATA_CONFIG_PATH, env_name="DATA_MANIFEST_PATH"),
         duckdb_dir=_config_str(config, "runtime.paths.duckdb_dir", "data/duckdb", env_name="DUCKDB_DIR"),
         openfda_cache_dir=_config_str(config, "runtime.paths.openfda_cache_dir", "data/cache/openfda", env_name="OPENFDA_CACHE_DIR"),
+        chembl_cache_dir=_config_str(config, "runtime.paths.chembl_cache_dir", "data/cache/chembl", env_name="CHEMBL_CACHE_DIR"),
+        kegg_cache_dir=_config_str(config, "runtime.paths.kegg_cache_dir", "data/cache/kegg", env_name="KEGG_CACHE_DIR"),
         cache_backend=cache_backend,
         sqlite_cache_path=_config_str(config, "runtime.cache.sqlite_cache_path", "data/cache/infermed_cache.sqlite", env_name="SQLITE_CACHE_PATH"),
         enable_event_store=_config_bool(config, "runtime.cache.enable_event_store", cache_backend == "sqlite", env_name="ENABLE_EVENT_STORE"),
+        pretty_context_cache=_config_bool(config, "runtime.cache.pretty_context_cache", False, env_name="PRETTY_CONTEXT_CACHE"),
         openfda_ttl_days=_config_int(config, "runtime.source_settings.openfda_ttl_days", 30, env_name="OPENFDA_TTL_DAYS"),
         chembl_timeout_s=_config_int(config, "runtime.source_settings.chembl_timeout_s", 10, env_name="CHEMBL_TIMEOUT"),
+        duckdb_threads=_config_int(config, "runtime.source_settings.duckdb_threads", 0, env_name="DUCKDB_THREADS"),
+        duckdb_memory_limit=_config_str(config, "runtime.source_settings.duckdb_memory_limit", "", env_name="DUCKDB_MEMORY_LIMIT"),
+        duckdb_refresh_seconds=_config_int(
+            config, "runtime.source_settings.duckdb_refresh_seconds", 3600, env_name="DUCKDB_REFRESH_SECONDS"
+        ),
         enable_duckdb=_config_bool(config, "runtime.sources.duckdb", True, env_name="ENABLE_DUCKDB"),
         enable_drugbank=enable_drugbank,
         enable_qlever=enable_qlever,
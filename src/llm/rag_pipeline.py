@@ -2,23 +2,30 @@
 from __future__ import annotations
 
 import os
+import gzip
 import json
 import hashlib
 import logging
 import re
+import tempfile
+import time
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
 from dataclasses import asdict
+from functools import lru_cache
+from itertools import chain
 from typing import Any, Callable, Dict, Tuple, Optional, List
-from datetime import datetime, timezone
 from collections.abc import Mapping  # <-- for _jsonify_sets
 
 LOG = logging.getLogger(__name__)
 
 from src.config.data_policy import get_source_status
 from src.config.settings import get_settings
+from src.utils.caching import _loads, orjson  # orjson is None when not installed
+from src.utils.sqlite_cache import SQLiteCache
 
 # Retrieval modules
 from src.retrieval import duckdb_query as dq
+from src.retrieval.duckdb_query import shared_client
 from src.retrieval.openfda_api import OpenFDAClient
 from src.retrieval import qlever_query as ql  # may expose get_mechanistic_enriched / get_mechanistic
 from src.retrieval.semantic_search import get_semantic_searcher, SemanticSearcher
@@ -73,7 +80,15 @@ CTX_DIR   = os.path.join(CACHE_DIR, "contexts")
 # Legacy path retained for external callers that may still monkeypatch/import it.
 # New LLM response text is not written to disk.
 RESP_DIR  = os.path.join(CACHE_DIR, "responses")
-os.makedirs(CTX_DIR, exist_ok=True)
+_ENSURED_DIRS: set = set()
+
+
+def _ensure_dirs() -> None:
+    """Create the context cache dir on first write instead of at import time."""
+    if CTX_DIR in _ENSURED_DIRS:
+        return
+    os.makedirs(CTX_DIR, exist_ok=True)
+    _ENSURED_DIRS.add(CTX_DIR)
 
 
 def _sha(obj: Any) -> str:
@@ -85,10 +100,51 @@ def _ctx_path(key: str) -> str:
     return os.path.join(CTX_DIR, f"{key}.json")
 
 
+_CTX_EXTS = (".json.gz", ".json")  # compact gzip first; plain JSON is debug/legacy
+
+
+def _ctx_key_from_name(name: str) -> Optional[str]:
+    for ext in _CTX_EXTS:
+        if name.endswith(ext):
+            return name[: -len(ext)]
+    return None
+
+
+def _read_context_path(path: str) -> Dict[str, Any]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        raw = f.read()
+    return _loads(raw)
+
+
+def _read_context_file(key: str) -> Optional[Dict[str, Any]]:
+    """Load a cached context by key, preferring the gzip file over a plain/legacy one."""
+    base = _ctx_path(key)
+    for path in (base + ".gz", base):
+        try:
+            return _read_context_path(path)
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def _remove_context_files(key: str) -> bool:
+    removed = False
+    base = _ctx_path(key)
+    for path in (base + ".gz", base):
+        try:
+            os.remove(path)
+            removed = True
+        except FileNotFoundError:
+            pass
+    return removed
+
+
 def _resp_path(key: str) -> str:
     return os.path.join(RESP_DIR, f"{key}.json")
 
 
+@lru_cache(maxsize=4096)
 def _pair_key(drugA: str, drugB: str) -> str:
     """Stable cache key for unordered pairs: A+B == B+A."""
     a, b = drugA.strip().lower(), drugB.strip().lower()
@@ -103,6 +159,7 @@ def _cache_slug(value: str) -> str:
     return slug[:80] or "unknown"
 
 
+@lru_cache(maxsize=4096)
 def _context_cache_key(drugA: str, drugB: str) -> str:
     """Readable cache filename stem preserving the first entered pair order."""
     return f"{_cache_slug(drugA)}_{_cache_slug(drugB)}"
@@ -110,7 +167,13 @@ def _context_cache_key(drugA: str, drugB: str) -> str:
 
 def _legacy_context_cache_key(drugA: str, drugB: str) -> str:
     """Previous opaque context cache key retained for one-way migration."""
-    return _sha({"pair": _pair_key(drugA, drugB), "v": VERSION})
+    return _ctx_key(drugA, drugB, VERSION)
+
+
+@lru_cache(maxsize=4096)
+def _ctx_key(drugA: str, drugB: str, version: int) -> str:
+    # VERSION is part of the memo key so a schema bump never serves a stale hash.
+    return _sha({"pair": _pair_key(drugA, drugB), "v": version})
 
 
 def _context_cache_candidates(drugA: str, drugB: str) -> List[str]:
@@ -133,20 +196,50 @@ def _find_context_cache_by_pair(drugA: str, drugB: str) -> Tuple[Optional[Dict[s
     if not os.path.isdir(CTX_DIR):
         return None, None
     for name in os.listdir(CTX_DIR):
-        if not name.endswith(".json"):
+        key = _ctx_key_from_name(name)
+        if key is None:
             continue
-        path = os.path.join(CTX_DIR, name)
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                ctx = json.load(f)
+            ctx = _read_context_path(os.path.join(CTX_DIR, name))
         except Exception:
             continue
         meta = ctx.get("meta") or {}
         if meta.get("pair_key") == pair_key and _context_cache_version_ok(ctx):
-            return ctx, os.path.splitext(name)[0]
+            return ctx, key
     return None, None
 
 
+@lru_cache(maxsize=4)
+def _sqlite_context_store(path: str) -> SQLiteCache:
+    # One store per path: SQLiteCache runs its CREATE TABLE/INDEX on construction.
+    return SQLiteCache(path)
+
+
+def _context_store() -> Optional[SQLiteCache]:
+    """SQLite context store when ``CACHE_BACKEND=sqlite``; None keeps the per-file cache."""
+    settings = get_settings()
+    if (settings.cache_backend or "").strip().lower() != "sqlite":
+        return None
+    return _sqlite_context_store(settings.sqlite_cache_path)
+
+
+def _context_store_key(drugA: str, drugB: str) -> str:
+    # Keyed by the unordered pair, so one indexed lookup replaces the per-candidate
+    # stat/open probes and the CTX_DIR scan of the file backend.
+    return f"context:v{VERSION}:{_pair_key(drugA, drugB)}"
+
+
+def _load_context_entry(store: SQLiteCache, drugA: str, drugB: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Return ``(ctx, cache_key)`` from the SQLite store, keeping the first stored pair order."""
+    entry = store.get_json(_context_store_key(drugA, drugB))
+    if not isinstance(entry, dict) or not isinstance(entry.get("context"), dict):
+        return None, None
+    ctx = entry["context"]
+    if not _context_cache_version_ok(ctx):
+        return None, None
+    return ctx, entry.get("key") or _context_cache_key(drugA, drugB)
+
+
 def _jsonify_sets(obj):
     """Recursively convert sets to sorted lists so json.dump succeeds."""
     if isinstance(obj, set):
@@ -160,6 +253,52 @@ def _jsonify_sets(obj):
     return obj
 
 
+def _write_context_json(path: str, ctx: Dict[str, Any]) -> None:
+    """
+    Atomically write a context cache file (temp file + os.replace), so a crash
+    mid-write never leaves a truncated JSON that forces a slow cold retrieval.
+
+    Contexts are written as compact JSON gzipped at level 1 to ``<path>.gz``;
+    ``pretty_context_cache`` keeps the indented plain ``<path>`` for debugging.
+    Whichever variant is not written is removed so reads never see a stale copy.
+    """
+    _ensure_dirs()
+    pretty = get_settings().pretty_context_cache
+    data: Optional[bytes] = None
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        try:
+            data = orjson.dumps(ctx, option=option)
+        except TypeError:
+            data = None
+    if data is None:
+        if pretty:
+            data = json.dumps(ctx, ensure_ascii=False, indent=2).encode("utf-8")
+        else:
+            data = json.dumps(ctx, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if pretty:
+        stale_path = path + ".gz"
+    else:
+        data = gzip.compress(data, compresslevel=1)
+        path, stale_path = path + ".gz", path
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".ctx-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    try:
+        os.remove(stale_path)
+    except FileNotFoundError:
+        pass
+
+
 def _to_pairs_list(x):
     """Normalize a list of (term, count) tuples to JSON-stable [[term, count], ...]."""
     out = []
@@ -300,8 +439,9 @@ def _normalize_chembl_side(value: Any) -> Dict[str, Any]:
         "matches": _append_unique([], validation.get("matches")),
         "mismatches": _append_unique([], validation.get("mismatches")),
     }
-    if not isinstance(out.get("enzymes"), Mapping):
-        out["enzymes"] = {}
+    enzymes = out.get("enzymes")
+    # ChEMBL hands back a read-only view of tuples; store plain JSON-friendly containers.
+    out["enzymes"] = {k: list(v or []) for k, v in enzymes.items()} if isinstance(enzymes, Mapping) else {}
     return out
 
 
@@ -1042,7 +1182,36 @@ def _research_enrichment_has_content(enrichment: Dict[str, Any]) -> bool:
     )
 
 
+# Content hash of the last side-effect term set handed to build_side_effect_index,
+# per searcher. build_side_effect_index(force_rebuild=False) reloads its pickle
+# on every call, so identical term sets are skipped entirely.
+_SE_INDEX_HASH: Optional[Tuple[int, bytes]] = None
+
+
+def _ensure_side_effect_index(searcher: Any, side_effects: List[str]) -> None:
+    global _SE_INDEX_HASH
+    if not side_effects:
+        return
+    digest = hashlib.blake2b("\x1f".join(sorted(set(side_effects))).encode("utf-8"), digest_size=16).digest()
+    key = (id(searcher), digest)
+    if key == _SE_INDEX_HASH:
+        return
+    if searcher.build_side_effect_index(side_effects, force_rebuild=False):
+        _SE_INDEX_HASH = key
+
+
 # ----------------- public pipeline -----------------
+def shared_db(parquet_dir: str = "data/duckdb", caveats: Optional[List[str]] = None) -> Any:
+    """The shared DuckDB client, built through ``dq`` so a swapped-in module is honored."""
+    return shared_client(parquet_dir, caveats, client_cls=dq.DuckDBClient, connect=dq.init_duckdb_connection)
+
+
+@lru_cache(maxsize=4)
+def _get_openfda(client_cls: Callable[..., Any], cache_dir: str) -> Any:
+    """Shared OpenFDA client per cache dir, keeping its HTTP session pooled across calls."""
+    return client_cls(cache_dir=cache_dir)
+
+
 def retrieve_and_normalize(
     drugA: str,
     drugB: str,
@@ -1058,24 +1227,8 @@ def retrieve_and_normalize(
     settings = get_settings()
     caveats: List[str] = []
 
-    # 1) DuckDB init (idempotent)
-    try:
-        dq.init_duckdb_connection(
-            parquet_dir,
-            enable_drugbank=settings.enable_drugbank,
-            enable_duckdb=settings.enable_duckdb,
-            enable_nci_almanac=settings.enable_nci_almanac,
-        )
-    except Exception as e:
-        caveats.append(f"DuckDB init failed: {e}")
-
-    # NEW: instantiate DuckDBClient for method-based API
-    db = dq.DuckDBClient(
-        parquet_dir,
-        enable_drugbank=settings.enable_drugbank,
-        enable_duckdb=settings.enable_duckdb,
-        enable_nci_almanac=settings.enable_nci_almanac,
-    )
+    # 1) DuckDB init (idempotent) + DuckDBClient for method-based API
+    db = shared_db(parquet_dir, caveats)
 
     a, b = drugA, drugB
 
@@ -1086,6 +1239,9 @@ def retrieve_and_normalize(
     se_a_raw: List[str] = []
     se_b_raw: List[str] = []
     se_pair_raw: List[str] = []
+    prr_data_a: Dict[str, float] = {}
+    prr_data_b: Dict[str, float] = {}
+    prr_data_pair: Dict[str, float] = {}
     nci_almanac_rows: List[Dict[str, Any]] = []
     db_targets_a: List[str] = []
     db_targets_b: List[str] = []
@@ -1163,30 +1319,35 @@ def retrieve_and_normalize(
             # First get keyword results to build index if needed
             keyword_results = db.get_side_effects(query, top_k=k * 2) or []
             if keyword_results:
-                semantic_searcher.build_side_effect_index(keyword_results, force_rebuild=False)
+                _ensure_side_effect_index(semantic_searcher, keyword_results)
             # Search for similar side effects
             similar = semantic_searcher.search_similar_side_effects(query, top_k=k, threshold=threshold)
             return similar
 
+        # The search functions above are rebuilt per call; key cached results on what they search
+        side_effect_backends = ("side_effects", db, semantic_searcher)
+
         # Use adaptive hybrid search for drug A
         se_a_results, se_a_metadata = adaptive_hybrid_search(
             a,
-            keyword_search_fn=lambda q, k: keyword_search_side_effects(q, k),
-            semantic_search_fn=lambda q, k, t: semantic_search_side_effects(q, k, t),
+            keyword_search_fn=keyword_search_side_effects,
+            semantic_search_fn=semantic_search_side_effects,
             initial_k=topk_side_effects,
             min_relevance_threshold=0.3,
-            max_k=topk_side_effects * 4
+            max_k=topk_side_effects * 4,
+            cache_namespace=side_effect_backends,
         )
         se_a_raw = [se for se, _ in se_a_results]
 
         # Use adaptive hybrid search for drug B
         se_b_results, se_b_metadata = adaptive_hybrid_search(
             b,
-            keyword_search_fn=lambda q, k: keyword_search_side_effects(q, k),
-            semantic_search_fn=lambda q, k, t: semantic_search_side_effects(q, k, t),
+            keyword_search_fn=keyword_search_side_effects,
+            semantic_search_fn=semantic_search_side_effects,
             initial_k=topk_side_effects,
             min_relevance_threshold=0.3,
-            max_k=topk_side_effects * 4
+            max_k=topk_side_effects * 4,
+            cache_namespace=side_effect_backends,
         )
         se_b_raw = [se for se, _ in se_b_results]
 
@@ -1215,63 +1376,64 @@ def retrieve_and_normalize(
                 if se_pair_raw:
                     break
 
-        # Get pair PRR using the dedicated method
-        prr_pair = db.get_interaction_score(a, b)
-        if prr_pair == 0.0:
-            prr_pair = None
-
-        # Get PRR data for side effects (for relevance scoring)
-        prr_data_a = {}
-        prr_data_b = {}
+        # Get PRR data for side effects (for relevance scoring): one IN-list query per
+        # drug and one for the pair. The pair PRR is the max over the pair rows.
         try:
-            # Get PRR for each side effect
-            for se in se_a_raw:
-                rows = db._con.execute(
-                    "SELECT MAX(prr) FROM twosides WHERE (drug_a = ? OR drug_b = ?) AND side_effect = ?",
-                    [a.lower(), a.lower(), se]
-                ).fetchall()
-                if rows and rows[0][0]:
-                    prr_data_a[se] = float(rows[0][0])
-
-            for se in se_b_raw:
-                rows = db._con.execute(
-                    "SELECT MAX(prr) FROM twosides WHERE (drug_a = ? OR drug_b = ?) AND side_effect = ?",
-                    [b.lower(), b.lower(), se]
-                ).fetchall()
-                if rows and rows[0][0]:
-                    prr_data_b[se] = float(rows[0][0])
+            if hasattr(db, "get_side_effect_prrs"):
+                prr_data_a = db.get_side_effect_prrs(a, se_a_raw)
+                prr_data_b = db.get_side_effect_prrs(b, se_b_raw)
+                prr_data_pair = db.get_side_effect_prrs(a, se_pair_raw, drug_b=b)
+                prr_pair = max(prr_data_pair.values()) if prr_data_pair else None
+            else:
+                prr_pair = db.get_interaction_score(a, b) or None
         except Exception:
             pass  # PRR data is optional for scoring
 
-        # Risk scores - using legacy methods that return numeric scores for compatibility
-        dili_a = db.get_dilirank_score(a)  # float or None
-        dili_b = db.get_dilirank_score(b)
-        dict_a = db.get_dictrank_score(a)  # float or None
-        dict_b = db.get_dictrank_score(b)
-        diqt_a = db.get_diqt_score(a)
-        diqt_b = db.get_diqt_score(b)
+        # Risk scores (numeric, legacy semantics) and exact-name DrugBank targets for
+        # both drugs; one DuckDB round-trip when the client supports it.
+        db_targets_a = []
+        db_targets_b = []
+        targets_tried: set = set()
+        if hasattr(db, "get_risk_bundle"):
+            bundle = db.get_risk_bundle(a, b)
+            dili_a, dili_b = bundle.get("dili_a"), bundle.get("dili_b")
+            dict_a, dict_b = bundle.get("dict_a"), bundle.get("dict_b")
+            diqt_a, diqt_b = bundle.get("diqt_a"), bundle.get("diqt_b")
+            db_targets_a = bundle.get("targets_a") or []
+            db_targets_b = bundle.get("targets_b") or []
+            targets_tried = {a, b}
+        else:
+            dili_a = db.get_dilirank_score(a)  # float or None
+            dili_b = db.get_dilirank_score(b)
+            dict_a = db.get_dictrank_score(a)  # float or None
+            dict_b = db.get_dictrank_score(b)
+            diqt_a = db.get_diqt_score(a)
+            diqt_b = db.get_diqt_score(b)
         nci_almanac_rows = db.get_nci_almanac_pair(a, b, top_k=12) if hasattr(db, "get_nci_almanac_pair") else []
 
         # DrugBank targets (PD fallback) - use query expansion
-        db_targets_a = []
-        db_targets_b = []
-        # Try expanded terms for targets
-        for expanded_term_a in expanded_a:
-            targets = db.get_drug_targets(expanded_term_a) or []
-            if targets:
-                db_targets_a = targets
-                break
-
-        for expanded_term_b in expanded_b:
-            targets = db.get_drug_targets(expanded_term_b) or []
-            if targets:
-                db_targets_b = targets
-                break
+        if not db_targets_a:
+            for expanded_term_a in expanded_a:
+                if expanded_term_a in targets_tried:
+                    continue
+                targets = db.get_drug_targets(expanded_term_a) or []
+                if targets:
+                    db_targets_a = targets
+                    break
+
+        if not db_targets_b:
+            for expanded_term_b in expanded_b:
+                if expanded_term_b in targets_tried:
+                    continue
+                targets = db.get_drug_targets(expanded_term_b) or []
+                if targets:
+                    db_targets_b = targets
+                    break
 
         # Fallback to original if no expanded terms found targets
-        if not db_targets_a:
+        if not db_targets_a and a not in targets_tried:
             db_targets_a = db.get_drug_targets(a) or []
-        if not db_targets_b:
+        if not db_targets_b and b not in targets_tried:
             db_targets_b = db.get_drug_targets(b) or []
 
     except Exception as e:
@@ -1320,17 +1482,25 @@ def retrieve_and_normalize(
     pathways_b = mech.get("pathways_b", [])
     common_pathways = mech.get("common_pathways", []) or []
 
+    pathway_scores: Dict[str, float] = {}
     if pathways_a:
         scored_pathways_a = score_and_rank_pathways(pathways_a, query_context, common_pathways)
+        pathway_scores.update(scored_pathways_a)
         mech["pathways_a"] = [p for p, _ in scored_pathways_a[:topk_pathways]]
 
     if pathways_b:
         scored_pathways_b = score_and_rank_pathways(pathways_b, query_context, common_pathways)
+        for p, score in scored_pathways_b:
+            pathway_scores.setdefault(p, score)
         mech["pathways_b"] = [p for p, _ in scored_pathways_b[:topk_pathways]]
 
     if common_pathways:
-        scored_common = score_and_rank_pathways(common_pathways, query_context, common_pathways)
-        mech["common_pathways"] = [p for p, _ in scored_common[:topk_pathways]]
+        # Reuse the per-pathway scores from the A/B passes; only score what they did not cover.
+        unscored = [p for p in common_pathways if p not in pathway_scores]
+        if unscored:
+            pathway_scores.update(score_and_rank_pathways(unscored, query_context, common_pathways))
+        scored_common = sorted(common_pathways, key=lambda p: pathway_scores[p], reverse=True)
+        mech["common_pathways"] = scored_common[:topk_pathways]
 
     # 5) FAERS via OpenFDA (cached) - use query expansion
     faers_a: List[tuple] = []
@@ -1338,7 +1508,7 @@ def retrieve_and_normalize(
     faers_combo: List[tuple] = []
     if settings.enable_openfda:
         try:
-            ofda = OpenFDAClient(cache_dir=openfda_cache)
+            ofda = _get_openfda(OpenFDAClient, openfda_cache)
             # Try expanded terms for FAERS
             for expanded_term_a in expanded_a:
                 reactions = ofda.get_top_reactions(expanded_term_a, top_k=topk_faers * 2)
@@ -1396,13 +1566,20 @@ def retrieve_and_normalize(
     # 6) Build normalized context (matches llm_interface expectations)
     ql_contrib = _bool_qlever_contributed(mech)
 
-    # Build caveats with explicit fallback note if QLever RAW contributed nothing
-    caveats_agg = list(dict.fromkeys((qlev.get("caveats") or []) + caveats))
+    # Build caveats with explicit fallback note if QLever RAW contributed nothing.
+    # The note joins the same single dedup pass, so the disabled-QLever stub caveat
+    # is not repeated.
+    fallback_note: Tuple[str, ...] = ()
     if not ql_raw_contrib:
         if settings.enable_qlever:
-            caveats_agg.append("QLever mechanistic unavailable; using available non-QLever evidence.")
+            fallback_note = ("QLever mechanistic unavailable; using available non-QLever evidence.",)
         else:
-            caveats_agg.append("QLever RDF disabled for NVIDIA demo runtime.")
+            fallback_note = ("QLever RDF disabled for NVIDIA demo runtime.",)
+    seen_caveats: set = set()
+    caveats_agg = [
+        c for c in chain(qlev.get("caveats") or (), caveats, fallback_note)
+        if not (c in seen_caveats or seen_caveats.add(c))
+    ]
 
     # Score and rank side effects by relevance
     query_context_se = {
@@ -1422,18 +1599,21 @@ def retrieve_and_normalize(
         # Build side effect index if not already built
         all_side_effects = list(set(se_a_raw + se_b_raw + se_pair_raw))
         if all_side_effects:
-            semantic_searcher.build_side_effect_index(all_side_effects, force_rebuild=False)
-
-            # Get semantic scores for side effects
-            for se in se_a_raw:
-                similar = semantic_searcher.search_similar_side_effects(se, top_k=1, threshold=0.7)
-                if similar and similar[0][0] == se:
-                    semantic_scores_a[se] = similar[0][1]
-
-            for se in se_b_raw:
-                similar = semantic_searcher.search_similar_side_effects(se, top_k=1, threshold=0.7)
-                if similar and similar[0][0] == se:
-                    semantic_scores_b[se] = similar[0][1]
+            _ensure_side_effect_index(semantic_searcher, all_side_effects)
+
+            # Get semantic scores once for the union of A/B side effects, then map back per drug
+            unique_se = list(dict.fromkeys(se_a_raw + se_b_raw))
+            if hasattr(semantic_searcher, "search_similar_side_effects_batch"):
+                batch = semantic_searcher.search_similar_side_effects_batch(unique_se, top_k=1, threshold=0.7)
+            else:
+                batch = [semantic_searcher.search_similar_side_effects(se, top_k=1, threshold=0.7) for se in unique_se]
+            se_scores = {
+                se: similar[0][1]
+                for se, similar in zip(unique_se, batch)
+                if similar and similar[0][0] == se
+            }
+            semantic_scores_a = {se: se_scores[se] for se in se_a_raw if se in se_scores}
+            semantic_scores_b = {se: se_scores[se] for se in se_b_raw if se in se_scores}
 
     # Score and rank side effects
     scored_se_a = score_and_rank_side_effects(se_a_raw, query_context_se, prr_data_a, semantic_scores_a)
@@ -1445,19 +1625,6 @@ def retrieve_and_normalize(
 
     # For pair-specific side effects, also score and rank
     if se_pair_raw:
-        # Get PRR for pair side effects
-        prr_data_pair = {}
-        try:
-            for se in se_pair_raw:
-                rows = db._con.execute(
-                    "SELECT MAX(prr) FROM twosides WHERE ((drug_a = ? AND drug_b = ?) OR (drug_a = ? AND drug_b = ?)) AND side_effect = ?",
-                    [a.lower(), b.lower(), b.lower(), a.lower(), se]
-                ).fetchall()
-                if rows and rows[0][0]:
-                    prr_data_pair[se] = float(rows[0][0])
-        except Exception:
-            pass
-
         scored_se_pair = score_and_rank_side_effects(se_pair_raw, query_context_se, prr_data_pair)
         se_pair_raw_ranked = [se for se, _ in scored_se_pair[:topk_side_effects]]
     else:
@@ -1570,7 +1737,7 @@ def retrieve_and_normalize(
         "meta": {
             "drug_pair": f"{drugA}|{drugB}",
             "pair_key": _pair_key(drugA, drugB),
-            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
             "version": VERSION,
             "data_mode": settings.data_mode,
             "qlever_contributed_raw": ql_raw_contrib,
@@ -1674,22 +1841,36 @@ def get_context_cached(
     pair order and the old opaque hash key so existing caches continue to work.
     """
     key = _context_cache_key(drugA, drugB)
+    store = _context_store()
+    if store is not None:
+        if not force_refresh:
+            cached_ctx, found_key = _load_context_entry(store, drugA, drugB)
+            if cached_ctx is not None:
+                return cached_ctx, found_key
+        ctx = retrieve_and_normalize(
+            drugA,
+            drugB,
+            parquet_dir=parquet_dir,
+            openfda_cache=openfda_cache,
+            topk_side_effects=topk_side_effects,
+            topk_faers=topk_faers,
+            topk_targets=topk_targets,
+            topk_pathways=topk_pathways,
+        )
+        store.set_json(_context_store_key(drugA, drugB), {"key": key, "context": _jsonify_sets(ctx)}, kind="context")
+        return ctx, key
+
     path = _ctx_path(key)
     if not force_refresh:
         for candidate in _context_cache_candidates(drugA, drugB):
-            candidate_path = _ctx_path(candidate)
-            if not os.path.exists(candidate_path):
-                continue
-            with open(candidate_path, "r", encoding="utf-8") as f:
-                cached_ctx = json.load(f)
-            if not _context_cache_version_ok(cached_ctx):
+            cached_ctx = _read_context_file(candidate)
+            if cached_ctx is None or not _context_cache_version_ok(cached_ctx):
                 continue
             if candidate != key:
                 if candidate == _legacy_context_cache_key(drugA, drugB):
-                    with open(path, "w", encoding="utf-8") as f:
-                        json.dump(cached_ctx, f, ensure_ascii=False, indent=2)
+                    _write_context_json(path, cached_ctx)
                     try:
-                        os.remove(candidate_path)
+                        _remove_context_files(candidate)
                     except OSError:
                         pass
                     return cached_ctx, key
@@ -1698,8 +1879,7 @@ def get_context_cached(
         cached_ctx, found_key = _find_context_cache_by_pair(drugA, drugB)
         if cached_ctx is not None:
             if found_key != key:
-                with open(path, "w", encoding="utf-8") as f:
-                    json.dump(cached_ctx, f, ensure_ascii=False, indent=2)
+                _write_context_json(path, cached_ctx)
             return cached_ctx, key
 
     ctx = retrieve_and_normalize(
@@ -1712,8 +1892,7 @@ def get_context_cached(
         topk_targets=topk_targets,
         topk_pathways=topk_pathways,
     )
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(ctx, f, ensure_ascii=False, indent=2)
+    _write_context_json(path, ctx)
     return ctx, key
 
 
@@ -1932,20 +2111,20 @@ def _feedback_context_snapshot(context: Dict[str, Any], *, mode: Optional[str] =
 def clear_context_cache(drugA: str, drugB: str) -> bool:
     """Delete cached contexts for a pair in either order. Returns True if removed."""
     removed = False
+    store = _context_store()
+    if store is not None:
+        removed = store.delete(_context_store_key(drugA, drugB))
     for key in _context_cache_candidates(drugA, drugB):
-        path = _ctx_path(key)
-        if os.path.exists(path):
-            os.remove(path)
+        if _remove_context_files(key):
             removed = True
     pair_key = _pair_key(drugA, drugB)
     if os.path.isdir(CTX_DIR):
         for name in os.listdir(CTX_DIR):
-            if not name.endswith(".json"):
+            if _ctx_key_from_name(name) is None:
                 continue
             path = os.path.join(CTX_DIR, name)
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    meta = (json.load(f).get("meta") or {})
+                meta = (_read_context_path(path).get("meta") or {})
             except Exception:
                 continue
             if meta.get("pair_key") == pair_key:
@@ -1956,13 +2135,13 @@ def clear_context_cache(drugA: str, drugB: str) -> bool:
 
 def load_pkpd_from_cache(drugA: str, drugB: str) -> Optional[Dict[str, Any]]:
     """Convenience accessor to load only the PK/PD block from cache, if present."""
+    store = _context_store()
+    if store is not None:
+        ctx, _ = _load_context_entry(store, drugA, drugB)
+        return ctx.get("pkpd") if ctx is not None else None
     for key in _context_cache_candidates(drugA, drugB):
-        path = _ctx_path(key)
-        if not os.path.exists(path):
-            continue
-        with open(path, "r", encoding="utf-8") as f:
-            ctx = json.load(f)
-        if _context_cache_version_ok(ctx):
+        ctx = _read_context_file(key)
+        if ctx is not None and _context_cache_version_ok(ctx):
             return ctx.get("pkpd")
     cached_ctx, _ = _find_context_cache_by_pair(drugA, drugB)
     if cached_ctx is not None:
@@ -9,18 +9,156 @@ ChEMBL provides:
 
 API Documentation: https://www.ebi.ac.uk/chembl/documentation/web-services
 """
+import asyncio
+import atexit
+import bisect
+import hashlib
+import importlib.util
+import json
+import re
+import threading
+import time
 import requests
 import logging
-from typing import Dict, List, Optional, Any
+import weakref
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from functools import lru_cache
+from types import MappingProxyType
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - async variants fall back to threads
+    httpx = None
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # pragma: no cover - per-record parsing fallback
+    np = pd = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.config.settings import get_settings
+from src.utils.caching import load_json, save_json
 
 LOG = logging.getLogger(__name__)
 
 # ChEMBL REST API base URL
 CHEMBL_API_BASE = "https://www.ebi.ac.uk/chembl/api/data"
 
+# ChEMBL content is effectively static between releases; persisted GET responses
+# (file or SQLite backend, per CACHE_BACKEND) are reused across processes for a week.
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# HTTP/2 multiplexing for the async client needs the optional `h2` package.
+HAS_H2 = importlib.util.find_spec("h2") is not None
+
+
+def _build_session() -> requests.Session:
+    """One pooled keep-alive session for all ChEMBL calls, retrying 429/5xx with backoff."""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retry))
+    session.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+        "User-Agent": "InferMed/1.0",
+    })
+    return session
+
+
+_SESSION = _build_session()
+
+# One AsyncClient per event loop (httpx pools are loop-bound); an entry goes away with its loop.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+# In-flight async fetches, keyed by (event loop, kind, key); concurrent callers share one task.
+_INFLIGHT: Dict[Tuple[Any, str, str], "asyncio.Task[Any]"] = {}
+
+# Activities fetched per molecule (the enzyme/transporter filters keep this page relevant).
+_ACTIVITY_LIMIT = 100
+# ChEMBL's maximum page size.
+_MAX_PAGE_SIZE = 1000
+_ENZYME_STANDARD_TYPES = ("Ki", "IC50", "EC50")
+_COMPOUND_BATCH_SIZE = 25
+
+# Worker pool for fanning independent blocking lookups out (requests releases
+# the GIL while waiting on the socket); shut down with the interpreter.
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="chembl")
+atexit.register(_POOL.shutdown, wait=False)
+# Ki/IC50 strength bands: bisect_right keeps the upper bounds exclusive (< 1, < 10, rest).
+_INHIB_THRESHOLDS = (1.0, 10.0)
+_INHIB_LABELS = ("strong_inhibitor", "moderate_inhibitor", "weak_inhibitor")
+# Pages at least this long are classified column-wise with pandas.
+_VECTORIZE_MIN_ROWS = 256
+_ACTIVITY_FIELDS = "target_pref_name,standard_type,standard_relation,standard_value,standard_units"
+
+# Common transporter names
+_TRANSPORTERS = ["P-glycoprotein", "P-gp", "ABCB1", "OATP", "OCT", "OAT", "MATE", "BCRP"]
+_TRANSPORTER_RE = re.compile("|".join(re.escape(t) for t in _TRANSPORTERS), re.IGNORECASE)
+
+# CYP isoform from a ChEMBL target name ("Cytochrome P450 3A4" -> "3a4")
+_CYP_RE = re.compile(r"(?:cyp|cytochrome\s*p450)\s*(\d+[a-z]?\d*)", re.IGNORECASE)
+
+
+_MISS = object()
+
+
+class _TTLCache:
+    """Thread-safe LRU-bounded map whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = _MISS) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Compound lookups: answers (including "no such molecule") are kept for a day;
+# request failures only for a minute so transient 5xx/timeouts recover quickly.
+_COMPOUND_CACHE = _TTLCache(maxsize=2048, ttl=86400)
+_COMPOUND_ERRORS = _TTLCache(maxsize=512, ttl=60)
+# Async activity pages, bounded like the sync path's lru_cache(1024) and likewise never expiring.
+_ASYNC_ACTIVITY_CACHE = _TTLCache(maxsize=1024, ttl=float("inf"))
+
+
 def _chembl_timeout() -> int:
     try:
         return int(get_settings().chembl_timeout_s)
@@ -28,30 +166,514 @@ def _chembl_timeout() -> int:
         return 10
 
 
+def _get_async_client() -> "httpx.AsyncClient":
+    """Shared AsyncClient for the running event loop (httpx pools are loop-bound).
+
+    Loops running concurrently (e.g. in different threads) each keep their own client, so
+    one never replaces a client another is still using. Clients of loops that have since
+    closed cannot be awaited any more and are dropped, which releases their connections.
+    """
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        for stale in [other for other in _ASYNC_CLIENTS if other.is_closed()]:
+            _ASYNC_CLIENTS.pop(stale, None)
+        client = httpx.AsyncClient(
+            http2=HAS_H2,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=_chembl_timeout(),
+            headers=dict(_SESSION.headers),
+        )
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+def _decode_json(r: Any) -> Dict[str, Any]:
+    # Bodies arrive already inflated; orjson parses the large activity pages several times faster.
+    if orjson is not None:
+        return orjson.loads(r.content)
+    return r.json()
+
+
+def _cache_dir() -> str:
+    try:
+        return get_settings().chembl_cache_dir
+    except Exception:
+        return "data/cache/chembl"
+
+
+def _response_cache_key(path: str, params: Dict[str, Any]) -> str:
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:20]
+    return f"chembl_v1__{path.replace('.json', '')}__{digest}"
+
+
+def _load_cached_response(path: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    try:
+        return load_json(_cache_dir(), _response_cache_key(path, params), ttl=DEFAULT_TTL_SECONDS)
+    except Exception as e:
+        LOG.debug("ChEMBL cache read failed for %s: %s", path, e)
+        return None
+
+
+def _save_cached_response(path: str, params: Dict[str, Any], data: Dict[str, Any]) -> None:
+    try:
+        save_json(_cache_dir(), _response_cache_key(path, params), data)
+    except Exception as e:
+        LOG.debug("ChEMBL cache write failed for %s: %s", path, e)
+
+
+def _get_json(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    cached = _load_cached_response(path, params)
+    if cached is not None:
+        return cached
+    r = _SESSION.get(f"{CHEMBL_API_BASE}/{path}", params=params, timeout=_chembl_timeout())
+    r.raise_for_status()
+    data = _decode_json(r)
+    _save_cached_response(path, params, data)
+    return data
+
+
+async def _aget_json(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    if httpx is None:
+        return await asyncio.to_thread(_get_json, path, params)
+    cached = _load_cached_response(path, params)
+    if cached is not None:
+        return cached
+    r = await _get_async_client().get(f"{CHEMBL_API_BASE}/{path}", params=params)
+    r.raise_for_status()
+    data = _decode_json(r)
+    _save_cached_response(path, params, data)
+    return data
+
+
+async def _single_flight(kind: str, key: str, fetch: Any) -> Any:
+    """Await `fetch()` once per key no matter how many coroutines ask concurrently."""
+    flight_key = (asyncio.get_running_loop(), kind, key)
+    task = _INFLIGHT.get(flight_key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _INFLIGHT[flight_key] = task
+        task.add_done_callback(lambda _t: _INFLIGHT.pop(flight_key, None))
+    # Shield so one cancelled waiter doesn't cancel the fetch for the others.
+    return await asyncio.shield(task)
+
+
+# ------------------------ request params ------------------------
+
+def _compound_params(compound_name: str) -> Dict[str, Any]:
+    return {
+        "molecule_synonyms__synonyms__icontains": compound_name,
+        "format": "json",
+        "limit": 1,
+    }
+
+
+def _compound_batch_params(names: Sequence[str]) -> Dict[str, Any]:
+    # Synonyms are stored with mixed casing, so send both the given and upper-case forms.
+    values = list(dict.fromkeys(v for n in names for v in (n, n.upper())))
+    return {
+        "molecule_synonyms__synonyms__in": ",".join(values),
+        "format": "json",
+        "limit": min(len(values) * 2, _MAX_PAGE_SIZE),
+    }
+
+
+def _activity_params(
+    molecule_chembl_id: str,
+    enzymes: bool = False,
+    enzyme_filter: Optional[str] = None,
+    *,
+    only: bool = True,
+) -> Dict[str, Any]:
+    params = {
+        "molecule_chembl_id": molecule_chembl_id,
+        "target_type": "SINGLE PROTEIN",
+        "format": "json",
+        "limit": _ACTIVITY_LIMIT,
+    }
+    if enzymes:
+        # Filter enzyme potencies server-side: a page of all activities can be filled by
+        # other assay types and drop the Ki/IC50/EC50 rows entirely.
+        params["standard_type__in"] = ",".join(_ENZYME_STANDARD_TYPES)
+        params["standard_relation"] = "="
+        if enzyme_filter:
+            params["target_pref_name__icontains"] = enzyme_filter
+    if only:
+        # Trim each record to the fields the classifiers read (payload shrinks ~5-10x).
+        params["only"] = _ACTIVITY_FIELDS
+    return params
+
+
+def _is_bad_request(exc: Exception) -> bool:
+    return getattr(getattr(exc, "response", None), "status_code", None) == 400
+
+
+def _pathway_params(molecule_chembl_id: str) -> Dict[str, Any]:
+    return {
+        "molecule_chembl_id": molecule_chembl_id,
+        "format": "json",
+        "limit": 50,
+    }
+
+
+# ------------------------ response parsing ------------------------
+
+def _molecule_chembl_id(molecule: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not molecule:
+        return None
+    return molecule.get("molecule_chembl_id") or None
+
+
+def _molecule_names(molecule: Dict[str, Any]) -> set:
+    names = {str(molecule.get("pref_name") or "").lower()}
+    for syn in molecule.get("molecule_synonyms") or []:
+        for field in ("molecule_synonym", "synonyms"):
+            if syn.get(field):
+                names.add(str(syn[field]).lower())
+    names.discard("")
+    return names
+
+
+def _potency_value(standard_value: Any) -> Optional[float]:
+    if not standard_value:
+        return None
+    try:
+        val = float(standard_value)
+    except (ValueError, TypeError):
+        return None
+    return None if val != val else val  # NaN carries no potency
+
+
+@lru_cache(maxsize=64)
+def _enzyme_filter(enzyme_name: Optional[str]) -> Optional[str]:
+    if not enzyme_name:
+        return None
+    # Normalize enzyme name (e.g., "CYP3A4" -> "3a4", "cytochrome p450 3a4" -> "3a4")
+    return enzyme_name.lower().replace("cyp", "").replace("cytochrome p450", "").strip()
+
+
+@dataclass(slots=True, frozen=True)
+class Interaction:
+    """One ChEMBL enzyme activity, classified (``action``) from its potency."""
+
+    enzyme: str
+    action: str
+    potency_type: str
+    potency_value: Any
+    potency_units: str
+    target_name: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True, frozen=True)
+class TransporterInteraction:
+    transporter: str
+    action: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return asdict(self)
+
+
+def _interaction_record(act: Dict[str, Any], enzyme: str, action: str) -> Interaction:
+    return Interaction(
+        enzyme=enzyme,
+        action=action,
+        potency_type=act.get("standard_type", ""),
+        potency_value=act.get("standard_value"),
+        potency_units=act.get("standard_units", ""),
+        target_name=act.get("target_pref_name") or "",
+    )
+
+
+def _parse_enzyme_interactions_frame(
+    activities: Sequence[Dict[str, Any]], enzyme_name: Optional[str]
+) -> List[Interaction]:
+    """Column-wise twin of `_parse_enzyme_interactions` for large activity pages."""
+    df = pd.DataFrame.from_records(
+        list(activities),
+        columns=["target_pref_name", "standard_type", "standard_relation", "standard_value"],
+    )
+    names = df["target_pref_name"].where(df["target_pref_name"].notna(), "").astype(str)
+    keep = df["standard_type"].isin(_ENZYME_STANDARD_TYPES) & (df["standard_relation"] == "=")
+    enzyme_filter = _enzyme_filter(enzyme_name)
+    if enzyme_filter:
+        keep &= names.str.lower().str.contains(enzyme_filter, regex=False)
+
+    cyp = names.str.extract(_CYP_RE.pattern, flags=re.IGNORECASE, expand=False)
+    enzyme = ("cyp" + cyp.str.lower()).where(cyp.notna(), names.str.lower())
+    if not enzyme_name:
+        keep &= cyp.notna()
+
+    raw = df["standard_value"]
+    present = raw.notna() & (raw.astype(str) != "") & (raw != 0)  # same falsy check as the loop
+    vals = pd.to_numeric(raw.where(present), errors="coerce")
+    bands = np.searchsorted(_INHIB_THRESHOLDS, vals.fillna(0.0).to_numpy(), side="right")
+    action = np.select(
+        [df["standard_type"].isin(("Ki", "IC50")) & vals.notna(), (df["standard_type"] == "EC50") & vals.notna()],
+        [np.asarray(_INHIB_LABELS, dtype=object)[bands], "substrate"],
+        default="unknown",
+    )
+
+    rows = np.flatnonzero(keep.to_numpy())
+    return [_interaction_record(activities[i], enzyme.iat[i], str(action[i])) for i in rows]
+
+
+def _parse_enzyme_interactions(
+    activities: Sequence[Dict[str, Any]], enzyme_name: Optional[str]
+) -> List[Interaction]:
+    if pd is not None and len(activities) >= _VECTORIZE_MIN_ROWS:
+        return _parse_enzyme_interactions_frame(activities, enzyme_name)
+
+    interactions = []
+    enzyme_filter = _enzyme_filter(enzyme_name)
+
+    for act in activities:
+        if act.get("standard_type") not in _ENZYME_STANDARD_TYPES or act.get("standard_relation") != "=":
+            continue
+        target_pref_name = act.get("target_pref_name") or ""
+        if enzyme_filter and enzyme_filter not in target_pref_name.lower():
+            continue
+        standard_type = act.get("standard_type", "")
+        standard_value = act.get("standard_value")
+
+        # Extract enzyme name from target
+        enzyme_match = None
+        m = _CYP_RE.search(target_pref_name)
+        if m:
+            enzyme_match = f"cyp{m.group(1).lower()}"
+
+        if enzyme_match or enzyme_name:
+            # Infer action from activity type and value
+            # Low Ki/IC50 suggests inhibition; high suggests substrate
+            action = "unknown"
+            val = _potency_value(standard_value)
+            if val is not None:
+                if standard_type in ("Ki", "IC50"):
+                    # < 1 μM = strong inhibitor, 1-10 μM = moderate, > 10 μM = weak
+                    action = _INHIB_LABELS[bisect.bisect_right(_INHIB_THRESHOLDS, val)]
+                elif standard_type == "EC50":
+                    action = "substrate"
+
+            interactions.append(_interaction_record(act, enzyme_match or target_pref_name.lower(), action))
+
+    return interactions
+
+
+def _parse_transporter_data(activities: Sequence[Dict[str, Any]]) -> List[TransporterInteraction]:
+    transporter_data = []
+
+    for act in activities:
+        target_pref_name = act.get("target_pref_name") or ""
+        # Check if this is a transporter (one case-insensitive alternation search on the
+        # raw name); only the few matches pay for lower-casing.
+        if not _TRANSPORTER_RE.search(target_pref_name):
+            continue
+        target_pref_name = target_pref_name.lower()
+        standard_type = act.get("standard_type", "")
+        standard_value = act.get("standard_value")
+
+        # Infer action
+        action = "substrate"  # Default
+        if standard_type in ("Ki", "IC50") and standard_value:
+            try:
+                val = float(standard_value)
+                if val < 10.0:  # Low Ki/IC50 suggests inhibition
+                    action = "inhibitor"
+            except (ValueError, TypeError):
+                pass
+
+        transporter_data.append(TransporterInteraction(transporter=target_pref_name, action=action))
+
+    return transporter_data
+
+
+def _parse_pathways(pathways: List[Dict[str, Any]]) -> List[str]:
+    return [p.get("pathway", "") for p in pathways if p.get("pathway")]
+
+
+# Shared read-only sections for drugs ChEMBL has nothing on (no per-call allocation).
+_EMPTY_STRENGTH = MappingProxyType({"strong": (), "moderate": (), "weak": ()})
+_EMPTY_VALIDATION = MappingProxyType({"found": False, "matches": (), "mismatches": ()})
+
+
+def _classify_enrichment(
+    enzymes: Dict[str, List[str]], chembl_interactions: List[Interaction]
+) -> Dict[str, Any]:
+    # Read-only snapshot: callers can't mutate the caller's enzyme lists through it.
+    enzymes_view = MappingProxyType({k: tuple(v) for k, v in enzymes.items()})
+    if not chembl_interactions:
+        return {
+            "enzymes": enzymes_view,
+            "enzyme_strength": _EMPTY_STRENGTH,
+            "chembl_validation": _EMPTY_VALIDATION,
+        }
+
+    enriched = {
+        "enzymes": enzymes_view,
+        "enzyme_strength": {"strong": [], "moderate": [], "weak": []},
+        "chembl_validation": {"found": True, "matches": [], "mismatches": []},
+    }
+    inhibitor_set = set(enzymes.get("inhibitor", []))
+    all_known = set().union(*enzymes.values())
+
+    # Map ChEMBL data to our enzyme lists
+    for interaction in chembl_interactions:
+        enzyme = interaction.enzyme
+        action = interaction.action
+
+        # Classify strength
+        if "strong" in action:
+            enriched["enzyme_strength"]["strong"].append(enzyme)
+        elif "moderate" in action:
+            enriched["enzyme_strength"]["moderate"].append(enzyme)
+        elif "weak" in action:
+            enriched["enzyme_strength"]["weak"].append(enzyme)
+
+        # Cross-validate with DrugBank
+        if enzyme in inhibitor_set:
+            enriched["chembl_validation"]["matches"].append(enzyme)
+        elif enzyme not in all_known:
+            enriched["chembl_validation"]["mismatches"].append(enzyme)
+
+    return enriched
+
+
+# ------------------------ sync API ------------------------
+
 @lru_cache(maxsize=1024)
+def _get_activities(
+    molecule_chembl_id: str, enzymes: bool = False, enzyme_filter: Optional[str] = None
+) -> Tuple[Dict[str, Any], ...]:
+    """Single-protein activities for a molecule; with ``enzymes``, only enzyme potencies.
+
+    Failures raise (and so are not cached); callers treat them as "no data".
+    A 400 for the ``only=`` field list is retried once with full records.
+    """
+    try:
+        data = _get_json("activity.json", _activity_params(molecule_chembl_id, enzymes, enzyme_filter))
+    except Exception as e:
+        if not _is_bad_request(e):
+            raise
+        data = _get_json("activity.json", _activity_params(molecule_chembl_id, enzymes, enzyme_filter, only=False))
+    return tuple(data.get("activities", []))
+
+
+def _compound_key(compound_name: str) -> str:
+    # ChEMBL synonym matching is case-insensitive, so " Aspirin" and "aspirin" share a cache entry.
+    return compound_name.strip().lower()
+
+
+def _cached_compound(compound_name: str) -> Any:
+    cached = _COMPOUND_CACHE.get(compound_name)
+    if cached is _MISS and _COMPOUND_ERRORS.get(compound_name) is not _MISS:
+        return None
+    return cached
+
+
+def _store_compound(compound_name: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    molecules = data.get("molecules", [])
+    molecule = molecules[0] if molecules else None
+    _COMPOUND_CACHE.set(compound_name, molecule)
+    return molecule
+
+
 def _get_compound_by_name(compound_name: str) -> Optional[Dict[str, Any]]:
     """
     Search ChEMBL for a compound by name.
     Returns the first matching molecule record or None.
     """
+    compound_name = _compound_key(compound_name)
+    cached = _cached_compound(compound_name)
+    if cached is not _MISS:
+        return cached
     try:
-        url = f"{CHEMBL_API_BASE}/molecule.json"
-        params = {
-            "molecule_synonyms__synonyms__icontains": compound_name,
-            "format": "json",
-            "limit": 1,
-        }
-        r = requests.get(url, params=params, timeout=_chembl_timeout())
-        r.raise_for_status()
-        data = r.json()
-        molecules = data.get("molecules", [])
-        if molecules:
-            return molecules[0]
+        return _store_compound(compound_name, _get_json("molecule.json", _compound_params(compound_name)))
     except Exception as e:
         LOG.debug("ChEMBL compound search failed for %s: %s", compound_name, e)
+        _COMPOUND_ERRORS.set(compound_name, None)
     return None
 
 
+def get_compounds_by_names(names: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Resolve several compound names with batched `/molecule.json` synonym `__in` queries.
+
+    Returns a dict of name -> molecule record for names that resolved. Names missing
+    from the batch results (the batch filter is exact, the single lookup is a
+    substring match) fall back to `_get_compound_by_name`; all answers land in the
+    shared compound cache.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    aliases: Dict[str, List[str]] = {}
+    for name in dict.fromkeys(n for n in names if n and n.strip()):
+        aliases.setdefault(_compound_key(name), []).append(name)
+
+    found: Dict[str, Dict[str, Any]] = {}
+    pending: List[str] = []  # first spelling seen per key; sent as-is in the batch filter
+    for key, spellings in aliases.items():
+        cached = _cached_compound(key)
+        if cached is _MISS:
+            pending.append(spellings[0].strip())
+        elif cached is not None:
+            found[key] = cached
+
+    batchable = [n for n in pending if "," not in n]
+    for i in range(0, len(batchable), _COMPOUND_BATCH_SIZE):
+        chunk = batchable[i:i + _COMPOUND_BATCH_SIZE]
+        try:
+            molecules = _get_json("molecule.json", _compound_batch_params(chunk)).get("molecules", [])
+        except Exception as e:
+            LOG.debug("ChEMBL batch compound search failed for %s: %s", chunk, e)
+            continue
+        indexed = [(_molecule_names(m), m) for m in molecules]
+        for name in chunk:
+            key = _compound_key(name)
+            molecule = next((m for m_names, m in indexed if key in m_names), None)
+            if molecule is not None:
+                _COMPOUND_CACHE.set(key, molecule)
+                found[key] = molecule
+
+    for name in pending:
+        key = _compound_key(name)
+        if key not in found:
+            molecule = _get_compound_by_name(name)
+            if molecule:
+                found[key] = molecule
+
+    for key, molecule in found.items():
+        for name in aliases[key]:
+            out[name] = molecule
+    return out
+
+
+def _enzyme_interactions(compound_name: str, enzyme_name: Optional[str] = None) -> List[Interaction]:
+    molecule_chembl_id = _molecule_chembl_id(_get_compound_by_name(compound_name))
+    if not molecule_chembl_id:
+        return []
+
+    try:
+        # Get bioactivities for this molecule
+        activities = _get_activities(molecule_chembl_id, True, _enzyme_filter(enzyme_name))
+        return _parse_enzyme_interactions(activities, enzyme_name)
+    except Exception as e:
+        LOG.debug("ChEMBL enzyme interaction query failed for %s: %s", compound_name, e)
+        return []
+
+
+def _transporter_interactions(compound_name: str) -> List[TransporterInteraction]:
+    molecule_chembl_id = _molecule_chembl_id(_get_compound_by_name(compound_name))
+    if not molecule_chembl_id:
+        return []
+
+    try:
+        return _parse_transporter_data(_get_activities(molecule_chembl_id))
+    except Exception as e:
+        LOG.debug("ChEMBL transporter query failed for %s: %s", compound_name, e)
+        return []
+
+
 def get_enzyme_interactions(
     compound_name: str, enzyme_name: Optional[str] = None
 ) -> List[Dict[str, Any]]:
@@ -65,86 +687,7 @@ def get_enzyme_interactions(
     Returns:
         List of dicts with keys: enzyme, action, potency_type (Ki/IC50), potency_value, potency_units
     """
-    molecule = _get_compound_by_name(compound_name)
-    if not molecule:
-        return []
-    
-    molecule_chembl_id = molecule.get("molecule_chembl_id")
-    if not molecule_chembl_id:
-        return []
-    
-    try:
-        # Get bioactivities for this molecule
-        url = f"{CHEMBL_API_BASE}/activity.json"
-        params = {
-            "molecule_chembl_id": molecule_chembl_id,
-            "target_type": "SINGLE PROTEIN",
-            "standard_type__in": "Ki,IC50,EC50",
-            "standard_relation": "=",
-            "format": "json",
-            "limit": 100,
-        }
-        
-        # Filter by enzyme name if provided
-        if enzyme_name:
-            # Normalize enzyme name (e.g., "CYP3A4" -> "cyp3a4", "cytochrome p450 3a4")
-            enzyme_filter = enzyme_name.lower().replace("cyp", "").replace("cytochrome p450", "").strip()
-            params["target_pref_name__icontains"] = enzyme_filter
-        
-        r = requests.get(url, params=params, timeout=_chembl_timeout())
-        r.raise_for_status()
-        data = r.json()
-        
-        activities = data.get("activities", [])
-        interactions = []
-        
-        for act in activities:
-            target_pref_name = act.get("target_pref_name", "")
-            standard_type = act.get("standard_type", "")
-            standard_value = act.get("standard_value")
-            standard_units = act.get("standard_units", "")
-            
-            # Extract enzyme name from target
-            enzyme_match = None
-            if "cyp" in target_pref_name.lower() or "cytochrome" in target_pref_name.lower():
-                import re
-                m = re.search(r"(?i)(?:cyp|cytochrome\s*p450)\s*(\d+[a-z]?\d*)", target_pref_name)
-                if m:
-                    enzyme_match = f"cyp{m.group(1).lower()}"
-            
-            if enzyme_match or enzyme_name:
-                # Infer action from activity type and value
-                # Low Ki/IC50 suggests inhibition; high suggests substrate
-                action = "unknown"
-                if standard_value:
-                    try:
-                        val = float(standard_value)
-                        if standard_type in ("Ki", "IC50"):
-                            # < 1 μM = strong inhibitor, 1-10 μM = moderate, > 10 μM = weak
-                            if val < 1.0:
-                                action = "strong_inhibitor"
-                            elif val < 10.0:
-                                action = "moderate_inhibitor"
-                            else:
-                                action = "weak_inhibitor"
-                        elif standard_type == "EC50":
-                            action = "substrate"
-                    except (ValueError, TypeError):
-                        pass
-                
-                interactions.append({
-                    "enzyme": enzyme_match or target_pref_name.lower(),
-                    "action": action,
-                    "potency_type": standard_type,
-                    "potency_value": standard_value,
-                    "potency_units": standard_units,
-                    "target_name": target_pref_name,
-                })
-        
-        return interactions
-    except Exception as e:
-        LOG.debug("ChEMBL enzyme interaction query failed for %s: %s", compound_name, e)
-        return []
+    return [i.to_dict() for i in _enzyme_interactions(compound_name, enzyme_name)]
 
 
 def get_transporter_data(compound_name: str) -> List[Dict[str, str]]:
@@ -154,62 +697,7 @@ def get_transporter_data(compound_name: str) -> List[Dict[str, str]]:
     Returns:
         List of dicts with keys: transporter, action (substrate/inhibitor)
     """
-    molecule = _get_compound_by_name(compound_name)
-    if not molecule:
-        return []
-    
-    molecule_chembl_id = molecule.get("molecule_chembl_id")
-    if not molecule_chembl_id:
-        return []
-    
-    # Common transporter names
-    transporters = ["P-glycoprotein", "P-gp", "ABCB1", "OATP", "OCT", "OAT", "MATE", "BCRP"]
-    
-    try:
-        url = f"{CHEMBL_API_BASE}/activity.json"
-        params = {
-            "molecule_chembl_id": molecule_chembl_id,
-            "target_type": "SINGLE PROTEIN",
-            "format": "json",
-            "limit": 100,
-        }
-        
-        r = requests.get(url, params=params, timeout=_chembl_timeout())
-        r.raise_for_status()
-        data = r.json()
-        
-        activities = data.get("activities", [])
-        transporter_data = []
-        
-        for act in activities:
-            target_pref_name = act.get("target_pref_name", "").lower()
-            standard_type = act.get("standard_type", "")
-            standard_value = act.get("standard_value")
-            
-            # Check if this is a transporter
-            is_transporter = any(t.lower() in target_pref_name for t in transporters)
-            if not is_transporter:
-                continue
-            
-            # Infer action
-            action = "substrate"  # Default
-            if standard_type in ("Ki", "IC50") and standard_value:
-                try:
-                    val = float(standard_value)
-                    if val < 10.0:  # Low Ki/IC50 suggests inhibition
-                        action = "inhibitor"
-                except (ValueError, TypeError):
-                    pass
-            
-            transporter_data.append({
-                "transporter": target_pref_name,
-                "action": action,
-            })
-        
-        return transporter_data
-    except Exception as e:
-        LOG.debug("ChEMBL transporter query failed for %s: %s", compound_name, e)
-        return []
+    return [t.to_dict() for t in _transporter_interactions(compound_name)]
 
 
 def get_pathway_data(compound_name: str) -> List[str]:
@@ -219,29 +707,14 @@ def get_pathway_data(compound_name: str) -> List[str]:
     Returns:
         List of pathway names
     """
-    molecule = _get_compound_by_name(compound_name)
-    if not molecule:
-        return []
-    
-    molecule_chembl_id = molecule.get("molecule_chembl_id")
+    molecule_chembl_id = _molecule_chembl_id(_get_compound_by_name(compound_name))
     if not molecule_chembl_id:
         return []
     
     try:
         # Get pathways via target associations
-        url = f"{CHEMBL_API_BASE}/pathway.json"
-        params = {
-            "molecule_chembl_id": molecule_chembl_id,
-            "format": "json",
-            "limit": 50,
-        }
-        
-        r = requests.get(url, params=params, timeout=_chembl_timeout())
-        r.raise_for_status()
-        data = r.json()
-        
-        pathways = data.get("pathways", [])
-        return [p.get("pathway", "") for p in pathways if p.get("pathway")]
+        data = _get_json("pathway.json", _pathway_params(molecule_chembl_id))
+        return _parse_pathways(data.get("pathways", []))
     except Exception as e:
         LOG.debug("ChEMBL pathway query failed for %s: %s", compound_name, e)
         return []
@@ -260,36 +733,131 @@ def enrich_mechanistic_data(
     Returns:
         Enriched dict with strength classifications and ChEMBL cross-validation
     """
-    enriched = {
-        "enzymes": enzymes.copy(),
-        "enzyme_strength": {"strong": [], "moderate": [], "weak": []},
-        "chembl_validation": {"found": False, "matches": [], "mismatches": []},
-    }
-    
-    # Get ChEMBL enzyme interactions
-    chembl_interactions = get_enzyme_interactions(drug_name)
-    
-    if chembl_interactions:
-        enriched["chembl_validation"]["found"] = True
-        
-        # Map ChEMBL data to our enzyme lists
-        for interaction in chembl_interactions:
-            enzyme = interaction["enzyme"]
-            action = interaction["action"]
-            potency_value = interaction.get("potency_value")
-            
-            # Classify strength
-            if "strong" in action:
-                enriched["enzyme_strength"]["strong"].append(enzyme)
-            elif "moderate" in action:
-                enriched["enzyme_strength"]["moderate"].append(enzyme)
-            elif "weak" in action:
-                enriched["enzyme_strength"]["weak"].append(enzyme)
-            
-            # Cross-validate with DrugBank
-            if enzyme in enzymes.get("inhibitor", []):
-                enriched["chembl_validation"]["matches"].append(enzyme)
-            elif enzyme not in sum(enzymes.values(), []):
-                enriched["chembl_validation"]["mismatches"].append(enzyme)
-    
-    return enriched
+    return _classify_enrichment(enzymes, _enzyme_interactions(drug_name))
+
+
+def enrich_mechanistic_data_batch(
+    drug_names: Sequence[str], enzymes_map: Dict[str, Dict[str, List[str]]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Enrich several drugs, resolving their ChEMBL compounds in batched requests first.
+
+    Args:
+        drug_names: Drug names
+        enzymes_map: Drug name -> dict with 'substrate', 'inhibitor', 'inducer' lists
+
+    Returns:
+        Drug name -> enriched dict (same shape as `enrich_mechanistic_data`)
+    """
+    get_compounds_by_names(drug_names)
+    unique = list(dict.fromkeys(drug_names))
+    # Activity fetches per drug are independent; overlap their round trips.
+    futures = [_POOL.submit(enrich_mechanistic_data, name, enzymes_map.get(name) or {}) for name in unique]
+    return {name: future.result() for name, future in zip(unique, futures)}
+
+
+# ------------------------ async API ------------------------
+# Same results as the sync functions; callers can asyncio.gather many drugs
+# over one pooled (HTTP/2 when `h2` is installed) connection.
+
+async def _aget_compound_by_name(compound_name: str) -> Optional[Dict[str, Any]]:
+    compound_name = _compound_key(compound_name)
+    cached = _cached_compound(compound_name)
+    if cached is not _MISS:
+        return cached
+
+    async def fetch() -> Optional[Dict[str, Any]]:
+        try:
+            return _store_compound(compound_name, await _aget_json("molecule.json", _compound_params(compound_name)))
+        except Exception as e:
+            LOG.debug("ChEMBL compound search failed for %s: %s", compound_name, e)
+            _COMPOUND_ERRORS.set(compound_name, None)
+        return None
+
+    return await _single_flight("compound", compound_name, fetch)
+
+
+async def _aget_activities(
+    molecule_chembl_id: str, enzymes: bool = False, enzyme_filter: Optional[str] = None
+) -> Tuple[Dict[str, Any], ...]:
+    key = f"{molecule_chembl_id}|enzymes={enzyme_filter or ''}" if enzymes else molecule_chembl_id
+    cached = _ASYNC_ACTIVITY_CACHE.get(key, None)
+    if cached is not None:
+        return cached
+
+    async def fetch() -> Tuple[Dict[str, Any], ...]:
+        try:
+            data = await _aget_json("activity.json", _activity_params(molecule_chembl_id, enzymes, enzyme_filter))
+        except Exception as e:
+            if not _is_bad_request(e):
+                raise
+            data = await _aget_json(
+                "activity.json", _activity_params(molecule_chembl_id, enzymes, enzyme_filter, only=False)
+            )
+        activities = tuple(data.get("activities", []))
+        _ASYNC_ACTIVITY_CACHE.set(key, activities)
+        return activities
+
+    return await _single_flight("activities", key, fetch)
+
+
+async def _aenzyme_interactions(compound_name: str, enzyme_name: Optional[str] = None) -> List[Interaction]:
+    molecule_chembl_id = _molecule_chembl_id(await _aget_compound_by_name(compound_name))
+    if not molecule_chembl_id:
+        return []
+    try:
+        activities = await _aget_activities(molecule_chembl_id, True, _enzyme_filter(enzyme_name))
+        return _parse_enzyme_interactions(activities, enzyme_name)
+    except Exception as e:
+        LOG.debug("ChEMBL enzyme interaction query failed for %s: %s", compound_name, e)
+        return []
+
+
+async def aget_enzyme_interactions(
+    compound_name: str, enzyme_name: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Async variant of `get_enzyme_interactions`."""
+    return [i.to_dict() for i in await _aenzyme_interactions(compound_name, enzyme_name)]
+
+
+async def aget_transporter_data(compound_name: str) -> List[Dict[str, str]]:
+    """Async variant of `get_transporter_data`."""
+    molecule_chembl_id = _molecule_chembl_id(await _aget_compound_by_name(compound_name))
+    if not molecule_chembl_id:
+        return []
+    try:
+        return [t.to_dict() for t in _parse_transporter_data(await _aget_activities(molecule_chembl_id))]
+    except Exception as e:
+        LOG.debug("ChEMBL transporter query failed for %s: %s", compound_name, e)
+        return []
+
+
+async def aget_pathway_data(compound_name: str) -> List[str]:
+    """Async variant of `get_pathway_data`."""
+    molecule_chembl_id = _molecule_chembl_id(await _aget_compound_by_name(compound_name))
+    if not molecule_chembl_id:
+        return []
+    try:
+        data = await _aget_json("pathway.json", _pathway_params(molecule_chembl_id))
+        return _parse_pathways(data.get("pathways", []))
+    except Exception as e:
+        LOG.debug("ChEMBL pathway query failed for %s: %s", compound_name, e)
+        return []
+
+
+async def aenrich_mechanistic_data(
+    drug_name: str, enzymes: Dict[str, List[str]]
+) -> Dict[str, Any]:
+    """Async variant of `enrich_mechanistic_data`."""
+    return _classify_enrichment(enzymes, await _aenzyme_interactions(drug_name))
+
+
+async def aenrich_mechanistic_data_many(
+    requests_by_drug: Dict[str, Dict[str, List[str]]]
+) -> Dict[str, Dict[str, Any]]:
+    """Enrich several drugs concurrently; maps drug name -> enrichment."""
+    names = list(requests_by_drug)
+    results = await asyncio.gather(
+        *(aenrich_mechanistic_data(name, requests_by_drug[name]) for name in names)
+    )
+    return dict(zip(names, results))
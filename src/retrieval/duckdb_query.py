@@ -5,6 +5,7 @@ DuckDB retrieval layer over tidy Parquet datasets.
 Datasets expected (paths are configurable via base_dir):
   - drugbank.parquet            columns: name_lower, name, synonyms(list), targets(list), ...
   - twosides.parquet            columns: drug_a, drug_b, side_effect, prr
+  - twosides_sym.parquet        optional; twosides with both orderings, sorted by drug_a
   - offsides.parquet            columns: drug_name, side_effect, prr
   - sider_label_side_effects.parquet columns: drug_name, side_effect, source_label
   - nci_almanac.parquet         columns: drug_a, drug_b, nsc_a, nsc_b, score, panel, cell_name, ...
@@ -22,8 +23,16 @@ Key fixes vs previous version:
 
 from __future__ import annotations
 
+import hashlib
+import importlib.util
 import os
 import logging
+import math
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
@@ -33,6 +42,9 @@ try:
 except ImportError:  # DuckDB is an optional evidence backend in demo-safe mode.
     duckdb = None
 
+# DuckDB's fetch_arrow_table() needs pyarrow; without it batch queries use fetchall().
+HAS_ARROW = importlib.util.find_spec("pyarrow") is not None
+
 from src.config.settings import get_settings
 from src.core.evidence import EvidenceItem
 
@@ -44,11 +56,16 @@ LOG = logging.getLogger(__name__)
 def _p(*parts: str) -> str:
     return str(Path(*parts))
 
+_NBSP_TO_SPACE = str.maketrans({"\xa0": " "})
+
+@lru_cache(maxsize=100_000)
+def _norm_str(s: str) -> str:
+    return s.strip().translate(_NBSP_TO_SPACE).lower()
+
 def _norm_name(s: Optional[str]) -> Optional[str]:
     if s is None:
         return None
-    s = str(s).strip().replace("\xa0", " ")
-    return s.lower()
+    return _norm_str(s if isinstance(s, str) else str(s))
 
 def _sql_path(path: str) -> str:
     return str(path).replace("'", "''")
@@ -56,19 +73,381 @@ def _sql_path(path: str) -> str:
 def _file_exists(base_dir: str, filename: str) -> bool:
     return Path(base_dir, filename).exists()
 
+# Parquet files below this size are copied into DuckDB tables at registration so point
+# lookups skip the per-query parquet open/footer parse; larger ones stay as views.
+_MATERIALIZE_MAX_BYTES = 50 * 1024 * 1024
+# An on-disk database pays the copy once and afterwards scans DuckDB's native blocks through
+# the buffer pool (no footer parse or page decompression), so it also materializes big files.
+_PERSISTED_MATERIALIZE_MAX_BYTES = 1024 * 1024 * 1024
+
+def _relation_kind(path: str, persisted: bool = False) -> str:
+    limit = _PERSISTED_MATERIALIZE_MAX_BYTES if persisted else _MATERIALIZE_MAX_BYTES
+    try:
+        return "TABLE" if os.path.getsize(path) < limit else "VIEW"
+    except OSError:
+        return "VIEW"
+
+# Registered relations persist in this file under base_dir, so a restart reuses the
+# materialized tables and their indexes instead of re-reading the parquet files.
+_DATABASE_FILENAME = "retrieval.duckdb"
+_KNOWN_RELATIONS = (
+    "drugbank", "twosides", "twosides_sym", "offsides", "sider_label_side_effects",
+    "nci_almanac", "nci_almanac_compounds", "dictrank", "dilirank", "diqt",
+)
+
+def _connect(base_dir: str, persist: bool) -> Any:
+    if persist and os.path.isdir(base_dir):
+        try:
+            con = duckdb.connect(database=os.path.join(base_dir, _DATABASE_FILENAME))
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS _lookup_sources (relation VARCHAR PRIMARY KEY, signature VARCHAR);"
+            )
+            return con
+        except Exception as e:
+            LOG.warning("Could not open %s under %s, using an in-memory database: %s", _DATABASE_FILENAME, base_dir, e)
+    return duckdb.connect(database=":memory:")
+
+def _configure_connection(con: Any, threads: int, memory_limit: str) -> None:
+    try:
+        con.execute(f"SET threads TO {int(threads) if threads > 0 else (os.cpu_count() or 1)};")
+        if memory_limit:
+            con.execute(f"SET memory_limit = {_sql_literal(memory_limit)};")
+    except Exception as e:
+        LOG.warning("Could not apply DuckDB thread/memory settings: %s", e)
+    # Keep parquet footers/row-group metadata across queries on the views; DuckDB < 1.1
+    # only has the (now no-op) object cache for this.
+    for statement in ("SET parquet_metadata_cache = true;", "PRAGMA enable_object_cache;"):
+        try:
+            con.execute(statement)
+            break
+        except Exception as e:
+            LOG.debug("Could not enable the parquet metadata cache with %r: %s", statement, e)
+
+def _existing_kind(con: Any, relation: str) -> Optional[str]:
+    if con.execute("SELECT 1 FROM duckdb_tables() WHERE table_name = ?", [relation]).fetchone():
+        return "TABLE"
+    if con.execute("SELECT 1 FROM duckdb_views() WHERE view_name = ?", [relation]).fetchone():
+        return "VIEW"
+    return None
+
+def _drop_relation(con: Any, relation: str) -> None:
+    kind = _existing_kind(con, relation)
+    if kind:
+        con.execute(f"DROP {kind} {relation};")
+    con.execute("DELETE FROM _lookup_sources WHERE relation = ?", [relation])
+
+def _source_signature(path: str, select_sql: str) -> str:
+    st = os.stat(path)
+    return f"{st.st_mtime_ns}:{st.st_size}:{hashlib.sha1(select_sql.encode()).hexdigest()}"
+
+def _persisted_signatures(con: Any) -> Optional[Dict[str, str]]:
+    """relation -> source signature for tables kept in the on-disk database (None when in-memory)."""
+    if _existing_kind(con, "_lookup_sources") != "TABLE":
+        return None
+    return dict(con.execute("SELECT relation, signature FROM _lookup_sources").fetchall())
+
+def _create_relation(con: Any, relation: str, kind: str, path: str, select_sql: str) -> None:
+    """CREATE `relation` from `select_sql`, unless a persisted table was built from the same file and SQL."""
+    persisted = _persisted_signatures(con)
+    if persisted is None:
+        con.execute(f"CREATE OR REPLACE {kind} {relation} AS {select_sql}")
+        return
+    signature = _source_signature(path, select_sql)
+    if kind == "TABLE" and persisted.get(relation) == signature and _existing_kind(con, relation) == "TABLE":
+        return
+    _drop_relation(con, relation)
+    con.execute(f"CREATE {kind} {relation} AS {select_sql}")
+    if kind == "TABLE":
+        con.execute("INSERT INTO _lookup_sources VALUES (?, ?)", [relation, signature])
+
+def _index_lookup_column(con: Any, relation: str, kind: str, column: str) -> None:
+    """ART index for `WHERE column = ?` point lookups (only possible on materialized tables)."""
+    if kind != "TABLE":
+        return
+    try:
+        con.execute(f"CREATE INDEX IF NOT EXISTS {relation}_{column}_idx ON {relation}({column});")
+    except Exception as e:
+        LOG.debug("Could not index %s.%s: %s", relation, column, e)
+
+
+# (lower bound, label) from highest to lowest; scores below the last bound are "low".
+_DICT_RANK_BANDS: Tuple[Tuple[float, str], ...] = ((0.7, "severe"), (0.4, "moderate"), (0.1, "mild"))
+_DILI_RISK_BANDS: Tuple[Tuple[float, str], ...] = ((0.7, "high"), (0.4, "medium"))
+
+def _band_case_sql(score_expr: str, bands: Tuple[Tuple[float, str], ...]) -> str:
+    """CASE expression bucketing a score into its band label at load time (NULL stays NULL)."""
+    whens = " ".join(f"WHEN {score_expr} >= {bound} THEN '{label}'" for bound, label in bands)
+    return f"CASE WHEN {score_expr} IS NULL THEN NULL {whens} ELSE 'low' END"
+
+
+# DrugBank's enzyme_action_map is stored as a JSON string; it is parsed into this list
+# of structs once at load, so lookups hand back lists of dicts without json.loads.
+_ENZYME_ACTION_MAP_JSON = '[{"enzyme": "VARCHAR", "actions": ["VARCHAR"]}]'
+_ENZYME_ACTION_MAP_TYPE = "STRUCT(enzyme VARCHAR, actions VARCHAR[])[]"
 
 _REGISTERED_VIEWS_BY_BASE: Dict[Tuple[str, bool, bool, bool, bool], set[str]] = {}
 
+# Hot point lookups, PREPAREd once per client cursor (for the relations that registered) so
+# each call skips parsing/binding/planning. Name -> (relation, statement).
+_PREPARED_LOOKUPS: Dict[str, Tuple[str, str]] = {
+    "q_drugbank_synonyms": ("drugbank", "SELECT synonyms FROM drugbank WHERE name_lower = $1 LIMIT 1"),
+    "q_drugbank_targets": ("drugbank", "SELECT targets FROM drugbank WHERE name_lower = $1 LIMIT 1"),
+    "q_drugbank_enzymes": (
+        "drugbank",
+        "SELECT enzymes, enzyme_actions, enzyme_action_map FROM drugbank WHERE name_lower = $1 LIMIT 1",
+    ),
+    "q_twosides_pair": (
+        "twosides_sym",
+        "SELECT MAX(prr) AS prr FROM twosides_sym WHERE drug_a = $1 AND drug_b = $2 LIMIT 1",
+    ),
+    # $1, $2 = pair, $3 = min PRR, $4 = top k
+    "q_side_effects_pair": (
+        "twosides_sym",
+        "SELECT side_effect, MAX(prr) AS prr FROM twosides_sym "
+        "WHERE drug_a = $1 AND drug_b = $2 AND (prr IS NULL OR prr >= $3) "
+        "GROUP BY side_effect ORDER BY COALESCE(MAX(prr), 0) DESC, side_effect LIMIT $4",
+    ),
+    # One drug's get_side_effects_batch list (TwoSides only): $1 = drug, $2 = min PRR, $3 = top k
+    "q_twosides_side_effects": (
+        "twosides_sym",
+        "SELECT side_effect FROM twosides_sym WHERE drug_a = $1 AND (prr IS NULL OR prr >= $2) "
+        "GROUP BY side_effect ORDER BY COALESCE(MAX(prr), 0) DESC, side_effect LIMIT $3",
+    ),
+}
+
+# Rank relation -> (score column, precomputed band label column or None).
+_RANK_COLUMNS: Dict[str, Tuple[str, Optional[str]]] = {
+    "dictrank": ("score", "severity"),
+    "dilirank": ("dili_score", "dili_risk"),
+    "diqt": ("score", None),
+}
+for _relation, _cols in _RANK_COLUMNS.items():
+    _select = ", ".join(c for c in _cols if c)
+    _PREPARED_LOOKUPS[f"q_{_relation}"] = (
+        _relation, f"SELECT {_select} FROM {_relation} WHERE drug_name = $1 LIMIT 1"
+    )
+    _PREPARED_LOOKUPS[f"q_{_relation}_like"] = (
+        _relation, f"SELECT {_select} FROM {_relation} WHERE drug_name LIKE $1 LIMIT 1"
+    )
+    # Exact match, else partial match, in one statement: $1 = name, $2 = '%name%'. A label
+    # is NULL exactly when its score is, so each COALESCE picks from the same row.
+    _PREPARED_LOOKUPS[f"q_{_relation}_best"] = (
+        _relation,
+        "SELECT " + ", ".join(
+            f"COALESCE((SELECT {c} FROM {_relation} WHERE drug_name = $1 LIMIT 1), "
+            f"(SELECT {c} FROM {_relation} WHERE drug_name LIKE $2 LIMIT 1))"
+            for c in _cols if c
+        ),
+    )
+del _relation, _cols, _select
+
+
+def _single_side_effects_sql(registered: set[str]) -> Optional[str]:
+    """Single-drug side effects across whichever sources registered: $1 drug, $2 min PRR, $3 top k."""
+    parts: List[str] = []
+    if "twosides_sym" in registered:
+        parts.append(
+            """
+            SELECT side_effect, MAX(prr) AS score, 1 AS source_priority
+            FROM twosides_sym
+            WHERE drug_a = $1
+              AND (prr IS NULL OR prr >= $2)
+            GROUP BY side_effect
+            """
+        )
+    if "offsides" in registered:
+        parts.append(
+            """
+            SELECT side_effect, MAX(prr) AS score, 2 AS source_priority
+            FROM offsides
+            WHERE drug_name = $1
+              AND (prr IS NULL OR prr >= $2)
+            GROUP BY side_effect
+            """
+        )
+    if "sider_label_side_effects" in registered:
+        parts.append(
+            """
+            SELECT side_effect, CAST(NULL AS DOUBLE) AS score, 3 AS source_priority
+            FROM sider_label_side_effects
+            WHERE drug_name = $1
+            GROUP BY side_effect
+            """
+        )
+    if not parts:
+        return None
+    return f"""
+        WITH all_effects AS (
+            {' UNION ALL '.join(parts)}
+        )
+        SELECT side_effect, MAX(score) AS score, MIN(source_priority) AS source_priority
+        FROM all_effects
+        GROUP BY side_effect
+        ORDER BY COALESCE(MAX(score), 0) DESC, MIN(source_priority), side_effect
+        LIMIT $3
+    """
+
+
+def _prepare_lookups(con: Any, registered: set[str]) -> set[str]:
+    """PREPARE every lookup whose relation registered; returns the names that prepared."""
+    statements = {
+        name: statement for name, (relation, statement) in _PREPARED_LOOKUPS.items() if relation in registered
+    }
+    single = _single_side_effects_sql(registered)
+    if single is not None:
+        statements["q_side_effects_single"] = single
+    prepared: set[str] = set()
+    for name, statement in statements.items():
+        try:
+            con.execute(f"PREPARE {name} AS {statement};")
+            prepared.add(name)
+        except Exception as e:
+            LOG.debug("Could not prepare %s: %s", name, e)
+    return prepared
+
+
+# Per-client memo of point-lookup results; rank tables up to this many rows are
+# preloaded whole into dicts on first use instead.
+_LOOKUP_CACHE_MAX = 50_000
+_MISSING = object()
+# Side-effect batches above this many drugs are split and run concurrently on cursors.
+_SIDE_EFFECT_CHUNK = 256
+# Single-drug side-effect sources with up to this many rows in total are indexed in memory
+# at client start, so get_side_effects(drug) is a dict lookup instead of a query.
+_SIDE_EFFECT_INDEX_MAX = 2_000_000
+# The sources of q_side_effects_single, each grouped to
+# (drug, side_effect, source priority, max PRR, whether any PRR is NULL).
+_SIDE_EFFECT_SOURCES: Tuple[Tuple[str, str], ...] = (
+    ("twosides_sym",
+     "SELECT drug_a, side_effect, 1, MAX(prr), bool_or(prr IS NULL) FROM twosides_sym GROUP BY drug_a, side_effect"),
+    ("offsides",
+     "SELECT drug_name, side_effect, 2, MAX(prr), bool_or(prr IS NULL) FROM offsides GROUP BY drug_name, side_effect"),
+    ("sider_label_side_effects",
+     "SELECT drug_name, side_effect, 3, CAST(NULL AS DOUBLE), true "
+     "FROM sider_label_side_effects GROUP BY drug_name, side_effect"),
+)
+
+
+# A name index is (newline-joined names, start offset of each name, names in table order).
+_NameIndex = Tuple[str, List[int], List[str]]
+
+
+def _build_name_index(names: Iterable[Optional[str]]) -> _NameIndex:
+    ordered = [n for n in dict.fromkeys(names) if n is not None]
+    starts: List[int] = []
+    offset = 0
+    for name in ordered:
+        starts.append(offset)
+        offset += len(name) + 1
+    return "\n".join(ordered), starts, ordered
+
+
+def _first_containing(index: _NameIndex, needle: str) -> Optional[str]:
+    """First name (table order) containing `needle`: what `LIKE '%needle%' LIMIT 1` matches."""
+    blob, starts, names = index
+    pos = blob.find(needle)
+    return names[bisect_right(starts, pos) - 1] if pos >= 0 else None
+
+
+def _like_literal_safe(needle: str) -> bool:
+    # LIKE wildcards and the index separator can't be matched literally in the name index.
+    return not any(ch in needle for ch in "%_\n")
+
+
+def _first_by_key(rows: Iterable[Tuple[Any, ...]]) -> Dict[Any, Any]:
+    """Map row[0] -> row[1], keeping the first row per key (like the old scan-and-break)."""
+    out: Dict[Any, Any] = {}
+    for row in rows:
+        out.setdefault(row[0], row[1])
+    return out
+
+
+def _sql_literal(value: Any) -> str:
+    # EXECUTE does not accept client-side `?` parameters, so values are inlined as literals.
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(frozen=True)
+class DrugProfile:
+    """Per-drug DrugBank lists and risk scores, as the single-drug getters would return them."""
+
+    name: str
+    synonyms: List[str] = field(default_factory=list)
+    targets: List[str] = field(default_factory=list)
+    dictrank: Optional[float] = None
+    dilirank: Optional[float] = None
+    diqt: Optional[float] = None
+
 
 # ---------- Connection / View Registration ----------
 
-@lru_cache(maxsize=8)
+# base_dir -> (time.monotonic() of the last check, parquet file signature seen then)
+_SOURCE_CHECKS: Dict[str, Tuple[float, Tuple[Tuple[str, int, int], ...]]] = {}
+
+def _parquet_signature(base_dir: str) -> Tuple[Tuple[str, int, int], ...]:
+    out = []
+    for path in sorted(Path(base_dir).glob("*.parquet")):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        out.append((path.name, st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
 def init_duckdb_connection(
     base_dir: str = "data/duckdb",
     enable_drugbank: Optional[bool] = None,
     enable_duckdb: Optional[bool] = None,
     enable_sider_nsides_offsides: Optional[bool] = None,
     enable_nci_almanac: Optional[bool] = None,
+) -> Any:
+    """
+    Shared DuckDB connection with views registered, cached per arguments.
+
+    At most every `duckdb_refresh_seconds` the parquet files under base_dir are stat'ed;
+    if any changed, the cached connections are dropped and the views re-registered on a
+    new one. Clients built on the old connection keep working on it until released.
+    """
+    ttl = get_settings().duckdb_refresh_seconds
+    root = os.path.abspath(base_dir)
+    now = time.monotonic()
+    checked = _SOURCE_CHECKS.get(root)
+    if checked is None or (ttl > 0 and now - checked[0] >= ttl):
+        signature = _parquet_signature(root)
+        if checked is not None and signature != checked[1]:
+            LOG.info("Parquet files under %s changed; re-registering DuckDB views", root)
+            _open_connection.cache_clear()  # lru_cache cannot evict a single entry
+        _SOURCE_CHECKS[root] = (now, signature)
+    return _open_connection(
+        base_dir, enable_drugbank, enable_duckdb, enable_sider_nsides_offsides, enable_nci_almanac
+    )
+
+
+def _clear_connections() -> None:
+    _open_connection.cache_clear()
+    _SOURCE_CHECKS.clear()
+
+
+init_duckdb_connection.cache_clear = _clear_connections  # type: ignore[attr-defined]
+
+
+@lru_cache(maxsize=8)
+def _open_connection(
+    base_dir: str,
+    enable_drugbank: Optional[bool],
+    enable_duckdb: Optional[bool],
+    enable_sider_nsides_offsides: Optional[bool],
+    enable_nci_almanac: Optional[bool],
 ) -> Any:
     """
     Initializes a single DuckDB connection and registers views.
@@ -87,7 +466,8 @@ def init_duckdb_connection(
     if duckdb is None:
         _REGISTERED_VIEWS_BY_BASE[key] = set()
         return None
-    con = duckdb.connect(database=":memory:")
+    con = _connect(base_dir, use_duckdb)
+    _configure_connection(con, settings.duckdb_threads, settings.duckdb_memory_limit)
     if use_duckdb:
         _REGISTERED_VIEWS_BY_BASE[key] = _register_views(
             con,
@@ -96,6 +476,10 @@ def init_duckdb_connection(
             use_sider_nsides_offsides,
             use_nci_almanac,
         )
+        if _persisted_signatures(con) is not None:
+            # Relations left over from an earlier run with other sources enabled.
+            for relation in set(_KNOWN_RELATIONS) - _REGISTERED_VIEWS_BY_BASE[key]:
+                _drop_relation(con, relation)
     else:
         _REGISTERED_VIEWS_BY_BASE[key] = set()
     return con
@@ -109,11 +493,18 @@ def _register_views(
     enable_nci_almanac: bool = False,
 ) -> set[str]:
     """
-    Register simple views over parquet files. We assume the converters already produced tidy schemas.
+    Register simple views over parquet files. We assume the converters already produced tidy schemas,
+    including lowercased name columns: the views only apply same-type casts (no-ops DuckDB drops), so
+    `WHERE drug_name = ?` reaches the parquet reader as a plain filter and prunes by row-group stats.
+    Lookup files (DrugBank, DICTRank, DILIrank, DIQT, symmetric TwoSides, OFFSIDES, SIDER, the
+    NCI-ALMANAC compound aliases) under a size cap are materialized as indexed tables instead;
+    with an on-disk database the cap is much higher.
     """
     registered: set[str] = set()
+    persisted = _persisted_signatures(con) is not None
     drugbank = _p(base_dir, "drugbank.parquet")
     twosides = _p(base_dir, "twosides.parquet")
+    twosides_sym = _p(base_dir, "twosides_sym.parquet")
     offsides = _p(base_dir, "offsides.parquet")
     sider_label_side_effects = _p(base_dir, "sider_label_side_effects.parquet")
     nci_almanac = _p(base_dir, "nci_almanac.parquet")
@@ -123,45 +514,37 @@ def _register_views(
     diqt = _p(base_dir, "diqt.parquet")
 
     # DrugBank (lowercase column is already in parquet as name_lower; reassert for safety)
-    # Note: enzyme_action_map may not exist in old parquet files, so we handle it gracefully
-    # Check if enzyme_action_map column exists in parquet
+    # Note: enzyme_action_map may not exist in old parquet files. Rather than probing the
+    # schema up front, the full select is tried first and the binder error triggers the fallback.
     if enable_drugbank and _file_exists(base_dir, "drugbank.parquet"):
+        def drugbank_select(enzyme_action_map: str) -> str:
+            return f"""
+            SELECT
+                COALESCE(name_lower, lower(name)) AS name_lower,
+                name,
+                synonyms,
+                targets,
+                target_uniprot,
+                target_actions,
+                enzymes,
+                enzyme_actions,
+                {enzyme_action_map} AS enzyme_action_map,
+                interactions
+            FROM read_parquet('{_sql_path(drugbank)}');
+        """
         try:
-            schema = con.execute(f"DESCRIBE SELECT * FROM read_parquet('{_sql_path(drugbank)}') LIMIT 0").fetchall()
-            has_enzyme_action_map = any(col[0] == 'enzyme_action_map' for col in schema)
-            if has_enzyme_action_map:
-                con.execute(f"""
-                    CREATE OR REPLACE VIEW drugbank AS
-                    SELECT
-                        COALESCE(name_lower, lower(name)) AS name_lower,
-                        name,
-                        synonyms,
-                        targets,
-                        target_uniprot,
-                        target_actions,
-                        enzymes,
-                        enzyme_actions,
-                        enzyme_action_map,
-                        interactions
-                    FROM read_parquet('{_sql_path(drugbank)}');
-                """)
-            else:
+            drugbank_kind = _relation_kind(drugbank, persisted)
+            try:
+                _create_relation(con, "drugbank", drugbank_kind, drugbank, drugbank_select(
+                    "CASE WHEN json_valid(enzyme_action_map) "
+                    f"THEN from_json(enzyme_action_map, '{_ENZYME_ACTION_MAP_JSON}') END"
+                ))
+            except duckdb.BinderException:
                 # Backward compatibility: old parquet files without enzyme_action_map
-                con.execute(f"""
-                    CREATE OR REPLACE VIEW drugbank AS
-                    SELECT
-                        COALESCE(name_lower, lower(name)) AS name_lower,
-                        name,
-                        synonyms,
-                        targets,
-                        target_uniprot,
-                        target_actions,
-                        enzymes,
-                        enzyme_actions,
-                        CAST(NULL AS VARCHAR) AS enzyme_action_map,
-                        interactions
-                    FROM read_parquet('{_sql_path(drugbank)}');
-                """)
+                _create_relation(con, "drugbank", drugbank_kind, drugbank, drugbank_select(
+                    f"CAST(NULL AS {_ENZYME_ACTION_MAP_TYPE})"
+                ))
+            _index_lookup_column(con, "drugbank", drugbank_kind, "name_lower")
             registered.add("drugbank")
         except Exception as e:
             LOG.warning("DrugBank parquet was present but could not be registered: %s", e)
@@ -178,22 +561,45 @@ def _register_views(
                     CAST(prr AS DOUBLE) AS prr
                 FROM read_parquet('{_sql_path(twosides)}');
             """)
-            registered.add("twosides")
+            # Both orderings of every pair, so order-insensitive lookups are plain equality
+            # on drug_a (and drug_b) instead of an OR across the two columns. The converter
+            # writes them pre-sorted by drug_a, so a view over that file prunes row groups
+            # for `drug_a = ?` instead of scanning twosides twice.
+            if _file_exists(base_dir, "twosides_sym.parquet"):
+                twosides_kind = _relation_kind(twosides_sym, persisted)
+                _create_relation(con, "twosides_sym", twosides_kind, twosides_sym, f"""
+                    SELECT
+                        CAST(drug_a AS VARCHAR) AS drug_a,
+                        CAST(drug_b AS VARCHAR) AS drug_b,
+                        CAST(side_effect AS VARCHAR) AS side_effect,
+                        CAST(prr AS DOUBLE) AS prr
+                    FROM read_parquet('{_sql_path(twosides_sym)}')
+                """)
+            else:
+                twosides_kind = _relation_kind(twosides, persisted)
+                _create_relation(con, "twosides_sym", twosides_kind, twosides, """
+                    SELECT drug_a, drug_b, side_effect, prr FROM twosides
+                    UNION ALL
+                    SELECT drug_b AS drug_a, drug_a AS drug_b, side_effect, prr FROM twosides
+                """)
+            _index_lookup_column(con, "twosides_sym", twosides_kind, "drug_a")
+            registered.update(("twosides", "twosides_sym"))
         except Exception as e:
             LOG.warning("TWOSIDES parquet was present but could not be registered: %s", e)
 
     # OFFSIDES (single-drug off-label ADE signals)
     if enable_sider_nsides_offsides and _file_exists(base_dir, "offsides.parquet"):
         try:
-            con.execute(f"""
-                CREATE OR REPLACE VIEW offsides AS
+            offsides_kind = _relation_kind(offsides, persisted)
+            _create_relation(con, "offsides", offsides_kind, offsides, f"""
                 SELECT
-                    lower(CAST(drug_name AS VARCHAR)) AS drug_name,
+                    CAST(drug_name AS VARCHAR) AS drug_name,
                     CAST(side_effect AS VARCHAR) AS side_effect,
                     CAST(prr AS DOUBLE) AS prr,
                     CAST(mean_reporting_frequency AS DOUBLE) AS mean_reporting_frequency
                 FROM read_parquet('{_sql_path(offsides)}');
             """)
+            _index_lookup_column(con, "offsides", offsides_kind, "drug_name")
             registered.add("offsides")
         except Exception as e:
             LOG.warning("OFFSIDES parquet was present but could not be registered: %s", e)
@@ -201,16 +607,17 @@ def _register_views(
     # SIDER label-derived side effects
     if enable_sider_nsides_offsides and _file_exists(base_dir, "sider_label_side_effects.parquet"):
         try:
-            con.execute(f"""
-                CREATE OR REPLACE VIEW sider_label_side_effects AS
+            sider_kind = _relation_kind(sider_label_side_effects, persisted)
+            _create_relation(con, "sider_label_side_effects", sider_kind, sider_label_side_effects, f"""
                 SELECT
-                    lower(CAST(drug_name AS VARCHAR)) AS drug_name,
+                    CAST(drug_name AS VARCHAR) AS drug_name,
                     CAST(stitch_id AS VARCHAR) AS stitch_id,
                     CAST(side_effect AS VARCHAR) AS side_effect,
                     CAST(source_label AS VARCHAR) AS source_label,
                     CAST(meddra_id AS VARCHAR) AS meddra_id
                 FROM read_parquet('{_sql_path(sider_label_side_effects)}');
             """)
+            _index_lookup_column(con, "sider_label_side_effects", sider_kind, "drug_name")
             registered.add("sider_label_side_effects")
         except Exception as e:
             LOG.warning("SIDER label side-effect parquet was present but could not be registered: %s", e)
@@ -227,8 +634,8 @@ def _register_views(
                     CAST(test_date AS VARCHAR) AS test_date,
                     CAST(panel_nbr AS BIGINT) AS panel_nbr,
                     CAST(cell_nbr AS BIGINT) AS cell_nbr,
-                    lower(CAST(drug_a AS VARCHAR)) AS drug_a,
-                    lower(CAST(drug_b AS VARCHAR)) AS drug_b,
+                    CAST(drug_a AS VARCHAR) AS drug_a,
+                    CAST(drug_b AS VARCHAR) AS drug_b,
                     CAST(drug_a_display AS VARCHAR) AS drug_a_display,
                     CAST(drug_b_display AS VARCHAR) AS drug_b_display,
                     CAST(nsc_a AS VARCHAR) AS nsc_a,
@@ -255,14 +662,15 @@ def _register_views(
 
     if enable_nci_almanac and _file_exists(base_dir, "nci_almanac_compounds.parquet"):
         try:
-            con.execute(f"""
-                CREATE OR REPLACE VIEW nci_almanac_compounds AS
+            compounds_kind = _relation_kind(nci_almanac_compounds, persisted)
+            _create_relation(con, "nci_almanac_compounds", compounds_kind, nci_almanac_compounds, f"""
                 SELECT
                     CAST(nsc AS VARCHAR) AS nsc,
-                    lower(CAST(drug_name AS VARCHAR)) AS drug_name,
+                    CAST(drug_name AS VARCHAR) AS drug_name,
                     CAST(display_name AS VARCHAR) AS display_name
                 FROM read_parquet('{_sql_path(nci_almanac_compounds)}');
             """)
+            _index_lookup_column(con, "nci_almanac_compounds", compounds_kind, "drug_name")
             registered.add("nci_almanac_compounds")
         except Exception as e:
             LOG.warning("NCI-ALMANAC compound alias parquet was present but could not be registered: %s", e)
@@ -270,13 +678,15 @@ def _register_views(
     # DICTRank
     if _file_exists(base_dir, "dictrank.parquet"):
         try:
-            con.execute(f"""
-                CREATE OR REPLACE VIEW dictrank AS
+            dictrank_kind = _relation_kind(dictrank, persisted)
+            _create_relation(con, "dictrank", dictrank_kind, dictrank, f"""
                 SELECT
-                    lower(drug_name) AS drug_name,
-                    CAST(score AS DOUBLE) AS score
+                    CAST(drug_name AS VARCHAR) AS drug_name,
+                    CAST(score AS DOUBLE) AS score,
+                    {_band_case_sql("CAST(score AS DOUBLE)", _DICT_RANK_BANDS)} AS severity
                 FROM read_parquet('{_sql_path(dictrank)}');
             """)
+            _index_lookup_column(con, "dictrank", dictrank_kind, "drug_name")
             registered.add("dictrank")
         except Exception as e:
             LOG.warning("DICTRank parquet was present but could not be registered: %s", e)
@@ -284,13 +694,15 @@ def _register_views(
     # DILIRank
     if _file_exists(base_dir, "dilirank.parquet"):
         try:
-            con.execute(f"""
-                CREATE OR REPLACE VIEW dilirank AS
+            dilirank_kind = _relation_kind(dilirank, persisted)
+            _create_relation(con, "dilirank", dilirank_kind, dilirank, f"""
                 SELECT
-                    lower(drug_name) AS drug_name,
-                    CAST(dili_score AS DOUBLE) AS dili_score
+                    CAST(drug_name AS VARCHAR) AS drug_name,
+                    CAST(dili_score AS DOUBLE) AS dili_score,
+                    {_band_case_sql("CAST(dili_score AS DOUBLE)", _DILI_RISK_BANDS)} AS dili_risk
                 FROM read_parquet('{_sql_path(dilirank)}');
             """)
+            _index_lookup_column(con, "dilirank", dilirank_kind, "drug_name")
             registered.add("dilirank")
         except Exception as e:
             LOG.warning("DILIrank parquet was present but could not be registered: %s", e)
@@ -298,13 +710,14 @@ def _register_views(
     # DIQT (tidy 2-col)
     if _file_exists(base_dir, "diqt.parquet"):
         try:
-            con.execute(f"""
-                CREATE OR REPLACE VIEW diqt AS
+            diqt_kind = _relation_kind(diqt, persisted)
+            _create_relation(con, "diqt", diqt_kind, diqt, f"""
                 SELECT
-                    lower(drug_name) AS drug_name,
+                    CAST(drug_name AS VARCHAR) AS drug_name,
                     CAST(score AS DOUBLE) AS score
                 FROM read_parquet('{_sql_path(diqt)}');
             """)
+            _index_lookup_column(con, "diqt", diqt_kind, "drug_name")
             registered.add("diqt")
         except Exception as e:
             LOG.warning("DIQT parquet was present but could not be registered: %s", e)
@@ -342,7 +755,7 @@ class DuckDBClient:
             if enable_nci_almanac is None
             else bool(enable_nci_almanac)
         )
-        self._con = init_duckdb_connection(
+        self._connection = init_duckdb_connection(
             self.base_dir,
             enable_drugbank=self.enable_drugbank,
             enable_duckdb=self.enable_duckdb,
@@ -357,6 +770,203 @@ class DuckDBClient:
             self.enable_nci_almanac,
         )
         self.registered_views = set(_REGISTERED_VIEWS_BY_BASE.get(key, set()))
+        # The initialized connection is shared by every client on the same base_dir; each client
+        # queries through its own cursor (same catalog and buffer pool, separate client context)
+        # so clients do not serialize on one connection. A cursor is not thread-safe, so every
+        # thread that uses this client gets its own (see _con). Prepared statements are per cursor.
+        self._local = threading.local()
+        con = self._connection.cursor() if self._connection is not None else None
+        self._prepared = _prepare_lookups(con, self.registered_views) if con is not None else set()
+        self._local.con = con
+        self._lookup_cache: Dict[Tuple[Any, ...], Optional[Tuple[Any, ...]]] = {}
+        self._rank_tables: Dict[str, Optional[Dict[str, Any]]] = {}
+        # relation -> name index for partial-name (LIKE '%name%') fallbacks without a table scan
+        self._name_index: Dict[str, _NameIndex] = {}
+        # Whole-table preloads (rank tables, DrugBank lists, side-effect index) are built on
+        # first use, so constructing a client costs only the cursor and its prepared statements.
+        self._preloads: Dict[str, Any] = {}
+
+    @property
+    def _con(self) -> Any:
+        """This thread's cursor, opened (with the lookups prepared) on first use from it."""
+        con = getattr(self._local, "con", None)
+        if con is None and self._connection is not None:
+            con = self._connection.cursor()
+            _prepare_lookups(con, self.registered_views)
+            self._local.con = con
+        return con
+
+    @_con.setter
+    def _con(self, con: Any) -> None:
+        self._local.con = con
+
+    def _execute_prepared(self, name: str, *params: Any) -> Optional[Tuple[Any, ...]]:
+        """Single row of a prepared point lookup (they select at most one), or None."""
+        args = ", ".join(_sql_literal(p) for p in params)
+        return self._con.execute(f"EXECUTE {name}({args});").fetchone()
+
+    def _prepared_rows(self, name: str, *params: Any) -> List[Tuple[Any, ...]]:
+        args = ", ".join(_sql_literal(p) for p in params)
+        return self._con.execute(f"EXECUTE {name}({args});").fetchall()
+
+    def _cached_lookup(self, name: str, *params: str) -> Optional[Tuple[Any, ...]]:
+        """`_execute_prepared`, memoized per (statement, normalized params)."""
+        key = (name, *params)
+        row = self._lookup_cache.get(key, _MISSING)
+        if row is _MISSING:
+            row = self._execute_prepared(name, *params)
+            if len(self._lookup_cache) >= _LOOKUP_CACHE_MAX:
+                self._lookup_cache.clear()
+            self._lookup_cache[key] = row
+        return row
+
+    def _rank_table(self, relation: str) -> Optional[Dict[str, Tuple[Any, ...]]]:
+        """Whole rank table as drug_name -> (score[, label]), or None when too large to preload."""
+        if relation in self._rank_tables:
+            return self._rank_tables[relation]
+        table: Optional[Dict[str, Any]] = None
+        try:
+            (count,) = self._con.execute(f"SELECT COUNT(*) FROM {relation};").fetchone()
+            if count <= _LOOKUP_CACHE_MAX:
+                table = {}
+                columns = ", ".join(c for c in _RANK_COLUMNS[relation] if c)
+                rows = self._con.execute(f"SELECT drug_name, {columns} FROM {relation};").fetchall()
+                for name, *values in rows:
+                    if name is not None:
+                        table.setdefault(name, tuple(values))
+                self._name_index[relation] = _build_name_index(table)
+        except Exception as e:
+            LOG.debug("Could not preload %s: %s", relation, e)
+            table = None
+        self._rank_tables[relation] = table
+        return table
+
+    def _rank_exact(self, relation: str, d: str) -> Optional[Tuple[Any, ...]]:
+        """Exact-name rank lookup with the same row shape as the prepared `q_<relation>` query."""
+        table = self._rank_table(relation)
+        if table is None:
+            return self._cached_lookup(f"q_{relation}", d)
+        return table.get(d)
+
+    @property
+    def _drugbank_lists(self) -> Optional[Dict[str, Tuple[Any, Any]]]:
+        """DrugBank name_lower -> (synonyms, targets), or None when the table is too large to preload."""
+        if "drugbank" not in self._preloads:
+            self._preloads["drugbank"] = self._preload_drugbank() if self.has_view("drugbank") else None
+        return self._preloads["drugbank"]
+
+    @_drugbank_lists.setter
+    def _drugbank_lists(self, lists: Optional[Dict[str, Tuple[Any, Any]]]) -> None:
+        self._preloads["drugbank"] = lists
+
+    @property
+    def _side_effect_index(self) -> Optional[Dict[str, List[Tuple[Any, ...]]]]:
+        """drug -> grouped rows of _SIDE_EFFECT_SOURCES, or None when they are too large to preload."""
+        if "side_effects" not in self._preloads:
+            self._preloads["side_effects"] = (
+                self._preload_side_effects() if "q_side_effects_single" in self._prepared else None
+            )
+        return self._preloads["side_effects"]
+
+    @_side_effect_index.setter
+    def _side_effect_index(self, index: Optional[Dict[str, List[Tuple[Any, ...]]]]) -> None:
+        self._preloads["side_effects"] = index
+
+    def _preload_drugbank(self) -> Optional[Dict[str, Tuple[Any, Any]]]:
+        """Synonym/target lists and the partial-name index for DrugBank, if it is small enough."""
+        try:
+            (count,) = self._con.execute("SELECT COUNT(*) FROM drugbank;").fetchone()
+            if count <= _LOOKUP_CACHE_MAX:
+                names, synonyms, targets = self._fetch_columns("SELECT name_lower, synonyms, targets FROM drugbank;", [])
+                lists: Dict[str, Tuple[Any, Any]] = {}
+                for name, syn, tgt in zip(names, synonyms, targets):
+                    if name is not None:
+                        lists.setdefault(name, (syn, tgt))
+                self._name_index["drugbank"] = _build_name_index(lists)
+                return lists
+        except Exception as e:
+            LOG.debug("Could not preload DrugBank names: %s", e)
+        return None
+
+    def _preload_side_effects(self) -> Optional[Dict[str, List[Tuple[Any, ...]]]]:
+        """Index the single-drug side-effect sources by drug, if they are small enough."""
+        sources = [(relation, sql) for relation, sql in _SIDE_EFFECT_SOURCES if self.has_view(relation)]
+        try:
+            total = sum(self._con.execute(f"SELECT COUNT(*) FROM {relation};").fetchone()[0] for relation, _ in sources)
+            if total > _SIDE_EFFECT_INDEX_MAX:
+                return None
+            # Bucketed per drug in SQL: one row per drug carrying its rows as parallel lists.
+            columns = self._fetch_columns(
+                f"""
+                SELECT drug, list(side_effect), list(priority), list(prr), list(has_null)
+                FROM ({" UNION ALL ".join(sql for _, sql in sources)}) t(drug, side_effect, priority, prr, has_null)
+                WHERE drug IS NOT NULL
+                GROUP BY drug;
+                """,
+                [],
+            )
+            return {drug: list(zip(*lists)) for drug, *lists in zip(*columns)}
+        except Exception as e:
+            LOG.debug("Could not preload side effects: %s", e)
+        return None
+
+    def _indexed_side_effects(self, d: str, top_k: int, min_prr: float) -> List[str]:
+        """q_side_effects_single answered from the preloaded index."""
+        merged: Dict[Optional[str], List[Any]] = {}
+        for side_effect, priority, prr, has_null in self._side_effect_index.get(d, ()):
+            # Rows below min_prr are dropped before MAX(prr), so a group that only keeps its
+            # NULL-PRR rows scores NULL.
+            if prr is not None and prr >= min_prr:
+                score = prr
+            elif has_null:
+                score = None
+            else:
+                continue
+            entry = merged.get(side_effect)
+            if entry is None:
+                merged[side_effect] = [score, priority]
+                continue
+            if score is not None and (entry[0] is None or score > entry[0]):
+                entry[0] = score
+            entry[1] = min(entry[1], priority)
+        ranked = sorted(
+            merged.items(),
+            key=lambda item: (-(item[1][0] or 0.0), item[1][1], item[0] is None, item[0] or ""),
+        )
+        return [side_effect for side_effect, _ in ranked[:max(top_k, 0)]]
+
+    def _rank_row(self, relation: str, d: str) -> Tuple[Any, ...]:
+        """Exact-name (score[, label]), else the first partial (`LIKE '%d%'`) match; one query if not preloaded."""
+        if self._rank_table(relation) is None:
+            row = self._cached_lookup(f"q_{relation}_best", d, f"%{d}%")
+        else:
+            row = self._rank_exact(relation, d)
+            if not row or row[0] is None:
+                row = self._rank_like(relation, d)
+        return row or (None, None)
+
+    def _rank_score(self, relation: str, d: str) -> Optional[float]:
+        return _as_float(self._rank_row(relation, d)[0])
+
+    def _rank_like(self, relation: str, d: str) -> Optional[Tuple[Any, ...]]:
+        """Partial-name (`LIKE '%d%'`) rank lookup; first containing name in table order."""
+        table = self._rank_table(relation)
+        index = self._name_index.get(relation)
+        if table is None or index is None or not _like_literal_safe(d):
+            return self._cached_lookup(f"q_{relation}_like", f"%{d}%")
+        name = _first_containing(index, d)
+        return table[name] if name is not None else None
+
+    def _fetch_columns(self, sql: str, params: List[Any], con: Any = None) -> List[List[Any]]:
+        """Result as one Python list per column, via Arrow (no per-row tuples) when available."""
+        cursor = (con or self._con).execute(sql, params)
+        if HAS_ARROW:
+            # to_arrow_table() on DuckDB >= 1.4; fetch_arrow_table() before that.
+            to_arrow = getattr(cursor, "to_arrow_table", None) or cursor.fetch_arrow_table
+            return [column.to_pylist() for column in to_arrow().columns]
+        rows = cursor.fetchall()
+        width = len(cursor.description or ())
+        return [list(column) for column in zip(*rows)] if rows else [[] for _ in range(width)]
 
     def has_view(self, view_name: str) -> bool:
         return view_name in self.registered_views
@@ -379,13 +989,12 @@ class DuckDBClient:
         d = _norm_name(drug_name)
         if not d or not self.has_view("drugbank"):
             return []
-        rows = self._con.execute(
-            "SELECT synonyms FROM drugbank WHERE name_lower = ? LIMIT 1;",
-            [d],
-        ).fetchall()
-        if not rows:
-            return []
-        return [s for s in (rows[0][0] or []) if s]
+        if self._drugbank_lists is not None:
+            synonyms = self._drugbank_lists.get(d, (None, None))[0]
+        else:
+            row = self._cached_lookup("q_drugbank_synonyms", d)
+            synonyms = row[0] if row else None
+        return [s for s in (synonyms or []) if s]
 
     # --- Risk Scores ---
 
@@ -395,16 +1004,8 @@ class DuckDBClient:
         b = _norm_name(drug2)
         if not a or not b or not self.has_view("twosides"):
             return 0.0
-        rows = self._con.execute(
-            """
-            SELECT MAX(prr) AS prr
-            FROM twosides
-            WHERE ((drug_a = ? AND drug_b = ?) OR (drug_a = ? AND drug_b = ?))
-            LIMIT 1;
-            """,
-            [a, b, b, a],
-        ).fetchall()
-        return float(rows[0][0]) if rows and rows[0][0] is not None else 0.0
+        row = self._cached_lookup("q_twosides_pair", *sorted((a, b)))  # twosides_sym holds both orders
+        return float(row[0]) if row and row[0] is not None else 0.0
 
     def _get_nci_nscs(self, drug_name: str, *, limit: int = 50) -> List[str]:
         d = _norm_name(drug_name)
@@ -521,32 +1122,8 @@ class DuckDBClient:
         d = _norm_name(drug_name)
         if not d or not self.has_view("dictrank"):
             return "unknown"
-        # Try exact match first
-        rows = self._con.execute(
-            "SELECT score FROM dictrank WHERE drug_name = ? LIMIT 1;",
-            [d],
-        ).fetchall()
-        if not rows or rows[0][0] is None:
-            # Try partial match
-            rows = self._con.execute(
-                "SELECT score FROM dictrank WHERE drug_name LIKE ? LIMIT 1;",
-                [f"%{d}%"],
-            ).fetchall()
-        if not rows or rows[0][0] is None:
-            return "unknown"
-        # Convert score to severity string
-        try:
-            score = float(rows[0][0])
-        except (ValueError, TypeError):
-            return "unknown"
-        if score >= 0.7:
-            return "severe"
-        elif score >= 0.4:
-            return "moderate"
-        elif score >= 0.1:
-            return "mild"
-        else:
-            return "low"
+        # Exact match, else partial match; severity was bucketed when the table loaded
+        return self._rank_row("dictrank", d)[1] or "unknown"
 
     def get_dili_risk(self, drug_name: str | List[str]) -> str | None | Dict[str, str]:
         """Get DILI risk for a drug or list of drugs."""
@@ -555,30 +1132,8 @@ class DuckDBClient:
         d = _norm_name(drug_name)
         if not d or not self.has_view("dilirank"):
             return None
-        # Try exact match first
-        rows = self._con.execute(
-            "SELECT dili_score FROM dilirank WHERE drug_name = ? LIMIT 1;",
-            [d],
-        ).fetchall()
-        if not rows or rows[0][0] is None:
-            # Try partial match
-            rows = self._con.execute(
-                "SELECT dili_score FROM dilirank WHERE drug_name LIKE ? LIMIT 1;",
-                [f"%{d}%"],
-            ).fetchall()
-        if not rows or rows[0][0] is None:
-            return None
-        # Convert score to risk category
-        try:
-            score = float(rows[0][0])
-        except (ValueError, TypeError):
-            return None
-        if score >= 0.7:
-            return "high"
-        elif score >= 0.4:
-            return "medium"
-        else:
-            return "low"
+        # Exact match, else partial match; risk category was bucketed when the table loaded
+        return self._rank_row("dilirank", d)[1]
 
     def get_diqt_score(self, drug_name: str | List[str]) -> Optional[float] | Dict[str, Optional[float]]:
         """Get DIQT score for a drug or list of drugs."""
@@ -587,80 +1142,169 @@ class DuckDBClient:
         d = _norm_name(drug_name)
         if not d or not self.has_view("diqt"):
             return None
-        # Try exact match first
-        rows = self._con.execute(
-            "SELECT score FROM diqt WHERE drug_name = ? LIMIT 1;",
-            [d],
-        ).fetchall()
-        if rows and rows[0][0] is not None:
-            try:
-                return float(rows[0][0])
-            except (ValueError, TypeError):
-                pass
-        # Try partial match (e.g., "warfarin" matches "warfarin sodium")
-        rows = self._con.execute(
-            "SELECT score FROM diqt WHERE drug_name LIKE ? LIMIT 1;",
-            [f"%{d}%"],
-        ).fetchall()
-        if rows and rows[0][0] is not None:
-            try:
-                return float(rows[0][0])
-            except (ValueError, TypeError):
-                return None
-        return None
+        # Exact match, else partial match (e.g., "warfarin" matches "warfarin sodium")
+        return self._rank_score("diqt", d)
 
     # Legacy aliases for backward compatibility
     def get_dictrank_score(self, drug_name: str) -> Optional[float]:
         d = _norm_name(drug_name)
         if not d or not self.has_view("dictrank"):
             return None
-        # Try exact match first
-        rows = self._con.execute(
-            "SELECT score FROM dictrank WHERE drug_name = ? LIMIT 1;",
-            [d],
-        ).fetchall()
-        if rows and rows[0][0] is not None:
-            try:
-                return float(rows[0][0])
-            except (ValueError, TypeError):
-                return None
-        # Try partial match (e.g., "warfarin" matches "warfarin sodium")
-        rows = self._con.execute(
-            "SELECT score FROM dictrank WHERE drug_name LIKE ? LIMIT 1;",
-            [f"%{d}%"],
-        ).fetchall()
-        if rows and rows[0][0] is not None:
-            try:
-                return float(rows[0][0])
-            except (ValueError, TypeError):
-                return None
-        return None
+        # Exact match, else partial match (e.g., "warfarin" matches "warfarin sodium")
+        return self._rank_score("dictrank", d)
 
     def get_dilirank_score(self, drug_name: str) -> Optional[float]:
         d = _norm_name(drug_name)
         if not d or not self.has_view("dilirank"):
             return None
-        # Try exact match first
-        rows = self._con.execute(
-            "SELECT dili_score FROM dilirank WHERE drug_name = ? LIMIT 1;",
-            [d],
-        ).fetchall()
-        if rows and rows[0][0] is not None:
-            try:
-                return float(rows[0][0])
-            except (ValueError, TypeError):
-                return None
-        # Try partial match (e.g., "warfarin" matches "warfarin sodium")
-        rows = self._con.execute(
-            "SELECT dili_score FROM dilirank WHERE drug_name LIKE ? LIMIT 1;",
-            [f"%{d}%"],
-        ).fetchall()
-        if rows and rows[0][0] is not None:
+        # Exact match, else partial match (e.g., "warfarin" matches "warfarin sodium")
+        return self._rank_score("dilirank", d)
+
+    def get_all_risks(self, drug_name: str) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        """
+        DICTRank, DILIrank and DIQT scores for one drug, as (dict, dili, diqt).
+
+        Same exact-then-partial matching as get_dictrank_score / get_dilirank_score /
+        get_diqt_score. Preloaded rank tables answer from memory; any others are
+        fetched together in a single UNION ALL query.
+        """
+        d = _norm_name(drug_name)
+        relations = ("dictrank", "dilirank", "diqt")
+        scores: Dict[str, Any] = dict.fromkeys(relations)
+        if not d:
+            return None, None, None
+
+        pending: List[str] = []
+        for relation in relations:
+            if not self.has_view(relation):
+                continue
+            if self._rank_table(relation) is None:
+                pending.append(relation)
+                continue
+            scores[relation] = self._rank_score(relation, d)
+
+        if pending:
+            parts = [
+                f"""
+                SELECT '{relation}' AS src,
+                       COALESCE(
+                           (SELECT {_RANK_COLUMNS[relation][0]} FROM {relation} WHERE drug_name = ? LIMIT 1),
+                           (SELECT {_RANK_COLUMNS[relation][0]} FROM {relation} WHERE drug_name LIKE ? LIMIT 1)
+                       ) AS score
+                """
+                for relation in pending
+            ]
+            params = [p for _ in pending for p in (d, f"%{d}%")]
+            for relation, score in self._con.execute(" UNION ALL ".join(parts), params).fetchall():
+                scores[relation] = score
+
+        out: List[Optional[float]] = []
+        for relation in relations:
             try:
-                return float(rows[0][0])
+                out.append(float(scores[relation]) if scores[relation] is not None else None)
             except (ValueError, TypeError):
-                return None
-        return None
+                out.append(None)
+        return out[0], out[1], out[2]
+
+    def get_drug_profile(self, drug_name: str) -> DrugProfile:
+        """
+        get_synonyms, get_drug_targets, get_dictrank_score, get_dilirank_score and
+        get_diqt_score for one drug, in at most one query.
+        """
+        d = _norm_name(drug_name) or ""
+        return self._drug_profiles([d]).get(d) or DrugProfile(name=d)
+
+    def get_drug_profiles(self, drugs: Iterable[str]) -> Dict[str, DrugProfile]:
+        """Batch version of get_drug_profile: {drug: profile} for every non-empty input, in one query."""
+        names = [x for x in drugs if x]
+        profiles = self._drug_profiles(names)
+        return {x: profiles.get(_norm_name(x) or "") or DrugProfile(name=_norm_name(x) or "") for x in names}
+
+    def _drug_profiles(self, names: Iterable[str]) -> Dict[str, DrugProfile]:
+        """
+        Profiles keyed by normalized name. Preloaded rank tables and DrugBank lists answer
+        from memory; every other lookup for every name goes into one UNION ALL query.
+        """
+        normed = list(dict.fromkeys(n for n in (_norm_name(x) for x in names) if n))
+        fields: Dict[str, Dict[str, Any]] = {d: {} for d in normed}
+        parts: List[str] = []
+        params: List[Any] = []
+        for relation in _RANK_COLUMNS:
+            if not self.has_view(relation):
+                continue
+            preloaded = self._rank_table(relation) is not None
+            for d in normed:
+                if preloaded:
+                    fields[d][relation] = self._rank_score(relation, d)
+                    continue
+                column = _RANK_COLUMNS[relation][0]
+                parts.append(
+                    f"""
+                    SELECT ? AS drug, '{relation}' AS src,
+                           COALESCE(
+                               (SELECT {column} FROM {relation} WHERE drug_name = ? LIMIT 1),
+                               (SELECT {column} FROM {relation} WHERE drug_name LIKE ? LIMIT 1)
+                           ) AS score,
+                           CAST(NULL AS VARCHAR[]) AS synonyms,
+                           CAST(NULL AS VARCHAR[]) AS targets
+                    """
+                )
+                params.extend([d, d, f"%{d}%"])
+        if self.has_view("drugbank") and normed:
+            if self._drugbank_lists is not None:
+                for d in normed:
+                    fields[d]["synonyms"], fields[d]["targets"] = self._drugbank_lists.get(d, (None, None))
+            else:
+                # Exact names only, so all drugs share one branch; the first row per name wins.
+                parts.append(
+                    """
+                    SELECT name_lower AS drug, 'drugbank' AS src, CAST(NULL AS DOUBLE) AS score, synonyms, targets
+                    FROM drugbank WHERE name_lower = ANY(?::VARCHAR[])
+                    """
+                )
+                params.append(normed)
+        if parts:
+            columns = self._fetch_columns(" UNION ALL ".join(parts), params)
+            for d, src, score, synonyms, targets in zip(*columns):
+                if src == "drugbank":
+                    if "targets" not in fields[d]:
+                        fields[d]["synonyms"], fields[d]["targets"] = synonyms, targets
+                else:
+                    fields[d][src] = _as_float(score)
+
+        return {
+            d: DrugProfile(
+                name=d,
+                synonyms=[x for x in (f.get("synonyms") or []) if x],
+                targets=[x for x in (f.get("targets") or []) if x],
+                dictrank=f.get("dictrank"),
+                dilirank=f.get("dilirank"),
+                diqt=f.get("diqt"),
+            )
+            for d, f in fields.items()
+        }
+
+    def get_risk_bundle(self, drug_a: str, drug_b: str) -> Dict[str, Any]:
+        """
+        Fetch DILIrank/DICTRank/DIQT scores and DrugBank targets for a pair in one round-trip.
+
+        Scores keep the exact-then-partial matching of the single-drug legacy methods
+        (get_dilirank_score, get_dictrank_score, get_diqt_score); targets are exact matches
+        like get_drug_targets. Returns {dili_a, dili_b, dict_a, dict_b, diqt_a, diqt_b,
+        targets_a, targets_b}; scores are None and targets [] when unavailable.
+        """
+        a, b = _norm_name(drug_a), _norm_name(drug_b)
+        profiles = self._drug_profiles([x for x in (a, b) if x])
+        bundle: Dict[str, Any] = {}
+        for side, d in (("a", a), ("b", b)):
+            profile = profiles.get(d or "") or DrugProfile(name=d or "")
+            bundle.update({
+                f"dili_{side}": profile.dilirank,
+                f"dict_{side}": profile.dictrank,
+                f"diqt_{side}": profile.diqt,
+                f"targets_{side}": list(profile.targets),
+            })
+        return bundle
 
     # --- TwoSides side-effects ---
 
@@ -687,71 +1331,60 @@ class DuckDBClient:
             return []
 
         if b is None:
-            parts: List[str] = []
-            params: List[Any] = []
-            if self.has_view("twosides"):
-                parts.append(
-                    """
-                    SELECT side_effect, MAX(prr) AS score, 1 AS source_priority
-                    FROM twosides
-                    WHERE (drug_a = ? OR drug_b = ?)
-                      AND (prr IS NULL OR prr >= ?)
-                    GROUP BY side_effect
-                    """
-                )
-                params.extend([a, a, float(min_prr)])
-            if self.has_view("offsides"):
-                parts.append(
-                    """
-                    SELECT side_effect, MAX(prr) AS score, 2 AS source_priority
-                    FROM offsides
-                    WHERE drug_name = ?
-                      AND (prr IS NULL OR prr >= ?)
-                    GROUP BY side_effect
-                    """
-                )
-                params.extend([a, float(min_prr)])
-            if self.has_view("sider_label_side_effects"):
-                parts.append(
-                    """
-                    SELECT side_effect, CAST(NULL AS DOUBLE) AS score, 3 AS source_priority
-                    FROM sider_label_side_effects
-                    WHERE drug_name = ?
-                    GROUP BY side_effect
-                    """
-                )
-                params.append(a)
-            if not parts:
+            if "q_side_effects_single" not in self._prepared:
                 return []
-            sql = f"""
-                WITH all_effects AS (
-                    {' UNION ALL '.join(parts)}
-                )
-                SELECT side_effect, MAX(score) AS score, MIN(source_priority) AS source_priority
-                FROM all_effects
-                GROUP BY side_effect
-                ORDER BY COALESCE(MAX(score), 0) DESC, MIN(source_priority), side_effect
-                LIMIT ?;
-            """
-            rows = self._con.execute(sql, params + [int(top_k)]).fetchall()
+            if self._side_effect_index is not None:
+                return self._indexed_side_effects(a, int(top_k), float(min_prr))
+            rows = self._prepared_rows("q_side_effects_single", a, float(min_prr), int(top_k))
             return [r[0] for r in rows]
 
-        # Pair (order-insensitive)
+        # Pair (order-insensitive): memoized per sorted pair, since graph callers revisit pairs.
         if not self.has_view("twosides"):
             return []
+        x, y = sorted((a, b))
+        key = ("q_side_effects_pair", x, y, float(min_prr), int(top_k))
+        side_effects = self._lookup_cache.get(key)
+        if side_effects is None:
+            rows = self._prepared_rows("q_side_effects_pair", x, y, float(min_prr), int(top_k))
+            side_effects = tuple(r[0] for r in rows)
+            if len(self._lookup_cache) >= _LOOKUP_CACHE_MAX:
+                self._lookup_cache.clear()
+            self._lookup_cache[key] = side_effects
+        return list(side_effects)
+
+    def get_side_effect_prrs(
+        self,
+        drug_a: str,
+        side_effects: Iterable[str],
+        drug_b: Optional[str] = None,
+    ) -> Dict[str, float]:
+        """
+        Max TwoSides PRR per side effect in one query.
+        Single drug matches either pair position; with drug_b the pair is order-insensitive.
+        Side effects without a PRR are omitted.
+        """
+        a = _norm_name(drug_a)
+        b = _norm_name(drug_b) if drug_b else None
+        terms = list(dict.fromkeys(se for se in side_effects if se))
+        if not a or (drug_b and not b) or not terms or not self.has_view("twosides"):
+            return {}
+        if b is None:
+            where = "drug_a = ?"
+            params: List[Any] = [a]
+        else:
+            where = "drug_a = ? AND drug_b = ?"
+            params = [a, b]
+        placeholders = ", ".join("?" for _ in terms)
         rows = self._con.execute(
-            """
+            f"""
             SELECT side_effect, MAX(prr) AS prr
-            FROM twosides
-            WHERE ((drug_a = ? AND drug_b = ?) OR (drug_a = ? AND drug_b = ?))
-              AND (prr IS NULL OR prr >= ?)
-            GROUP BY side_effect
-            ORDER BY COALESCE(MAX(prr), 0) DESC, side_effect
-            LIMIT ?;
+            FROM twosides_sym
+            WHERE {where} AND side_effect IN ({placeholders})
+            GROUP BY side_effect;
             """,
-            [a, b, b, a, float(min_prr), int(top_k)],
+            params + terms,
         ).fetchall()
-        return [r[0] for r in rows]
+        return {side_effect: prr for side_effect, prr in rows if prr}  # prr is already a DOUBLE
 
     # --- Batch helpers ---
 
@@ -762,143 +1395,170 @@ class DuckDBClient:
         Batch version for single-drug side effects (used for building context quickly).
         Returns {drug: [side_effects...]}.
         """
-        normed = [d for d in {_norm_name(x) for x in drugs} if d]
+        seen: set[str] = set()
+        normed: List[str] = []
+        for x in drugs:
+            d = _norm_name(x)
+            if d and d not in seen:
+                seen.add(d)
+                normed.append(d)
         if not normed:
             return {}
         if not self.has_view("twosides"):
             return {d: [] for d in normed}
+        if len(normed) == 1 and "q_twosides_side_effects" in self._prepared:
+            rows = self._prepared_rows("q_twosides_side_effects", normed[0], float(min_prr), int(top_k_per_drug))
+            return {normed[0]: [r[0] for r in rows]}
+
+        if len(normed) > _SIDE_EFFECT_CHUNK:
+            chunks = [normed[i:i + _SIDE_EFFECT_CHUNK] for i in range(0, len(normed), _SIDE_EFFECT_CHUNK)]
+            result: Dict[str, List[str]] = {}
+            # Each chunk gets its own cursor: cursors share the database and buffer pool
+            # but execute independently, so the chunks' twosides scans overlap.
+            def run(chunk: List[str]) -> Dict[str, List[str]]:
+                cursor = self._con.cursor()
+                try:
+                    return self._side_effects_chunk(chunk, top_k_per_drug, min_prr, cursor)
+                finally:
+                    cursor.close()
+
+            with ThreadPoolExecutor(max_workers=min(len(chunks), os.cpu_count() or 1)) as pool:
+                for part in pool.map(run, chunks):
+                    result.update(part)
+            return result
+        return self._side_effects_chunk(normed, top_k_per_drug, min_prr, self._con)
+
+    def _side_effects_chunk(
+        self, normed: List[str], top_k_per_drug: int, min_prr: float, con: Any
+    ) -> Dict[str, List[str]]:
+        # Query all at once; twosides_sym lists each drug in drug_a for every pair. The names go
+        # in as one list parameter, so the statement text is the same for every batch size.
+        params = [normed, float(min_prr), int(top_k_per_drug)]
 
-        # Query all at once via IN (...) for both A and B
-        placeholders = ", ".join(["?"] * len(normed))
-        params = normed + normed + [float(min_prr), int(top_k_per_drug)]
-
-        rows = self._con.execute(
-            f"""
-            WITH all_rows AS (
-              SELECT drug_a AS drug, side_effect, prr FROM twosides WHERE drug_a IN ({placeholders})
-              UNION ALL
-              SELECT drug_b AS drug, side_effect, prr FROM twosides WHERE drug_b IN ({placeholders})
+        # One row per drug with its top side effects already ranked and unique (GROUP BY
+        # drug_a, side_effect), so Python only zips two columns.
+        drug_col, se_lists = self._fetch_columns(
+            """
+            WITH ranked AS (
+                SELECT drug_a AS drug, side_effect, MAX(prr) AS prr
+                FROM twosides_sym
+                WHERE drug_a = ANY(?::VARCHAR[])
+                  AND (prr IS NULL OR prr >= ?)
+                GROUP BY drug_a, side_effect
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY drug_a ORDER BY COALESCE(MAX(prr),0) DESC, side_effect) <= ?
             )
-            SELECT drug, side_effect, MAX(prr) AS prr
-            FROM all_rows
-            WHERE (prr IS NULL OR prr >= ?)
-            GROUP BY drug, side_effect
-            QUALIFY ROW_NUMBER() OVER (PARTITION BY drug ORDER BY COALESCE(MAX(prr),0) DESC, side_effect) <= ?
-            ORDER BY drug;
+            SELECT drug, list(side_effect ORDER BY COALESCE(prr, 0) DESC, side_effect) AS side_effects
+            FROM ranked
+            GROUP BY drug;
             """,
             params,
-        ).fetchall()
+            con,
+        )
 
         result: Dict[str, List[str]] = {d: [] for d in normed}
-        for drug, se, _prr in rows:
-            if drug not in result:
-                result[drug] = []
-            result[drug].append(se)
-
-        # dedupe per drug, keep order
-        for d in list(result.keys()):
-            seen = set()
-            uniq: List[str] = []
-            for se in result[d]:
-                if se not in seen:
-                    uniq.append(se)
-                    seen.add(se)
-            result[d] = uniq
+        result.update(zip(drug_col, se_lists))
         return result
 
+    def get_interaction_scores_batch(self, drugs: Iterable[str]) -> Dict[Tuple[str, str], float]:
+        """
+        get_interaction_score for every pair among `drugs` in one query.
+        Returns {(drug_i, drug_j): prr} for i < j in input order (0.0 when there is no signal).
+        """
+        names = list(dict.fromkeys(d for d in drugs if d))
+        pairs = [(x, y) for i, x in enumerate(names) for y in names[i + 1:]]
+        keyed: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        for x, y in pairs:
+            a, b = _norm_name(x), _norm_name(y)
+            if a and b:
+                keyed[(x, y)] = tuple(sorted((a, b)))
+        if not keyed or not self.has_view("twosides"):
+            return {pair: 0.0 for pair in pairs}
+
+        wanted = sorted(set(keyed.values()))
+        values = ", ".join(["(?, ?)"] * len(wanted))
+        rows = self._con.execute(
+            f"""
+            WITH pairs(a, b) AS (VALUES {values})
+            SELECT p.a, p.b, MAX(t.prr) AS prr
+            FROM pairs p
+            JOIN twosides_sym t ON t.drug_a = p.a AND t.drug_b = p.b
+            GROUP BY p.a, p.b;
+            """,
+            [name for pair in wanted for name in pair],
+        ).fetchall()
+        found = {(a, b): prr for a, b, prr in rows}
+
+        # Seed the single-pair memo so follow-up get_interaction_score calls are free.
+        for pair in wanted:
+            if len(self._lookup_cache) >= _LOOKUP_CACHE_MAX:
+                break
+            self._lookup_cache[("q_twosides_pair", *pair)] = (found.get(pair),)
+
+        # prr is a DOUBLE column, so values are floats already.
+        return {pair: (found.get(keyed[pair]) if pair in keyed else None) or 0.0 for pair in pairs}
+
     def _get_dict_rank_batch(self, drugs: List[str]) -> Dict[str, str]:
         """Batch version of get_dict_rank."""
-        normed = [_norm_name(d) for d in drugs if _norm_name(d)]
+        norm_pairs = [(d, _norm_name(d)) for d in drugs]
+        normed = [n for _, n in norm_pairs if n]
         if not normed:
             return {}
         if not self.has_view("dictrank"):
             return {d: "unknown" for d in drugs}
         placeholders = ", ".join(["?"] * len(normed))
-        rows = self._con.execute(
+        names, values = self._fetch_columns(
             f"""
-            SELECT drug_name, score
+            SELECT drug_name, COALESCE(severity, 'low') AS severity
             FROM dictrank
             WHERE drug_name IN ({placeholders});
             """,
             normed,
-        ).fetchall()
+        )
 
-        result: Dict[str, str] = {}
-        for d in drugs:
-            d_norm = _norm_name(d)
-            result[d] = "unknown"
-            for row in rows:
-                if row[0] == d_norm:
-                    score = float(row[1]) if row[1] is not None else 0.0
-                    if score >= 0.7:
-                        result[d] = "severe"
-                    elif score >= 0.4:
-                        result[d] = "moderate"
-                    elif score >= 0.1:
-                        result[d] = "mild"
-                    else:
-                        result[d] = "low"
-                    break
-        return result
+        labels = _first_by_key(zip(names, values))
+        return {d: labels.get(n, "unknown") for d, n in norm_pairs}
 
     def _get_dili_risk_batch(self, drugs: List[str]) -> Dict[str, str]:
         """Batch version of get_dili_risk."""
-        normed = [_norm_name(d) for d in drugs if _norm_name(d)]
+        norm_pairs = [(d, _norm_name(d)) for d in drugs]
+        normed = [n for _, n in norm_pairs if n]
         if not normed:
             return {}
         if not self.has_view("dilirank"):
             return {d: "unknown" for d in drugs}
         placeholders = ", ".join(["?"] * len(normed))
-        rows = self._con.execute(
+        names, values = self._fetch_columns(
             f"""
-            SELECT drug_name, dili_score
+            SELECT drug_name, COALESCE(dili_risk, 'low') AS dili_risk
             FROM dilirank
             WHERE drug_name IN ({placeholders});
             """,
             normed,
-        ).fetchall()
+        )
 
-        result: Dict[str, str] = {}
-        for d in drugs:
-            d_norm = _norm_name(d)
-            result[d] = "unknown"
-            for row in rows:
-                if row[0] == d_norm:
-                    score = float(row[1]) if row[1] is not None else 0.0
-                    if score >= 0.7:
-                        result[d] = "high"
-                    elif score >= 0.4:
-                        result[d] = "medium"
-                    else:
-                        result[d] = "low"
-                    break
-        return result
+        labels = _first_by_key(zip(names, values))
+        return {d: labels.get(n, "unknown") for d, n in norm_pairs}
 
     def _get_diqt_score_batch(self, drugs: List[str]) -> Dict[str, Optional[float]]:
         """Batch version of get_diqt_score."""
-        normed = [_norm_name(d) for d in drugs if _norm_name(d)]
+        norm_pairs = [(d, _norm_name(d)) for d in drugs]
+        normed = [n for _, n in norm_pairs if n]
         if not normed:
             return {}
         if not self.has_view("diqt"):
             return {d: None for d in drugs}
         placeholders = ", ".join(["?"] * len(normed))
-        rows = self._con.execute(
+        names, values = self._fetch_columns(
             f"""
             SELECT drug_name, score
             FROM diqt
             WHERE drug_name IN ({placeholders});
             """,
             normed,
-        ).fetchall()
+        )
 
-        result: Dict[str, Optional[float]] = {d: None for d in drugs}
-        for d in drugs:
-            d_norm = _norm_name(d)
-            for row in rows:
-                if row[0] == d_norm:
-                    result[d] = float(row[1]) if row[1] is not None else None
-                    break
-        return result
+        row_map = _first_by_key(zip(names, values))
+        return {d: row_map.get(n) for d, n in norm_pairs}  # score is a DOUBLE column
 
     def get_drug_enzymes(self, drug_name: str) -> Dict[str, Any]:
         """
@@ -913,55 +1573,32 @@ class DuckDBClient:
             return {"enzymes": [], "enzyme_actions": [], "enzyme_action_map": []}
 
         # Try exact match first
-        rows = self._con.execute(
-            "SELECT enzymes, enzyme_actions, enzyme_action_map FROM drugbank WHERE name_lower = ? LIMIT 1;",
-            [d],
-        ).fetchall()
-        if rows and rows[0][0]:
-            enzymes = rows[0][0] or []
-            enzyme_actions = rows[0][1] or []
-            enzyme_action_map_str = rows[0][2] if len(rows[0]) > 2 else None
-
-            # Parse enzyme_action_map if available
-            enzyme_action_map = []
-            if enzyme_action_map_str:
-                try:
-                    import json
-                    enzyme_action_map = json.loads(enzyme_action_map_str)
-                except Exception:
-                    pass
-
-            return {
-                "enzymes": enzymes,
-                "enzyme_actions": enzyme_actions,
-                "enzyme_action_map": enzyme_action_map
-            }
-
-        # Try partial match
-        rows = self._con.execute(
-            "SELECT enzymes, enzyme_actions, enzyme_action_map FROM drugbank WHERE name_lower LIKE ? LIMIT 1;",
-            [f"%{d}%"],
-        ).fetchall()
-        if rows and rows[0][0]:
-            enzymes = rows[0][0] or []
-            enzyme_actions = rows[0][1] or []
-            enzyme_action_map_str = rows[0][2] if len(rows[0]) > 2 else None
-
-            enzyme_action_map = []
-            if enzyme_action_map_str:
-                try:
-                    import json
-                    enzyme_action_map = json.loads(enzyme_action_map_str)
-                except Exception:
-                    pass
+        row = self._cached_lookup("q_drugbank_enzymes", d)
+        if not (row and row[0]):
+            # Try partial match: resolve the name in memory, then reuse the exact lookup
+            index = self._name_index.get("drugbank") if self._drugbank_lists is not None else None
+            if index is not None and _like_literal_safe(d):
+                name = _first_containing(index, d)
+                row = self._cached_lookup("q_drugbank_enzymes", name) if name is not None else None
+            else:
+                row = self._con.execute(
+                    "SELECT enzymes, enzyme_actions, enzyme_action_map FROM drugbank WHERE name_lower LIKE ? LIMIT 1;",
+                    [f"%{d}%"],
+                ).fetchone()
+        if not (row and row[0]):
+            return {"enzymes": [], "enzyme_actions": [], "enzyme_action_map": []}
 
-            return {
-                "enzymes": enzymes,
-                "enzyme_actions": enzyme_actions,
-                "enzyme_action_map": enzyme_action_map
-            }
+        enzymes, enzyme_actions, enzyme_action_map = row
 
-        return {"enzymes": [], "enzyme_actions": [], "enzyme_action_map": []}
+        # Copies: the rows are memoized and callers may mutate what they get back
+        return {
+            "enzymes": list(enzymes or []),
+            "enzyme_actions": list(enzyme_actions or []),
+            "enzyme_action_map": [
+                {"enzyme": entry["enzyme"], "actions": list(entry["actions"] or [])}
+                for entry in enzyme_action_map or []
+            ],
+        }
 
     def get_drug_targets(self, drug_name: str | List[str]) -> List[str] | Dict[str, List[str]]:
         """Get drug targets for a single drug or batch of drugs."""
@@ -970,39 +1607,36 @@ class DuckDBClient:
         d = _norm_name(drug_name)
         if not d or not self.has_view("drugbank"):
             return []
-        rows = self._con.execute(
-            "SELECT targets FROM drugbank WHERE name_lower = ? LIMIT 1;",
-            [d],
-        ).fetchall()
-        if not rows:
-            return []
-        return [t for t in (rows[0][0] or []) if t]
+        if self._drugbank_lists is not None:
+            targets = self._drugbank_lists.get(d, (None, None))[1]
+        else:
+            row = self._cached_lookup("q_drugbank_targets", d)
+            targets = row[0] if row else None
+        return [t for t in (targets or []) if t]
 
     def _get_drug_targets_batch(self, drugs: List[str]) -> Dict[str, List[str]]:
         """Batch version of get_drug_targets."""
-        normed = [_norm_name(d) for d in drugs if _norm_name(d)]
+        norm_pairs = [(d, _norm_name(d)) for d in drugs]
+        normed = [n for _, n in norm_pairs if n]
         if not normed:
             return {}
         if not self.has_view("drugbank"):
             return {d: [] for d in drugs}
+        if self._drugbank_lists is not None:
+            lists = self._drugbank_lists
+            return {d: [t for t in (lists.get(n, (None, None))[1] or []) if t] for d, n in norm_pairs}
         placeholders = ", ".join(["?"] * len(normed))
-        rows = self._con.execute(
+        names, values = self._fetch_columns(
             f"""
             SELECT name_lower, targets
             FROM drugbank
             WHERE name_lower IN ({placeholders});
             """,
             normed,
-        ).fetchall()
+        )
 
-        result: Dict[str, List[str]] = {d: [] for d in drugs}
-        for d in drugs:
-            d_norm = _norm_name(d)
-            for row in rows:
-                if row[0] == d_norm:
-                    result[d] = [t for t in (row[1] or []) if t]
-                    break
-        return result
+        row_map = _first_by_key(zip(names, values))
+        return {d: [t for t in (row_map.get(n) or []) if t] for d, n in norm_pairs}
 
     def get_pair_evidence(self, drug_a: str, drug_b: str, top_k: int = 20) -> List[EvidenceItem]:
         a = _norm_name(drug_a)
@@ -1013,13 +1647,13 @@ class DuckDBClient:
         rows = self._con.execute(
             """
             SELECT side_effect, MAX(prr) AS prr
-            FROM twosides
-            WHERE ((drug_a = ? AND drug_b = ?) OR (drug_a = ? AND drug_b = ?))
+            FROM twosides_sym
+            WHERE drug_a = ? AND drug_b = ?
             GROUP BY side_effect
             ORDER BY COALESCE(MAX(prr), 0) DESC, side_effect
             LIMIT ?;
             """,
-            [a, b, b, a, int(top_k)],
+            [a, b, int(top_k)],
         ).fetchall()
 
         return [
@@ -1082,3 +1716,66 @@ class DuckDBClient:
             )
 
         return items
+
+
+# ---------- Shared client ----------
+
+@lru_cache(maxsize=4)
+def _cached_client(
+    client_cls: Any,
+    parquet_dir: str,
+    enable_drugbank: bool,
+    enable_duckdb: bool,
+    enable_nci_almanac: bool,
+    enable_sider_nsides_offsides: bool,
+    connection: Any = None,
+) -> Any:
+    """Client per class/config so views and preloads are not rebuilt on every call.
+
+    The class is part of the key so a swapped-in client class never gets a stale client;
+    the SIDER/OFFSIDES flag is key-only because the client reads it from settings, and so
+    is the connection, so a client is rebuilt once init_duckdb_connection re-registers views.
+    """
+    return client_cls(
+        parquet_dir,
+        enable_drugbank=enable_drugbank,
+        enable_duckdb=enable_duckdb,
+        enable_nci_almanac=enable_nci_almanac,
+    )
+
+
+def shared_client(
+    parquet_dir: str = "data/duckdb",
+    caveats: Optional[List[str]] = None,
+    *,
+    client_cls: Any = None,
+    connect: Any = None,
+) -> Any:
+    """
+    Initialize DuckDB (idempotent) and return the client reused across calls with the same config.
+
+    client_cls and connect default to DuckDBClient and init_duckdb_connection; callers that
+    resolve them through a module handle (e.g. the RAG pipeline's ``dq``) pass their own.
+    An init failure is appended to caveats when given.
+    """
+    settings = get_settings()
+    connection = None
+    try:
+        connection = (connect or init_duckdb_connection)(
+            parquet_dir,
+            enable_drugbank=settings.enable_drugbank,
+            enable_duckdb=settings.enable_duckdb,
+            enable_nci_almanac=settings.enable_nci_almanac,
+        )
+    except Exception as e:
+        if caveats is not None:
+            caveats.append(f"DuckDB init failed: {e}")
+    return _cached_client(
+        client_cls or DuckDBClient,
+        parquet_dir,
+        settings.enable_drugbank,
+        settings.enable_duckdb,
+        settings.enable_nci_almanac,
+        settings.enable_sider_nsides_offsides,
+        connection,
+    )
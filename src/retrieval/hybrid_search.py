@@ -9,8 +9,15 @@ with semantic search for improved recall and precision.
 
 from __future__ import annotations
 
+import atexit
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Callable
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Callable
+
+import numpy as np
 
 from src.utils.relevance_scoring import merge_and_rerank_evidence
 
@@ -20,6 +27,167 @@ LOG = logging.getLogger(__name__)
 DEFAULT_KEYWORD_WEIGHT = 0.6
 DEFAULT_SEMANTIC_WEIGHT = 0.4
 
+# Semantic searches run here while the keyword search runs on the calling thread;
+# shut down with the interpreter.
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-search")
+atexit.register(_POOL.shutdown, wait=False)
+
+# Query result cache sizing; see _QueryCache
+QUERY_CACHE_MAX = 1024
+QUERY_CACHE_TTL_SECONDS = 3600.0
+QUERY_CACHE_SIMILARITY = 0.95
+
+
+def _normalize_query(query: str) -> str:
+    """Trimmed, whitespace-collapsed, case-folded query; what the search functions receive."""
+    return " ".join(query.split()).casefold()
+
+
+class _QueryCache:
+    """
+    LRU + TTL cache of hybrid search results.
+
+    Entries are keyed by (scope, query), where query is already normalized by
+    the caller (_normalize_query) and the scope holds the backends (see
+    _backend_scope) and every search parameter, so only identical searches
+    share results. With an embed_fn, a miss on the exact key falls back to the
+    most similar cached query in the same scope if its cosine similarity is at
+    least similarity_threshold.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = QUERY_CACHE_MAX,
+        ttl_seconds: float = QUERY_CACHE_TTL_SECONDS,
+        embed_fn: Optional[Callable[[str], Any]] = None,
+        similarity_threshold: float = QUERY_CACHE_SIMILARITY,
+    ):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[Tuple[Any, str], Tuple[Any, Optional[np.ndarray], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        if self.embed_fn is None:
+            return None
+        try:
+            vec = np.asarray(self.embed_fn(text), dtype=np.float32).ravel()
+        except Exception as e:
+            LOG.debug(f"Query cache embedding failed: {e}")
+            return None
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else None
+
+    def lookup(self, scope: Any, query: str) -> Tuple[Any, Optional[np.ndarray]]:
+        """(cached value or None, query vector to pass back to store on a miss)."""
+        key = (scope, query)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[2] <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    return entry[0], entry[1]
+                del self._entries[key]
+
+        vec = self._embed(key[1])
+        if vec is None:
+            return None, None
+        with self._lock:
+            best_key, best_sim = None, self.similarity_threshold
+            for other_key, (_, other_vec, stored) in self._entries.items():
+                if other_key[0] != scope or other_vec is None or now - stored > self.ttl_seconds:
+                    continue
+                if other_vec.shape != vec.shape:
+                    continue
+                sim = float(np.dot(vec, other_vec))
+                if sim >= best_sim:
+                    best_key, best_sim = other_key, sim
+            if best_key is not None:
+                self._entries.move_to_end(best_key)
+                return self._entries[best_key][0], vec
+        return None, vec
+
+    def store(self, scope: Any, query: str, value: Any, vec: Optional[np.ndarray] = None) -> None:
+        key = (scope, query)
+        if vec is None:
+            vec = self._embed(key[1])
+        with self._lock:
+            self._entries[key] = (value, vec, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_QUERY_CACHE = _QueryCache()
+
+
+def configure_query_cache(
+    embed_fn: Optional[Callable[[str], Any]] = None,
+    similarity_threshold: float = QUERY_CACHE_SIMILARITY,
+) -> None:
+    """
+    Enable (or, with embed_fn=None, disable) approximate matching in the hybrid search cache.
+
+    Args:
+        embed_fn: Function mapping a normalized query to an embedding vector
+        similarity_threshold: Minimum cosine similarity for a cached query to be reused
+    """
+    _QUERY_CACHE.embed_fn = embed_fn
+    _QUERY_CACHE.similarity_threshold = similarity_threshold
+    _QUERY_CACHE.clear()
+
+
+def _backend_scope(
+    cache_namespace: Optional[Hashable],
+    keyword_search_fn: Callable[..., Any],
+    semantic_search_fn: Optional[Callable[..., Any]],
+) -> Hashable:
+    """Cache identity of the search backends: the caller's namespace, else the functions.
+
+    Callers that build their search functions per call (closures, lambdas) must pass a
+    namespace; keyed on the functions, their entries never hit again and keep the
+    closures (and whatever they capture) alive until evicted.
+    """
+    if cache_namespace is not None:
+        return cache_namespace
+    return (keyword_search_fn, semantic_search_fn)
+
+
+def _search_both(
+    query: str,
+    keyword_search_fn: Callable[[str, int], List[Any]],
+    semantic_search_fn: Optional[Callable[[str, int, float], List[Tuple[str, float]]]],
+    k: int,
+    threshold: float,
+) -> Tuple[List[Any], List[Tuple[str, float]], bool]:
+    """Keyword and semantic results for `query`, with the two searches overlapping.
+
+    The flag is False when the semantic search raised, so the results are not worth caching.
+    """
+    semantic_future = None
+    if semantic_search_fn is not None:
+        semantic_future = _POOL.submit(semantic_search_fn, query, k, threshold)
+
+    keyword_results = keyword_search_fn(query, k)
+
+    semantic_results: List[Tuple[str, float]] = []
+    semantic_ok = True
+    if semantic_future is not None:
+        try:
+            semantic_results = semantic_future.result()
+        except Exception as e:
+            LOG.warning(f"Semantic search failed: {e}")
+            semantic_results = []
+            semantic_ok = False
+    return keyword_results, semantic_results, semantic_ok
+
 
 def hybrid_search_drugs(
     query: str,
@@ -28,49 +196,61 @@ def hybrid_search_drugs(
     top_k: int = 10,
     keyword_weight: float = DEFAULT_KEYWORD_WEIGHT,
     semantic_weight: float = DEFAULT_SEMANTIC_WEIGHT,
-    min_semantic_threshold: float = 0.6
+    min_semantic_threshold: float = 0.6,
+    cache_namespace: Optional[Hashable] = None,
 ) -> List[Tuple[str, float]]:
     """
     Perform hybrid search combining keyword and semantic results.
     
     Args:
-        query: Drug name or query string
+        query: Drug name or query string; the search functions receive it trimmed and case-folded
         keyword_search_fn: Function that takes (query, top_k) and returns [(item, score), ...]
         semantic_search_fn: Optional function that takes (query, top_k, threshold) and returns [(item, score), ...]
         top_k: Number of results to return
         keyword_weight: Weight for keyword search scores (0-1)
         semantic_weight: Weight for semantic search scores (0-1)
         min_semantic_threshold: Minimum similarity threshold for semantic search
+        cache_namespace: Stable, hashable id of the search backends for the result cache;
+            required for results to be reused when the search functions are rebuilt per call
         
     Returns:
         List of (item, combined_score) tuples, sorted by score (descending)
     """
-    # Perform keyword search
-    keyword_results = keyword_search_fn(query, top_k * 2)  # Get more for merging
-    
-    # Perform semantic search if available
-    semantic_results = []
-    if semantic_search_fn is not None:
-        try:
-            semantic_results = semantic_search_fn(query, top_k * 2, min_semantic_threshold)
-        except Exception as e:
-            LOG.warning(f"Semantic search failed: {e}")
-            semantic_results = []
-    
-    # Merge and rerank
+    query = _normalize_query(query)
+    scope = ("drugs", _backend_scope(cache_namespace, keyword_search_fn, semantic_search_fn), top_k,
+             keyword_weight, semantic_weight, min_semantic_threshold)
+    cached, query_vec = _QUERY_CACHE.lookup(scope, query)
+    if cached is not None:
+        return list(cached)
+
+    # Keyword and (if available) semantic search, concurrently; get more for merging
+    keyword_results, semantic_results, semantic_ok = _search_both(
+        query, keyword_search_fn, semantic_search_fn, top_k * 2, min_semantic_threshold
+    )
+    merged = _merge_top_k(keyword_results, semantic_results, top_k, keyword_weight, semantic_weight)
+    if semantic_ok:
+        _QUERY_CACHE.store(scope, query, list(merged), query_vec)
+    return merged
+
+
+def _merge_top_k(
+    keyword_results: List[Tuple[str, float]],
+    semantic_results: List[Tuple[str, float]],
+    top_k: int,
+    keyword_weight: float,
+    semantic_weight: float,
+) -> List[Tuple[str, float]]:
+    """Top-k of the weighted merge, or of the keyword results alone when there are no semantic ones."""
     if semantic_results:
-        merged = merge_and_rerank_evidence(
+        return merge_and_rerank_evidence(
             keyword_results,
             semantic_results,
             keyword_weight=keyword_weight,
-            semantic_weight=semantic_weight
+            semantic_weight=semantic_weight,
+            top_k=top_k
         )
-    else:
-        # No semantic results, just use keyword results
-        merged = keyword_results
-    
-    # Return top-k
-    return merged[:top_k]
+    # No semantic results, just use keyword results
+    return keyword_results[:top_k]
 
 
 def hybrid_search_side_effects(
@@ -80,48 +260,43 @@ def hybrid_search_side_effects(
     top_k: int = 10,
     keyword_weight: float = DEFAULT_KEYWORD_WEIGHT,
     semantic_weight: float = DEFAULT_SEMANTIC_WEIGHT,
-    min_semantic_threshold: float = 0.6
+    min_semantic_threshold: float = 0.6,
+    cache_namespace: Optional[Hashable] = None,
 ) -> List[Tuple[str, float]]:
     """
     Perform hybrid search for side effects.
     
     Args:
-        query: Side effect name or query
+        query: Side effect name or query; the search functions receive it trimmed and case-folded
         keyword_search_fn: Function that returns list of side effect names
         semantic_search_fn: Optional semantic search function
         top_k: Number of results
         keyword_weight: Weight for keyword search
         semantic_weight: Weight for semantic search
         min_semantic_threshold: Minimum similarity threshold
+        cache_namespace: Stable id of the search backends (see hybrid_search_drugs)
         
     Returns:
         List of (side_effect, combined_score) tuples
     """
-    # Keyword search - convert to (item, score) format
-    keyword_items = keyword_search_fn(query, top_k * 2)
+    query = _normalize_query(query)
+    scope = ("side_effects", _backend_scope(cache_namespace, keyword_search_fn, semantic_search_fn), top_k,
+             keyword_weight, semantic_weight, min_semantic_threshold)
+    cached, query_vec = _QUERY_CACHE.lookup(scope, query)
+    if cached is not None:
+        return list(cached)
+
+    # Keyword and semantic search, concurrently
+    keyword_items, semantic_results, semantic_ok = _search_both(
+        query, keyword_search_fn, semantic_search_fn, top_k * 2, min_semantic_threshold
+    )
+    # Keyword results - convert to (item, score) format
     keyword_results = [(item, 1.0) for item in keyword_items]  # Default score of 1.0
     
-    # Semantic search
-    semantic_results = []
-    if semantic_search_fn is not None:
-        try:
-            semantic_results = semantic_search_fn(query, top_k * 2, min_semantic_threshold)
-        except Exception as e:
-            LOG.warning(f"Semantic search failed: {e}")
-            semantic_results = []
-    
-    # Merge and rerank
-    if semantic_results:
-        merged = merge_and_rerank_evidence(
-            keyword_results,
-            semantic_results,
-            keyword_weight=keyword_weight,
-            semantic_weight=semantic_weight
-        )
-    else:
-        merged = keyword_results
-    
-    return merged[:top_k]
+    merged = _merge_top_k(keyword_results, semantic_results, top_k, keyword_weight, semantic_weight)
+    if semantic_ok:
+        _QUERY_CACHE.store(scope, query, list(merged), query_vec)
+    return merged
 
 
 def adaptive_hybrid_search(
@@ -132,13 +307,14 @@ def adaptive_hybrid_search(
     min_relevance_threshold: float = 0.5,
     max_k: int = 50,
     keyword_weight: float = DEFAULT_KEYWORD_WEIGHT,
-    semantic_weight: float = DEFAULT_SEMANTIC_WEIGHT
+    semantic_weight: float = DEFAULT_SEMANTIC_WEIGHT,
+    cache_namespace: Optional[Hashable] = None,
 ) -> Tuple[List[Tuple[str, float]], Dict[str, Any]]:
     """
     Perform adaptive hybrid search that adjusts retrieval size based on result quality.
     
     Args:
-        query: Query string
+        query: Query string; the search functions receive it trimmed and case-folded
         keyword_search_fn: Keyword search function
         semantic_search_fn: Optional semantic search function
         initial_k: Initial number of results to retrieve
@@ -146,6 +322,7 @@ def adaptive_hybrid_search(
         max_k: Maximum number of results to retrieve
         keyword_weight: Weight for keyword search
         semantic_weight: Weight for semantic search
+        cache_namespace: Stable id of the search backends (see hybrid_search_drugs)
         
     Returns:
         Tuple of (results, metadata) where metadata contains search statistics
@@ -158,65 +335,43 @@ def adaptive_hybrid_search(
         "semantic_results_count": 0,
     }
     
-    # Initial search
-    results = hybrid_search_drugs(
-        query,
-        keyword_search_fn,
-        semantic_search_fn,
-        top_k=initial_k,
-        keyword_weight=keyword_weight,
-        semantic_weight=semantic_weight
-    )
+    # Fetch once, sized for the largest top_k an expansion can ask for; expanding then
+    # reranks more of the same candidates instead of querying the backends again.
+    query = _normalize_query(query)
+    pool_k = max(initial_k, min(initial_k * 2, max_k))
+    scope = ("adaptive_pool", _backend_scope(cache_namespace, keyword_search_fn, semantic_search_fn), pool_k)
+    cached, query_vec = _QUERY_CACHE.lookup(scope, query)
+    if cached is not None:
+        keyword_results, semantic_results = cached
+    else:
+        # 0.6 is hybrid_search_drugs' default semantic threshold
+        keyword_results, semantic_results, semantic_ok = _search_both(
+            query, keyword_search_fn, semantic_search_fn, pool_k * 2, 0.6
+        )
+        if semantic_ok:
+            _QUERY_CACHE.store(scope, query, (keyword_results, semantic_results), query_vec)
+    metadata["keyword_results_count"] = len(keyword_results)
+    metadata["semantic_results_count"] = len(semantic_results)
     
-    metadata["keyword_results_count"] = len(keyword_search_fn(query, initial_k * 2))
-    if semantic_search_fn:
-        try:
-            semantic_res = semantic_search_fn(query, initial_k * 2, 0.5)
-            metadata["semantic_results_count"] = len(semantic_res)
-        except Exception:
-            pass
+    results = _merge_top_k(keyword_results, semantic_results, initial_k, keyword_weight, semantic_weight)
     
-    # Check result quality
+    # Check result quality; with no results at all, a larger slice of the same pool is empty too
     if results:
         # Calculate average relevance
         avg_score = sum(score for _, score in results) / len(results)
-        max_score = max(score for _, score in results) if results else 0.0
         
         # If average relevance is low and we haven't hit max_k, expand search
         if avg_score < min_relevance_threshold and initial_k < max_k:
             expanded_k = min(initial_k * 2, max_k)
-            expanded_results = hybrid_search_drugs(
-                query,
-                keyword_search_fn,
-                semantic_search_fn,
-                top_k=expanded_k,
-                keyword_weight=keyword_weight,
-                semantic_weight=semantic_weight
-            )
-            
-            if expanded_results:
-                results = expanded_results
-                metadata["final_k"] = expanded_k
-                metadata["expanded"] = True
-                metadata["avg_score_before"] = avg_score
-                metadata["avg_score_after"] = sum(score for _, score in expanded_results) / len(expanded_results)
-    else:
-        # No results, try expanding
-        if initial_k < max_k:
-            expanded_k = min(initial_k * 2, max_k)
-            expanded_results = hybrid_search_drugs(
-                query,
-                keyword_search_fn,
-                semantic_search_fn,
-                top_k=expanded_k,
-                keyword_weight=keyword_weight,
-                semantic_weight=semantic_weight
+            expanded_results = _merge_top_k(
+                keyword_results, semantic_results, expanded_k, keyword_weight, semantic_weight
             )
             
-            if expanded_results:
-                results = expanded_results
-                metadata["final_k"] = expanded_k
-                metadata["expanded"] = True
+            results = expanded_results
+            metadata["final_k"] = expanded_k
+            metadata["expanded"] = True
+            metadata["avg_score_before"] = avg_score
+            metadata["avg_score_after"] = sum(score for _, score in expanded_results) / len(expanded_results)
     
     return results, metadata
 
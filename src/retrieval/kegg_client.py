@@ -9,13 +9,23 @@ KEGG provides:
 
 API Documentation: https://www.kegg.jp/kegg/rest/keggapi.html
 """
+import atexit
+import hashlib
 import os
+import re
 import requests
 import logging
-from typing import Dict, List, Optional, Any
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import threading
 import time
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.config.settings import get_settings
+from src.utils.caching import ResultCache, load_text, save_text
+
 LOG = logging.getLogger(__name__)
 
 # KEGG REST API base URL
@@ -27,13 +37,188 @@ KEGG_TIMEOUT = int(os.getenv("KEGG_TIMEOUT", "15"))
 # Rate limiting: KEGG recommends reasonable use (no strict limit, but be polite)
 KEGG_RATE_LIMIT = 0.2  # 200ms between requests
 
+# /get/ accepts up to 10 "+"-separated IDs per request
+KEGG_GET_BATCH = 10
+
+# KEGG entries change slowly; raw GET responses (file or SQLite backend, per CACHE_BACKEND)
+# are reused across processes for 30 days, skipping the rate limit and the round trip.
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+
+# Lookups for several KEGG drug IDs / pathway names overlap here; _rate_limit still spaces
+# out request starts. Shut down with the interpreter.
+_POOL = ThreadPoolExecutor(max_workers=3, thread_name_prefix="kegg")
+atexit.register(_POOL.shutdown, wait=False)
+
+
+
+def _build_session() -> requests.Session:
+    """One pooled keep-alive session for all KEGG calls, retrying 429/5xx with backoff."""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry))
+    session.headers.update({"User-Agent": "InferMed/1.0"})
+    return session
+
+
+_SESSION = _build_session()
+
+_RATE_LOCK = threading.Lock()
+_next_allowed = 0.0
+
+# Pathway names that mark a metabolism-related pathway
+_METABOLISM_RE = re.compile(r"metabol(?:ism|ic)|drug|xenobiotic|cyp", re.IGNORECASE)
+
+# Per-drug results and entry names, for the life of the process (failures are retried).
+_RESULTS = ResultCache()
+
 
 def _rate_limit():
-    """Simple rate limiting to avoid overwhelming KEGG API."""
-    time.sleep(KEGG_RATE_LIMIT)
+    """Keep request starts at least KEGG_RATE_LIMIT apart, sleeping only when the last one was recent."""
+    global _next_allowed
+    with _RATE_LOCK:
+        now = time.monotonic()
+        wait = max(0.0, _next_allowed - now)
+        _next_allowed = max(now, _next_allowed) + KEGG_RATE_LIMIT
+    if wait:
+        time.sleep(wait)
+
+
+def _cache_dir() -> str:
+    try:
+        return get_settings().kegg_cache_dir
+    except Exception:
+        return "data/cache/kegg"
+
+
+def _kegg_get(path: str) -> Optional[str]:
+    """Body of a KEGG REST GET (e.g. "get/path:map00980"), or None on a non-200 status."""
+    digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:20]
+    key = f"kegg_v1__{path.split('/', 1)[0]}__{digest}"
+    try:
+        cached = load_text(_cache_dir(), key, ttl=DEFAULT_TTL_SECONDS, ext="txt")
+    except Exception as e:
+        LOG.debug("KEGG cache read failed for %s: %s", path, e)
+        cached = None
+    if cached is not None:
+        return cached
+
+    _rate_limit()
+    r = _SESSION.get(f"{KEGG_API_BASE}/{path}", timeout=KEGG_TIMEOUT)
+    if r.status_code != 200:
+        return None
+    try:
+        save_text(_cache_dir(), key, r.text, ext="txt")
+    except Exception as e:
+        LOG.debug("KEGG cache write failed for %s: %s", path, e)
+    return r.text
+
+
+def _tab_rows(text: str) -> Iterator[Tuple[str, str]]:
+    """(first column, rest) of each tab-separated line of a KEGG response, in one pass."""
+    for line in text.splitlines():
+        first, tab, rest = line.partition("\t")
+        if tab:
+            yield first.strip(), rest.strip()
+
+
+def _find_drug_ids(drug_name: str) -> List[str]:
+    """KEGG drug IDs matching drug_name, best matches first."""
+    text = _kegg_get(f"find/drug/{drug_name}")
+    if text is None:
+        return []
+    return [drug_id for drug_id, _ in _tab_rows(text)]
+
+
+def _link_ids(target: str, drug_id: str) -> List[str]:
+    """IDs in the `target` database (pathway, enzyme) linked to a KEGG drug; raises on request failure."""
+    text = _kegg_get(f"link/{target}/{drug_id}")
+    if text is None:
+        return []
+    # Lines are "<drug_id>\t<linked_id>"
+    return [linked_id for _, linked_id in _tab_rows(text)]
+
+
+def _entry_names(text: str) -> Dict[str, str]:
+    """First NAME line per entry of a /get/ response, keyed by the ENTRY id (e.g. "map00980", "1.14.14.1")."""
+    names: Dict[str, str] = {}
+    # Entries end with a "///" line; ENTRY is each entry's first line and NAME follows it,
+    # so jump straight to both instead of walking the (sometimes long) rest of the entry.
+    for block in text.split("\n///"):
+        block = block.lstrip("\n")
+        if not block.startswith("ENTRY"):
+            continue
+        fields = block.split("\n", 1)[0].split()
+        # Enzyme entries read "ENTRY       EC 1.14.14.1   Enzyme"
+        entry = fields[2] if len(fields) > 2 and fields[1] == "EC" else (fields[1] if len(fields) > 1 else None)
+        start = block.find("\nNAME")
+        if entry is None or start < 0:
+            continue
+        end = block.find("\n", start + 1)
+        # NAME is a fixed-width keyword column
+        name = block[start + 5:end if end >= 0 else len(block)].strip()
+        if name:
+            names[entry] = name
+    return names
+
+
+def _fetch_names(query_ids: List[str]) -> Dict[str, str]:
+    """Names for up to KEGG_GET_BATCH prefixed IDs in one /get/ request; IDs KEGG lacks are left out."""
+    text = _kegg_get("get/" + "+".join(query_ids))
+    if text is None:
+        return {}
+    by_entry = _entry_names(text)
+    return {i: by_entry[i.split(":", 1)[-1]] for i in query_ids if i.split(":", 1)[-1] in by_entry}
+
+
+def _batch_get_names(ids: List[str], kind: str) -> Dict[str, str]:
+    """
+    Names for KEGG pathway or enzyme IDs, fetched KEGG_GET_BATCH per request.
+
+    Args:
+        ids: Pathway IDs ("path:map00980") or EC numbers ("1.14.14.1" or "ec:1.14.14.1")
+        kind: "pathway" or "enzyme"
+
+    Returns:
+        {id: name} for every non-empty id; IDs KEGG does not know map to themselves.
+        A failed request raises.
+    """
+    wanted = list(dict.fromkeys(i.strip() for i in ids if i and i.strip()))
+    names: Dict[str, str] = {}
+    missing: Dict[str, List[str]] = {}  # query id -> requested ids
+    for i in wanted:
+        query_id = f"ec:{i}" if kind == "enzyme" and not i.startswith("ec:") else i
+        hit = _RESULTS.peek(("name", query_id))
+        if hit is not None:
+            names[i] = hit
+        else:
+            missing.setdefault(query_id, []).append(i)
+
+    query_ids = list(missing)
+    chunks = [query_ids[n:n + KEGG_GET_BATCH] for n in range(0, len(query_ids), KEGG_GET_BATCH)]
+    results = map(_fetch_names, chunks) if len(chunks) == 1 else _POOL.map(_fetch_names, chunks)
+    for fetched in results:
+        for query_id, name in fetched.items():
+            name = _RESULTS.setdefault(("name", query_id), name)
+            names.update(dict.fromkeys(missing[query_id], name))
+    return {i: names.get(i, i) for i in wanted}
+
+
+def _linked_with_names(drug_name: str, target: str) -> List[Tuple[str, str, str]]:
+    """(drug_id, linked_id, name) for the first 3 drug matches; link lookups run concurrently, names in batches.
+
+    Raises if any request fails, so a partial answer is never cached.
+    """
+    drug_ids = _find_drug_ids(drug_name)[:3]  # Limit to first 3 matches
+    linked = list(_POOL.map(lambda drug_id: _link_ids(target, drug_id), drug_ids))
+    names = _batch_get_names([i for ids in linked for i in ids], target)
+    return [(drug_id, i, names[i]) for drug_id, ids in zip(drug_ids, linked) for i in ids]
 
 
-@lru_cache(maxsize=1024)
 def get_drug_pathways(drug_name: str) -> List[Dict[str, Any]]:
     """
     Get KEGG pathways associated with a drug.
@@ -50,49 +235,23 @@ def get_drug_pathways(drug_name: str) -> List[Dict[str, Any]]:
     if not drug_name or not drug_name.strip():
         return []
     
-    pathways = []
-    
+    # KEGG's find is case-insensitive, so " Warfarin" and "warfarin" share an entry.
+    drug_name = drug_name.strip().lower()
     try:
-        _rate_limit()
-        # Step 1: Find drug ID by name
-        url = f"{KEGG_API_BASE}/find/drug/{drug_name}"
-        r = requests.get(url, timeout=KEGG_TIMEOUT)
-        
-        if r.status_code == 200:
-            lines = r.text.strip().split("\n")
-            drug_ids = []
-            for line in lines:
-                if "\t" in line:
-                    drug_id, name = line.split("\t", 1)
-                    drug_ids.append(drug_id.strip())
-            
-            # Step 2: For each drug ID, get pathways
-            for drug_id in drug_ids[:3]:  # Limit to first 3 matches
-                try:
-                    _rate_limit()
-                    url2 = f"{KEGG_API_BASE}/link/pathway/{drug_id}"
-                    r2 = requests.get(url2, timeout=KEGG_TIMEOUT)
-                    
-                    if r2.status_code == 200:
-                        lines2 = r2.text.strip().split("\n")
-                        for line2 in lines2:
-                            if "\t" in line2:
-                                pathway_id, _ = line2.split("\t", 1)
-                                pathway_name = get_pathway_name(pathway_id)
-                                pathways.append({
-                                    "drug_id": drug_id,
-                                    "pathway_id": pathway_id.strip(),
-                                    "pathway_name": pathway_name,
-                                })
-                except Exception as e:
-                    LOG.debug("KEGG pathway query failed for %s: %s", drug_id, e)
+        return _RESULTS.get(("get_drug_pathways", drug_name), lambda: _drug_pathways(drug_name))
     except Exception as e:
         LOG.debug("KEGG drug search failed for %s: %s", drug_name, e)
-    
-    return pathways
+        return []
+
+
+def _drug_pathways(drug_name: str) -> List[Dict[str, Any]]:
+    # Find drug IDs by name, then their pathways and pathway names
+    return [
+        {"drug_id": drug_id, "pathway_id": pathway_id, "pathway_name": pathway_name}
+        for drug_id, pathway_id, pathway_name in _linked_with_names(drug_name, "pathway")
+    ]
 
 
-@lru_cache(maxsize=512)
 def get_pathway_name(pathway_id: str) -> str:
     """
     Get human-readable pathway name from KEGG pathway ID.
@@ -101,30 +260,18 @@ def get_pathway_name(pathway_id: str) -> str:
         pathway_id: KEGG pathway ID (e.g., "hsa00980")
     
     Returns:
-        Pathway name
+        Pathway name (the ID itself if it cannot be resolved)
     """
     if not pathway_id or not pathway_id.strip():
         return ""
     
     try:
-        _rate_limit()
-        url = f"{KEGG_API_BASE}/get/{pathway_id}"
-        r = requests.get(url, timeout=KEGG_TIMEOUT)
-        
-        if r.status_code == 200:
-            lines = r.text.split("\n")
-            for line in lines:
-                if line.startswith("NAME"):
-                    # Extract name after "NAME"
-                    name = line.replace("NAME", "").strip()
-                    return name
+        return _batch_get_names([pathway_id], "pathway")[pathway_id.strip()]
     except Exception as e:
         LOG.debug("KEGG pathway name query failed for %s: %s", pathway_id, e)
-    
-    return pathway_id
+        return pathway_id.strip()
 
 
-@lru_cache(maxsize=512)
 def get_drug_enzymes(drug_name: str) -> List[Dict[str, Any]]:
     """
     Get enzymes (CYPs, etc.) associated with a drug in KEGG.
@@ -141,80 +288,41 @@ def get_drug_enzymes(drug_name: str) -> List[Dict[str, Any]]:
     if not drug_name or not drug_name.strip():
         return []
     
-    enzymes = []
-    
+    drug_name = drug_name.strip().lower()
     try:
-        _rate_limit()
-        # Find drug ID
-        url = f"{KEGG_API_BASE}/find/drug/{drug_name}"
-        r = requests.get(url, timeout=KEGG_TIMEOUT)
-        
-        if r.status_code == 200:
-            lines = r.text.strip().split("\n")
-            drug_ids = []
-            for line in lines:
-                if "\t" in line:
-                    drug_id, _ = line.split("\t", 1)
-                    drug_ids.append(drug_id.strip())
-            
-            # Get enzymes for each drug
-            for drug_id in drug_ids[:3]:
-                try:
-                    _rate_limit()
-                    url2 = f"{KEGG_API_BASE}/link/enzyme/{drug_id}"
-                    r2 = requests.get(url2, timeout=KEGG_TIMEOUT)
-                    
-                    if r2.status_code == 200:
-                        lines2 = r2.text.strip().split("\n")
-                        for line2 in lines2:
-                            if "\t" in line2:
-                                enzyme_id, _ = line2.split("\t", 1)
-                                enzyme_name = get_enzyme_name(enzyme_id.strip())
-                                enzymes.append({
-                                    "drug_id": drug_id,
-                                    "enzyme_id": enzyme_id.strip(),
-                                    "enzyme_name": enzyme_name,
-                                })
-                except Exception as e:
-                    LOG.debug("KEGG enzyme query failed for %s: %s", drug_id, e)
+        return _RESULTS.get(("get_drug_enzymes", drug_name), lambda: _drug_enzymes(drug_name))
     except Exception as e:
         LOG.debug("KEGG drug enzyme search failed for %s: %s", drug_name, e)
-    
-    return enzymes
+        return []
+
+
+def _drug_enzymes(drug_name: str) -> List[Dict[str, Any]]:
+    return [
+        {"drug_id": drug_id, "enzyme_id": enzyme_id, "enzyme_name": enzyme_name}
+        for drug_id, enzyme_id, enzyme_name in _linked_with_names(drug_name, "enzyme")
+    ]
 
 
-@lru_cache(maxsize=512)
 def get_enzyme_name(enzyme_id: str) -> str:
     """
     Get enzyme name from EC number.
     
     Args:
-        enzyme_id: EC number (e.g., "1.14.14.1")
+        enzyme_id: EC number, with or without the "ec:" prefix (e.g., "1.14.14.1")
     
     Returns:
-        Enzyme name
+        Enzyme name (the ID itself if it cannot be resolved)
     """
     if not enzyme_id or not enzyme_id.strip():
         return ""
     
     try:
-        _rate_limit()
-        url = f"{KEGG_API_BASE}/get/ec:{enzyme_id}"
-        r = requests.get(url, timeout=KEGG_TIMEOUT)
-        
-        if r.status_code == 200:
-            lines = r.text.split("\n")
-            for line in lines:
-                if line.startswith("NAME"):
-                    name = line.replace("NAME", "").strip()
-                    return name
+        return _batch_get_names([enzyme_id], "enzyme")[enzyme_id.strip()]
     except Exception as e:
         LOG.debug("KEGG enzyme name query failed for %s: %s", enzyme_id, e)
-    
-    return enzyme_id
+        return enzyme_id.strip()
 
 
-@lru_cache(maxsize=256)
 def get_metabolism_pathway(drug_name: str) -> Optional[Dict[str, Any]]:
     """
     Get drug metabolism pathway information.
@@ -227,15 +335,12 @@ def get_metabolism_pathway(drug_name: str) -> Optional[Dict[str, Any]]:
         - pathways: List of metabolism pathways
         - enzymes: List of metabolizing enzymes
     """
+    # Not cached itself: both lookups are, and a failed one must not be frozen in here.
     pathways = get_drug_pathways(drug_name)
     enzymes = get_drug_enzymes(drug_name)
     
     # Filter for metabolism-related pathways
-    metabolism_pathways = [
-        p for p in pathways
-        if any(term in (p.get("pathway_name", "") or "").lower()
-               for term in ["metabolism", "drug", "xenobiotic", "cyp", "metabolic"])
-    ]
+    metabolism_pathways = [p for p in pathways if _METABOLISM_RE.search(p.get("pathway_name") or "")]
     
     return {
         "pathways": metabolism_pathways,
@@ -254,20 +359,22 @@ def get_common_pathways(drug_a: str, drug_b: str) -> List[Dict[str, Any]]:
     Returns:
         List of common pathway dictionaries
     """
-    pathways_a = get_drug_pathways(drug_a)
-    pathways_b = get_drug_pathways(drug_b)
+    # Drug B's lookup runs on its own thread (not _POOL, which get_drug_pathways itself fans out on)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="kegg-pair") as ex:
+        future_b = ex.submit(get_drug_pathways, drug_b)
+        pathways_a = get_drug_pathways(drug_a)
+        pathways_b = future_b.result()
     
     # Find common pathways
     pathway_ids_a = {p["pathway_id"] for p in pathways_a}
     pathway_ids_b = {p["pathway_id"] for p in pathways_b}
     common_ids = pathway_ids_a & pathway_ids_b
     
-    # Return common pathways with names
-    common_pathways = []
+    # Return common pathways with names, each distinct entry once, in order
+    common_pathways = {}
     for p in pathways_a + pathways_b:
         if p["pathway_id"] in common_ids:
-            if p not in common_pathways:
-                common_pathways.append(p)
+            common_pathways.setdefault(tuple(sorted(p.items())), p)
     
-    return common_pathways
+    return list(common_pathways.values())
 
@@ -3,9 +3,10 @@
 
 import os
 import json
-import time
 import shutil
 import logging
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Tuple
@@ -13,6 +14,8 @@ from collections import Counter
 
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import plotly.express as px
 
 # Our atomic cache helpers (support ttl=seconds)
@@ -122,45 +125,40 @@ class OpenFDAClient:
         self.ttl_seconds = int(ttl_seconds)
         self.api_key = os.getenv("OPENFDA_API_KEY")  # optional, but recommended
 
-        # one session for connection pooling
+        # one keep-alive session for connection pooling; the adapter retries 429/5xx and
+        # network errors with exponential backoff
         self._session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.75,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry))
 
     # ------------------------ internal HTTP ------------------------
 
     def _request(self, params: Dict[str, str], timeout: int = DEFAULT_TIMEOUT) -> Optional[Dict]:
         """
-        Do a GET with polite retries for 429/5xx. Returns JSON dict or None.
+        Do a GET (the session retries 429/5xx). Returns JSON dict or None.
         """
         # Attach API key if present
         if self.api_key:
             params = dict(params)  # shallow copy
             params["api_key"] = self.api_key
 
-        # basic retry/backoff
-        for attempt in range(4):
-            try:
-                resp = self._session.get(self.BASE_URL, params=params, timeout=timeout)
-            except requests.RequestException:
-                # transient network error; small backoff and retry
-                time.sleep(0.5 * (2 ** attempt))
-                continue
-
-            code = resp.status_code
-            if code == 200:
-                try:
-                    return resp.json()
-                except ValueError:
-                    return None
-
-            if code in (429, 500, 502, 503, 504):
-                # exponential backoff
-                time.sleep(0.75 * (2 ** attempt))
-                continue
-
-            # Other non-retryable codes
+        try:
+            resp = self._session.get(self.BASE_URL, params=params, timeout=timeout)
+        except requests.RequestException:
             return None
 
-        return None
+        if resp.status_code != 200:
+            return None
+        try:
+            return resp.json()
+        except ValueError:
+            return None
 
     # ------------------------ caching wrapper ------------------------
 
@@ -253,8 +251,13 @@ class OpenFDAClient:
         Top reactions for a single drug (PRR-like frequency proxy).
         """
         q = FaersQuery(drug=drug, count_field="patient.reaction.reactionmeddrapt.exact", suffix="reactions")
-        data = Counter(self._fetch_and_cache_counts(q))
-        return data.most_common(int(top_k))
+        data = self._fetch_and_cache_counts(q)
+        # openFDA returns terms by descending count, so a fresh mapping is already ranked;
+        # the SQLite cache stores keys sorted by name, so check before slicing.
+        counts = list(data.values())
+        if all(a >= b for a, b in zip(counts, counts[1:])):
+            return list(data.items())[:int(top_k)]
+        return Counter(data).most_common(int(top_k))
 
     def get_time_series(self, drug: str, interval: str = "receivedate") -> List[Tuple[str, int]]:
         """
@@ -266,24 +269,24 @@ class OpenFDAClient:
 
     def get_age_distribution(self, drug: str, bins: Optional[List[int]] = None) -> Dict[str, int]:
         """
-        Age distribution. If bins provided, bucketize raw ages.
+        Age distribution. If bins provided, bucketize raw ages into the smallest
+        bin upper bound >= age (ages above the largest bound are dropped).
         """
         q = FaersQuery(drug=drug, count_field="patient.patientonsetage.exact", suffix="age")
         raw = self._fetch_and_cache_counts(q)
         if not bins:
             return raw
-        buckets: Dict[str, int] = {}
+        bounds = sorted(set(bins))
+        totals = [0] * len(bounds)
         for k, v in raw.items():
             try:
                 age = int(k)
             except (TypeError, ValueError):
                 continue
-            for b in bins:
-                if age <= b:
-                    label = f"<= {b}"
-                    buckets[label] = buckets.get(label, 0) + v
-                    break
-        return buckets
+            i = bisect_left(bounds, age)
+            if i < len(bounds):
+                totals[i] += v
+        return {f"<= {b}": n for b, n in zip(bounds, totals) if n}
 
     def get_reporter_breakdown(self, drug: str) -> Dict[str, int]:
         """
@@ -311,9 +314,13 @@ class OpenFDAClient:
         if data:
             return Counter(data).most_common(int(top_k))
 
-        # fallback: intersection of top reactions from each single
-        c1 = Counter(self._fetch_and_cache_counts(FaersQuery(drug1, "patient.reaction.reactionmeddrapt.exact")))
-        c2 = Counter(self._fetch_and_cache_counts(FaersQuery(drug2, "patient.reaction.reactionmeddrapt.exact")))
+        # fallback: intersection of top reactions from each single. These are the same
+        # queries get_top_reactions caches, and the two run concurrently.
+        field = "patient.reaction.reactionmeddrapt.exact"
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="openfda-pair") as ex:
+            future2 = ex.submit(self._fetch_and_cache_counts, FaersQuery(drug2, field, suffix="reactions"))
+            c1 = Counter(self._fetch_and_cache_counts(FaersQuery(drug1, field, suffix="reactions")))
+            c2 = Counter(future2.result())
         return (c1 & c2).most_common(int(top_k))
 
     def get_drug_reaction_evidence(self, drug: str, top_k: int = 10) -> List[EvidenceItem]:
@@ -1164,10 +1164,9 @@ def get_mechanistic(drugA: str, drugB: str) -> Dict[str, Any]:
     chembl_data_b = None
     
     try:
-        from src.retrieval import duckdb_query as dq
-        # Initialize DuckDB connection if needed
-        dq.init_duckdb_connection("data/duckdb")
-        db_client = dq.DuckDBClient("data/duckdb")
+        from src.retrieval.duckdb_query import shared_client
+        # The cached client the pipeline also uses, so its preloads are not rebuilt on every call
+        db_client = shared_client("data/duckdb")
         
         # Check if QLever found any enzymes for drugA
         has_enzymes_a = any(enzymes_a.values())
@@ -12,10 +12,11 @@ API Documentation: https://reactome.org/ContentService/
 import os
 import requests
 import logging
-from typing import Dict, List, Optional, Any
-from functools import lru_cache
+from typing import Any, Dict, List, Optional
 import time
 
+from src.utils.caching import ResultCache
+
 LOG = logging.getLogger(__name__)
 
 # Reactome REST API base URL
@@ -28,12 +29,15 @@ REACTOME_TIMEOUT = int(os.getenv("REACTOME_TIMEOUT", "15"))
 REACTOME_RATE_LIMIT = 0.2  # 200ms between requests
 
 
+# Per-protein/pathway/drug results, for the life of the process (failures are retried).
+_RESULTS = ResultCache()
+
+
 def _rate_limit():
     """Simple rate limiting to avoid overwhelming Reactome API."""
     time.sleep(REACTOME_RATE_LIMIT)
 
 
-@lru_cache(maxsize=1024)
 def get_pathways_for_protein(uniprot_id: str) -> List[Dict[str, Any]]:
     """
     Get Reactome pathways associated with a protein (UniProt ID).
@@ -52,47 +56,52 @@ def get_pathways_for_protein(uniprot_id: str) -> List[Dict[str, Any]]:
     
     # Clean UniProt ID
     clean_id = uniprot_id.strip().split(".")[0]
-    
+    try:
+        return _protein_pathways(clean_id)
+    except Exception as e:
+        LOG.debug("Reactome pathway query failed for %s: %s", clean_id, e)
+        return []
+
+
+def _protein_pathways(clean_id: str) -> List[Dict[str, Any]]:
+    """Cached pathways for a cleaned UniProt ID; raises (and caches nothing) on request failure."""
+    return _RESULTS.get(("get_pathways_for_protein", clean_id), lambda: _fetch_protein_pathways(clean_id))
+
+
+def _fetch_protein_pathways(clean_id: str) -> List[Dict[str, Any]]:
     pathways = []
     
-    try:
-        _rate_limit()
-        # Query pathways for protein
-        url = f"{REACTOME_API_BASE}/query/mapping/uniprot/{clean_id}"
-        params = {"species": "9606"}  # Homo sapiens
+    _rate_limit()
+    # Query pathways for protein
+    url = f"{REACTOME_API_BASE}/query/mapping/uniprot/{clean_id}"
+    params = {"species": "9606"}  # Homo sapiens
+    
+    r = requests.get(url, params=params, timeout=REACTOME_TIMEOUT)
+    
+    if r.status_code == 200:
+        data = r.json()
+        pathway_ids = []
         
-        r = requests.get(url, params=params, timeout=REACTOME_TIMEOUT)
+        # Extract pathway IDs from response
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict):
+                    pathways_list = item.get("pathways", [])
+                    for pathway in pathways_list:
+                        pathway_id = pathway.get("stId") or pathway.get("dbId")
+                        if pathway_id:
+                            pathway_ids.append(str(pathway_id))
         
-        if r.status_code == 200:
-            data = r.json()
-            pathway_ids = []
-            
-            # Extract pathway IDs from response
-            if isinstance(data, list):
-                for item in data:
-                    if isinstance(item, dict):
-                        pathways_list = item.get("pathways", [])
-                        for pathway in pathways_list:
-                            pathway_id = pathway.get("stId") or pathway.get("dbId")
-                            if pathway_id:
-                                pathway_ids.append(str(pathway_id))
-            
-            # Get pathway details
-            for pathway_id in pathway_ids[:10]:  # Limit to top 10
-                try:
-                    _rate_limit()
-                    pathway_info = get_pathway_info(pathway_id)
-                    if pathway_info:
-                        pathways.append(pathway_info)
-                except Exception as e:
-                    LOG.debug("Reactome pathway info query failed for %s: %s", pathway_id, e)
-    except Exception as e:
-        LOG.debug("Reactome pathway query failed for %s: %s", clean_id, e)
+        # Get pathway details
+        for pathway_id in pathway_ids[:10]:  # Limit to top 10
+            _rate_limit()
+            pathway_info = _pathway_info(pathway_id)
+            if pathway_info:
+                pathways.append(pathway_info)
     
     return pathways
 
 
-@lru_cache(maxsize=512)
 def get_pathway_info(pathway_id: str) -> Optional[Dict[str, Any]]:
     """
     Get detailed information about a Reactome pathway.
@@ -111,28 +120,37 @@ def get_pathway_info(pathway_id: str) -> Optional[Dict[str, Any]]:
         return None
     
     try:
-        _rate_limit()
-        url = f"{REACTOME_API_BASE}/data/query/{pathway_id}"
-        params = {"species": "9606"}
-        
-        r = requests.get(url, params=params, timeout=REACTOME_TIMEOUT)
-        
-        if r.status_code == 200:
-            data = r.json()
-            if isinstance(data, dict):
-                return {
-                    "pathway_id": pathway_id,
-                    "pathway_name": data.get("displayName", ""),
-                    "pathway_species": "Homo sapiens",
-                    "pathway_summary": data.get("summation", [{}])[0].get("text", "") if data.get("summation") else "",
-                }
+        return _pathway_info(pathway_id)
     except Exception as e:
         LOG.debug("Reactome pathway info query failed for %s: %s", pathway_id, e)
+        return None
+
+
+def _pathway_info(pathway_id: str) -> Optional[Dict[str, Any]]:
+    """Cached pathway details; raises (and caches nothing) on request failure."""
+    return _RESULTS.get(("get_pathway_info", pathway_id), lambda: _fetch_pathway_info(pathway_id))
+
+
+def _fetch_pathway_info(pathway_id: str) -> Optional[Dict[str, Any]]:
+    _rate_limit()
+    url = f"{REACTOME_API_BASE}/data/query/{pathway_id}"
+    params = {"species": "9606"}
+    
+    r = requests.get(url, params=params, timeout=REACTOME_TIMEOUT)
+    
+    if r.status_code == 200:
+        data = r.json()
+        if isinstance(data, dict):
+            return {
+                "pathway_id": pathway_id,
+                "pathway_name": data.get("displayName", ""),
+                "pathway_species": "Homo sapiens",
+                "pathway_summary": data.get("summation", [{}])[0].get("text", "") if data.get("summation") else "",
+            }
     
     return None
 
 
-@lru_cache(maxsize=256)
 def search_pathways_by_name(pathway_name: str, limit: int = 5) -> List[Dict[str, Any]]:
     """
     Search Reactome pathways by name.
@@ -147,57 +165,50 @@ def search_pathways_by_name(pathway_name: str, limit: int = 5) -> List[Dict[str,
     if not pathway_name or not pathway_name.strip():
         return []
     
+    # Reactome search is case-insensitive, so " Apoptosis" and "apoptosis" share an entry.
+    pathway_name = pathway_name.strip().lower()
+    key = ("search_pathways_by_name", pathway_name, limit)
     try:
-        _rate_limit()
-        url = f"{REACTOME_API_BASE}/search/query"
-        params = {
-            "query": pathway_name,
-            "species": "9606",
-            "types": "Pathway",
-            "cluster": "true",
-        }
-        
-        r = requests.get(url, params=params, timeout=REACTOME_TIMEOUT)
-        
-        if r.status_code == 200:
-            data = r.json()
-            results = []
-            
-            if isinstance(data, dict):
-                results_list = data.get("results", [])
-                for result in results_list[:limit]:
-                    entries = result.get("entries", [])
-                    for entry in entries[:limit]:
-                        pathway_id = entry.get("stId") or entry.get("dbId")
-                        if pathway_id:
-                            pathway_info = get_pathway_info(str(pathway_id))
-                            if pathway_info:
-                                results.append(pathway_info)
-            
-            return results
+        return _RESULTS.get(key, lambda: _search_pathways_by_name(pathway_name, limit))
     except Exception as e:
         LOG.debug("Reactome pathway search failed for %s: %s", pathway_name, e)
-    
-    return []
+        return []
 
 
-def get_common_pathways_for_proteins(uniprot_ids: List[str]) -> List[Dict[str, Any]]:
-    """
-    Find common Reactome pathways for a list of proteins.
+def _search_pathways_by_name(pathway_name: str, limit: int = 5) -> List[Dict[str, Any]]:
+    _rate_limit()
+    url = f"{REACTOME_API_BASE}/search/query"
+    params = {
+        "query": pathway_name,
+        "species": "9606",
+        "types": "Pathway",
+        "cluster": "true",
+    }
     
-    Args:
-        uniprot_ids: List of UniProt accessions
+    r = requests.get(url, params=params, timeout=REACTOME_TIMEOUT)
     
-    Returns:
-        List of common pathway dictionaries
-    """
-    if not uniprot_ids:
-        return []
+    results = []
+    if r.status_code == 200:
+        data = r.json()
+        
+        if isinstance(data, dict):
+            results_list = data.get("results", [])
+            for result in results_list[:limit]:
+                entries = result.get("entries", [])
+                for entry in entries[:limit]:
+                    pathway_id = entry.get("stId") or entry.get("dbId")
+                    if pathway_id:
+                        pathway_info = _pathway_info(str(pathway_id))
+                        if pathway_info:
+                            results.append(pathway_info)
     
-    # Get pathways for each protein
+    return results
+
+
+def _common_pathways(pathways_by_protein: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Pathways shared by more than one protein, tagged with the proteins that share them."""
     all_pathways = {}
-    for uniprot_id in uniprot_ids:
-        pathways = get_pathways_for_protein(uniprot_id)
+    for uniprot_id, pathways in pathways_by_protein.items():
         for pathway in pathways:
             pathway_id = pathway.get("pathway_id")
             if pathway_id:
@@ -209,7 +220,7 @@ def get_common_pathways_for_proteins(uniprot_ids: List[str]) -> List[Dict[str, A
                 all_pathways[pathway_id]["proteins"].append(uniprot_id)
     
     # Find pathways shared by multiple proteins
-    common_pathways = [
+    return [
         {
             **all_pathways[pid]["pathway"],
             "shared_by_proteins": all_pathways[pid]["proteins"],
@@ -217,11 +228,24 @@ def get_common_pathways_for_proteins(uniprot_ids: List[str]) -> List[Dict[str, A
         for pid in all_pathways
         if len(all_pathways[pid]["proteins"]) > 1
     ]
+
+
+def get_common_pathways_for_proteins(uniprot_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Find common Reactome pathways for a list of proteins.
+    
+    Args:
+        uniprot_ids: List of UniProt accessions
+    
+    Returns:
+        List of common pathway dictionaries
+    """
+    if not uniprot_ids:
+        return []
     
-    return common_pathways
+    return _common_pathways({uniprot_id: get_pathways_for_protein(uniprot_id) for uniprot_id in uniprot_ids})
 
 
-@lru_cache(maxsize=256)
 def get_drug_target_pathways(drug_name: str, target_uniprot_ids: List[str]) -> List[Dict[str, Any]]:
     """
     Get Reactome pathways for drug targets.
@@ -236,14 +260,29 @@ def get_drug_target_pathways(drug_name: str, target_uniprot_ids: List[str]) -> L
     if not target_uniprot_ids:
         return []
     
+    # The drug name is only used for logging, so drugs with the same targets share an entry.
+    key = ("get_drug_target_pathways", tuple(target_uniprot_ids))
+    try:
+        return _RESULTS.get(key, lambda: _get_drug_target_pathways(target_uniprot_ids))
+    except Exception as e:
+        LOG.debug("Reactome target pathway query failed for %s: %s", drug_name, e)
+        return []
+
+
+def _get_drug_target_pathways(target_uniprot_ids: List[str]) -> List[Dict[str, Any]]:
+    # Per-protein lookups raise on failure, so a partial answer is never cached here
+    by_protein = {
+        uniprot_id: _protein_pathways(uniprot_id.strip().split(".")[0])
+        for uniprot_id in target_uniprot_ids
+        if uniprot_id and uniprot_id.strip()
+    }
     # Get common pathways for all targets
-    common_pathways = get_common_pathways_for_proteins(target_uniprot_ids)
+    common_pathways = _common_pathways(by_protein)
     
     # Also get individual pathways (top pathways per target)
     all_pathways = {}
     for uniprot_id in target_uniprot_ids[:10]:  # Limit to avoid too many queries
-        pathways = get_pathways_for_protein(uniprot_id)
-        for pathway in pathways[:5]:  # Top 5 per target
+        for pathway in by_protein.get(uniprot_id, [])[:5]:  # Top 5 per target
             pathway_id = pathway.get("pathway_id")
             if pathway_id and pathway_id not in all_pathways:
                 all_pathways[pathway_id] = pathway
@@ -255,4 +294,3 @@ def get_drug_target_pathways(drug_name: str, target_uniprot_ids: List[str]) -> L
             result.append(pathway)
     
     return result[:20]  # Limit total results
-
@@ -103,6 +103,8 @@ class SemanticSearcher:
         self.drug_names: List[str] = []
         self.side_effect_index: Dict[str, np.ndarray] = {}
         self.side_effect_names: List[str] = []
+        self._side_effect_matrix: Optional[np.ndarray] = None
+        self._side_effect_matrix_source: Optional[Dict[str, np.ndarray]] = None
         self._initialized = False
         
         self._initialize_model()
@@ -362,6 +364,65 @@ class SemanticSearcher:
             return []
 
 
+    def _get_side_effect_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Stacked (N, d) view of side_effect_index, rebuilt only when the index is replaced."""
+        if self._side_effect_matrix is None or self._side_effect_matrix_source is not self.side_effect_index:
+            self._side_effect_matrix = np.vstack(list(self.side_effect_index.values()))
+            self._side_effect_matrix_source = self.side_effect_index
+        return list(self.side_effect_index.keys()), self._side_effect_matrix
+
+    def search_similar_side_effects_batch(
+        self,
+        queries: List[str],
+        top_k: int = 10,
+        threshold: float = SIMILARITY_THRESHOLD
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Batched form of search_similar_side_effects.
+
+        Encodes all queries in one pass and scores them against the index with a
+        single matrix product instead of one encode + index scan per query.
+
+        Args:
+            queries: Side effect names to search for
+            top_k: Number of results to return per query
+            threshold: Minimum similarity score (0-1)
+
+        Returns:
+            One list of (side_effect_name, similarity_score) tuples per query,
+            in the same order as ``queries``
+        """
+        results: List[List[Tuple[str, float]]] = [[] for _ in queries]
+        if self.model is None or not self.side_effect_index:
+            return results
+
+        positions = [i for i, q in enumerate(queries) if q and q.strip()]
+        if not positions:
+            return results
+
+        try:
+            query_embeddings = np.asarray(
+                self.model.encode([queries[i] for i in positions], show_progress_bar=False)
+            )
+            norms = np.linalg.norm(query_embeddings, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            query_embeddings = query_embeddings / norms
+
+            names, matrix = self._get_side_effect_matrix()
+            similarities = query_embeddings @ matrix.T
+
+            for row, pos in zip(similarities, positions):
+                hits = np.flatnonzero(row >= threshold)
+                # Stable sort keeps index order on ties, like the single-query path.
+                hits = hits[np.argsort(-row[hits], kind="stable")][:top_k]
+                results[pos] = [(names[j], float(row[j])) for j in hits]
+            return results
+
+        except Exception as e:
+            LOG.error(f"Batched side effect semantic search failed: {e}")
+            return results
+
+
 # Global instance (lazy initialization)
 _global_searcher: Optional[SemanticSearcher] = None
 
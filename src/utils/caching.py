@@ -4,15 +4,33 @@ from __future__ import annotations
 import json
 import os
 import re
+import threading
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional, Tuple
 
-from src.utils.sqlite_cache import SQLiteCache
+if TYPE_CHECKING:
+    from src.utils.sqlite_cache import SQLiteCache
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional fast path; stdlib json remains the fallback.
+    orjson = None
 
 # allow only safe chars in filenames; normalize to lowercase
 _SAFE = re.compile(r"[^a-z0-9._-]+")
 
+def _loads(raw: bytes | str) -> Any:
+    """Parse cached JSON, with orjson when available. Writes stay on stdlib json, whose
+    NaN/Infinity literals orjson rejects, so those entries fall back to json.loads."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
 def sanitize_key(key: str) -> str:
     return _SAFE.sub("_", key.lower())
 
@@ -46,9 +64,18 @@ def _sqlite_key(root: str | Path, key: str, ext: str, kind: str) -> str:
     return f"{kind}:{root_key}:{sanitize_key(key)}.{ext}"
 
 
+@lru_cache(maxsize=8)
+def _sqlite_cache_at(path: str) -> SQLiteCache:
+    # Reused so the schema check runs once and each thread keeps its connection.
+    # Imported here because sqlite_cache reads its payloads through _loads.
+    from src.utils.sqlite_cache import SQLiteCache
+
+    return SQLiteCache(path)
+
+
 def _sqlite_cache() -> SQLiteCache | None:
     enabled, path = _sqlite_cache_config()
-    return SQLiteCache(path) if enabled else None
+    return _sqlite_cache_at(path) if enabled else None
 
 # -------- JSON --------
 
@@ -72,7 +99,7 @@ def load_json(root: str | Path, key: str, *, ttl: Optional[int] = None, ext: str
         except Exception:
             return None
     try:
-        return json.loads(p.read_text(encoding="utf-8"))
+        return _loads(p.read_bytes())
     except Exception:
         try:
             p.unlink()
@@ -143,3 +170,51 @@ def save_text(root: str | Path, key: str, text: str, *, ext: str = "json") -> Pa
         f.write(text)
     os.replace(tmp, p)
     return p
+
+# -------- in-process results --------
+
+class ResultCache:
+    """
+    Process-lifetime cache of lookup results (per drug, protein, pathway...).
+
+    The key universe is finite, so a plain dict never evicts anything useful (a
+    256-slot LRU thrashed), and tuple keys let list arguments be cached. Only
+    writes take the lock; a dict read is atomic under the GIL.
+
+    A compute that raises is not cached, and empty results are kept for only
+    ``empty_ttl`` seconds, so a failed request is retried instead of remembered.
+    """
+
+    def __init__(self, empty_ttl: float = 60.0):
+        self.empty_ttl = empty_ttl
+        self._results: Dict[Hashable, Any] = {}
+        self._empty: Dict[Hashable, Tuple[float, Any]] = {}  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        hit = self._results.get(key)
+        if hit is not None:
+            return hit
+        empty = self._empty.get(key)
+        if empty is not None and empty[0] > time.monotonic():
+            return empty[1]
+        value = compute()
+        with self._lock:
+            if not value:
+                self._empty[key] = (time.monotonic() + self.empty_ttl, value)
+                return value
+            self._empty.pop(key, None)
+            return self._results.setdefault(key, value)
+
+    def peek(self, key: Hashable) -> Any:
+        """Cached non-empty result for key, or None."""
+        return self._results.get(key)
+
+    def setdefault(self, key: Hashable, value: Any) -> Any:
+        with self._lock:
+            return self._results.setdefault(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._empty.clear()
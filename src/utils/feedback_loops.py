@@ -13,7 +13,7 @@ import json
 import logging
 import os
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 LOG = logging.getLogger(__name__)
@@ -110,7 +110,7 @@ class FeedbackTracker:
         is_positive = response_quality.lower() in ("good", "positive", "accurate")
         
         feedback_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
             "query": query,
             "retrieved_items": retrieved_items,
             "response_quality": response_quality,
@@ -9,12 +9,84 @@ relevance to a drug interaction query.
 
 from __future__ import annotations
 
+import importlib.util
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+
 LOG = logging.getLogger(__name__)
 
 
+def _side_effect_score_kernel(prr: np.ndarray, semantic: np.ndarray) -> np.ndarray:
+    """
+    Array form of the side-effect branches of ``score_evidence_item``.
+
+    Side-effect items only carry PRR and semantic similarity, so those two bands
+    are the whole score. NaN marks a missing value.
+    """
+    n = prr.shape[0]
+    out = np.zeros(n, dtype=np.float64)
+    for i in range(n):
+        score = 0.0
+        p = prr[i]
+        if p == p:
+            if p > 2.0:
+                score += 5.0
+            elif p > 1.5:
+                score += 2.0
+            elif p > 1.0:
+                score += 0.5
+        sim = semantic[i]
+        if sim == sim:
+            if sim > 0.8:
+                score += 1.0
+            elif sim > 0.6:
+                score += 0.5
+        out[i] = score
+    return out
+
+
+_SCORE_KERNEL = None
+if HAS_NUMBA:
+    try:
+        from numba import njit
+
+        _SCORE_KERNEL = njit(cache=True)(_side_effect_score_kernel)
+    except Exception as e:  # pragma: no cover - depends on the local numba/LLVM build
+        LOG.debug("Numba scoring kernel unavailable: %s", e)
+        _SCORE_KERNEL = None
+
+
+def _as_float_array(side_effects: List[str], values: Optional[Dict[str, Any]]) -> np.ndarray:
+    if not values:
+        return np.full(len(side_effects), np.nan, dtype=np.float64)
+    return np.fromiter(
+        (float(v) if (v := values.get(se)) is not None else np.nan for se in side_effects),
+        dtype=np.float64,
+        count=len(side_effects),
+    )
+
+
+def _rank_side_effects_with_kernel(
+    side_effects: List[str],
+    prr_data: Optional[Dict[str, float]],
+    semantic_scores: Optional[Dict[str, float]],
+) -> Optional[List[Tuple[str, float]]]:
+    """Compiled ranking path; returns None when inputs are not plain numerics."""
+    try:
+        prr = _as_float_array(side_effects, prr_data)
+        semantic = _as_float_array(side_effects, semantic_scores)
+    except (ValueError, TypeError):
+        return None
+    scores = _SCORE_KERNEL(prr, semantic)
+    # Stable descending order keeps ties in input order, matching list.sort(reverse=True).
+    order = np.argsort(-scores, kind="stable")
+    return [(side_effects[i], float(scores[i])) for i in order]
+
+
 def score_evidence_item(
     item: Dict[str, Any],
     query_context: Dict[str, Any],
@@ -140,6 +212,11 @@ def score_and_rank_side_effects(
     Returns:
         List of (side_effect, score) tuples, sorted by score (descending)
     """
+    if _SCORE_KERNEL is not None and side_effects:
+        ranked = _rank_side_effects_with_kernel(side_effects, prr_data, semantic_scores)
+        if ranked is not None:
+            return ranked
+
     scored = []
     
     for se in side_effects:
@@ -257,7 +334,8 @@ def merge_and_rerank_evidence(
     keyword_results: List[Tuple[str, float]],
     semantic_results: List[Tuple[str, float]],
     keyword_weight: float = 0.6,
-    semantic_weight: float = 0.4
+    semantic_weight: float = 0.4,
+    top_k: Optional[int] = None
 ) -> List[Tuple[str, float]]:
     """
     Merge keyword and semantic search results with weighted combination.
@@ -267,9 +345,11 @@ def merge_and_rerank_evidence(
         semantic_results: List of (item, semantic_score) tuples
         keyword_weight: Weight for keyword scores
         semantic_weight: Weight for semantic scores
+        top_k: Optional number of top results to return (all if None)
         
     Returns:
-        Merged and reranked list of (item, combined_score) tuples
+        Merged and reranked list of (item, combined_score) tuples; ties keep
+        keyword-then-semantic order
     """
     # Normalize weights
     total_weight = keyword_weight + semantic_weight
@@ -281,18 +361,19 @@ def merge_and_rerank_evidence(
     keyword_dict = dict(keyword_results)
     semantic_dict = dict(semantic_results)
     
-    # Get all unique items
-    all_items = set(keyword_dict.keys()) | set(semantic_dict.keys())
+    # Get all unique items, in first-seen order
+    items = list(keyword_dict) + [item for item in semantic_dict if item not in keyword_dict]
+    if not items:
+        return []
     
-    # Combine scores
-    combined = []
-    for item in all_items:
-        kw_score = keyword_dict.get(item, 0.0)
-        sem_score = semantic_dict.get(item, 0.0)
-        combined_score = (kw_score * keyword_weight) + (sem_score * semantic_weight)
-        combined.append((item, combined_score))
-    
-    # Sort by combined score
-    combined.sort(key=lambda x: x[1], reverse=True)
-    return combined
+    # Combine scores as arrays and rank in one argsort
+    n = len(items)
+    kw_scores = np.fromiter((keyword_dict.get(item, 0.0) for item in items), dtype=np.float64, count=n)
+    sem_scores = np.fromiter((semantic_dict.get(item, 0.0) for item in items), dtype=np.float64, count=n)
+    combined = kw_scores * keyword_weight + sem_scores * semantic_weight
+    order = np.argsort(-combined, kind="stable")
+    if top_k is not None:
+        order = order[:max(int(top_k), 0)]
+    scores = combined.tolist()
+    return [(items[i], scores[i]) for i in order.tolist()]
 
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 import time
 from pathlib import Path
 from typing import Any
 
+from src.utils.caching import _loads
+
 
 class SQLiteCache:
     """Small durable cache for API/source payloads.
@@ -18,12 +21,19 @@ class SQLiteCache:
     def __init__(self, path: str | Path):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection per thread, opened on first use and kept; a cache hit is then a
+        # single indexed SELECT instead of a connect + PRAGMAs.
+        self._local = threading.local()
         self._init_db()
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.path, timeout=30)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=30000")
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
         return conn
 
     def _init_db(self) -> None:
@@ -52,7 +62,7 @@ class SQLiteCache:
         if ttl is not None and (time.time() - float(updated_at)) > ttl:
             return None
         try:
-            return json.loads(payload)
+            return _loads(payload)
         except json.JSONDecodeError:
             self.delete(key)
             return None
@@ -97,9 +107,11 @@ class SQLiteCache:
     ) -> None:
         self.set_json(key, text, kind=kind, metadata=metadata)
 
-    def delete(self, key: str) -> None:
+    def delete(self, key: str) -> bool:
+        """Delete one entry; True if it existed."""
         with self._connect() as conn:
-            conn.execute("DELETE FROM cache_entries WHERE cache_key = ?", (key,))
+            cursor = conn.execute("DELETE FROM cache_entries WHERE cache_key = ?", (key,))
+            return (cursor.rowcount or 0) > 0
 
     def clear_prefix(self, prefix: str) -> int:
         with self._connect() as conn:
@@ -19,6 +19,12 @@ def reset_settings_cache(monkeypatch):
     except Exception:
         yield
 
+@pytest.fixture(autouse=True)
+def isolated_sqlite_cache(tmp_path, monkeypatch):
+    # The manifest defaults to the SQLite backend; keep test runs out of data/cache.
+    monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_CACHE_PATH", str(tmp_path / "infermed_cache.sqlite"))
+
 @pytest.fixture(scope="session")
 def parquet_dir():
     p = os.getenv("DUCKDB_DIR", "").strip()
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+from src.retrieval import chembl_client as chembl
+
+
+@dataclass
+class FakeResponse:
+    status_code: int
+    payload: dict[str, Any]
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise chembl.requests.HTTPError(f"HTTP {self.status_code}", response=self)
+
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self.payload).encode("utf-8")
+
+    def json(self) -> dict[str, Any]:
+        return self.payload
+
+
+def _act(target, standard_type, value, relation="="):
+    return {
+        "target_pref_name": target,
+        "standard_type": standard_type,
+        "standard_relation": relation,
+        "standard_value": value,
+        "standard_units": "nM",
+    }
+
+
+ACTIVITIES = [
+    _act("Cytochrome P450 3A4", "Ki", "0.5"),
+    _act("Cytochrome P450 2C9", "IC50", "25"),
+    _act("Cytochrome P450 2D6", "IC50", "2", relation=">"),
+    _act("Cytochrome P450 1A2", "Inhibition", "40"),
+    _act("P-glycoprotein 1", "IC50", "3"),
+    _act("Thrombin", "Ki", "bad"),
+]
+
+BATCH_MOLECULE = {
+    "molecule_chembl_id": "CHEMBL1464",
+    "pref_name": "WARFARIN",
+    "molecule_synonyms": [{"molecule_synonym": "Coumadin", "synonyms": "COUMADIN"}],
+}
+
+
+@pytest.fixture
+def fake_chembl(monkeypatch, tmp_path):
+    monkeypatch.setenv("CHEMBL_CACHE_DIR", str(tmp_path / "chembl"))
+    monkeypatch.setenv("SQLITE_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    calls = []
+
+    def fake_get(url, params=None, timeout=None):
+        calls.append((url.rsplit("/", 1)[-1], dict(params or {})))
+        if url.endswith("/molecule.json") and "molecule_synonyms__synonyms__in" in (params or {}):
+            return FakeResponse(200, {"molecules": [BATCH_MOLECULE]})
+        if url.endswith("/molecule.json"):
+            return FakeResponse(200, {"molecules": [{"molecule_chembl_id": "CHEMBL1"}]})
+        if url.endswith("/activity.json"):
+            return FakeResponse(200, {"activities": ACTIVITIES})
+        if url.endswith("/pathway.json"):
+            return FakeResponse(200, {"pathways": [{"pathway": "Drug metabolism"}, {"pathway": ""}]})
+        return FakeResponse(404, {})
+
+    monkeypatch.setattr(chembl._SESSION, "get", fake_get, raising=False)
+    monkeypatch.setattr(chembl, "_COMPOUND_CACHE", chembl._TTLCache(maxsize=8, ttl=60), raising=True)
+    monkeypatch.setattr(chembl, "_COMPOUND_ERRORS", chembl._TTLCache(maxsize=8, ttl=60), raising=True)
+    chembl._get_activities.cache_clear()
+    yield calls
+    chembl._get_activities.cache_clear()
+
+
+def test_session_mounts_pooled_retrying_adapter():
+    adapter = chembl._SESSION.get_adapter("https://www.ebi.ac.uk/chembl/api/data")
+    assert adapter.max_retries.total == 3
+    assert 429 in adapter.max_retries.status_forcelist
+    assert chembl._SESSION.headers["Accept"] == "application/json"
+
+
+def test_enzyme_interactions_classify_cyp_potency(fake_chembl):
+    interactions = chembl.get_enzyme_interactions("Drug")
+
+    assert [(i["enzyme"], i["action"]) for i in interactions] == [
+        ("cyp3a4", "strong_inhibitor"),
+        ("cyp2c9", "weak_inhibitor"),
+    ]
+
+
+def test_enzyme_name_filter_keeps_matching_targets_only(fake_chembl):
+    interactions = chembl.get_enzyme_interactions("Drug", enzyme_name="CYP2C9")
+
+    assert [i["enzyme"] for i in interactions] == ["cyp2c9"]
+
+
+def test_enzyme_activities_are_filtered_server_side(fake_chembl):
+    chembl.get_enzyme_interactions("Drug", enzyme_name="CYP3A4")
+    chembl.get_enzyme_interactions("drug", enzyme_name="cyp3a4")
+    chembl.get_transporter_data("Drug")
+
+    enzyme, transporter = [p for name, p in fake_chembl if name == "activity.json"]
+    assert enzyme["standard_type__in"] == "Ki,IC50,EC50"
+    assert enzyme["standard_relation"] == "="
+    assert enzyme["target_pref_name__icontains"] == "3a4"
+    assert enzyme["limit"] == transporter["limit"] == 100
+    assert "standard_type__in" not in transporter and "target_pref_name__icontains" not in transporter
+
+
+def test_transporter_and_pathway_data(fake_chembl):
+    assert chembl.get_transporter_data("Drug") == [{"transporter": "p-glycoprotein 1", "action": "inhibitor"}]
+    assert chembl.get_pathway_data("Drug") == ["Drug metabolism"]
+
+
+def test_enrich_mechanistic_data_cross_validates_enzymes(fake_chembl):
+    enzymes = {"substrate": ["cyp2c9"], "inhibitor": ["cyp3a4"], "inducer": []}
+
+    enriched = chembl.enrich_mechanistic_data("Drug", enzymes)
+
+    assert enriched["enzyme_strength"] == {"strong": ["cyp3a4"], "moderate": [], "weak": ["cyp2c9"]}
+    assert enriched["chembl_validation"] == {"found": True, "matches": ["cyp3a4"], "mismatches": []}
+
+
+def test_async_enrich_matches_sync(fake_chembl, monkeypatch):
+    monkeypatch.setattr(chembl, "httpx", None, raising=True)  # route through the fake session
+    monkeypatch.setattr(chembl, "_ASYNC_ACTIVITY_CACHE", chembl._TTLCache(maxsize=8, ttl=60), raising=True)
+    enzymes = {"substrate": [], "inhibitor": ["cyp3a4"], "inducer": []}
+
+    out = asyncio.run(chembl.aenrich_mechanistic_data_many({"Drug": enzymes, "Other": {}}))
+
+    assert out["Drug"] == chembl.enrich_mechanistic_data("Drug", enzymes)
+    assert set(out) == {"Drug", "Other"}
+
+
+def test_compound_lookup_caches_answers_and_briefly_remembers_failures(fake_chembl, monkeypatch):
+    assert chembl._get_compound_by_name("Drug") == {"molecule_chembl_id": "CHEMBL1"}
+    chembl._get_compound_by_name("Drug")
+    assert [name for name, _ in fake_chembl].count("molecule.json") == 1
+
+    def failing_get(url, params=None, timeout=None):
+        fake_chembl.append((url.rsplit("/", 1)[-1], dict(params or {})))
+        return FakeResponse(503, {})
+
+    monkeypatch.setattr(chembl._SESSION, "get", failing_get, raising=False)
+    assert chembl._get_compound_by_name("Other") is None
+    assert chembl._get_compound_by_name("Other") is None
+    assert [name for name, _ in fake_chembl].count("molecule.json") == 2
+
+    chembl._COMPOUND_ERRORS.clear()  # error entry expired -> retried
+    chembl._get_compound_by_name("Other")
+    assert [name for name, _ in fake_chembl].count("molecule.json") == 3
+
+
+def test_ttl_cache_expires_and_bounds_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(chembl.time, "monotonic", lambda: now[0])
+    cache = chembl._TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", None)
+    cache.set("c", 3)
+
+    assert cache.get("a") is chembl._MISS  # evicted (LRU)
+    assert cache.get("b") is None
+    now[0] += 11
+    assert cache.get("c") is chembl._MISS  # expired
+
+
+def test_batch_compound_lookup_matches_synonyms_and_falls_back(fake_chembl):
+    out = chembl.get_compounds_by_names(["Warfarin", "coumadin", "Unknown", "Warfarin"])
+
+    assert out["Warfarin"]["molecule_chembl_id"] == "CHEMBL1464"
+    assert out["coumadin"]["molecule_chembl_id"] == "CHEMBL1464"
+    assert out["Unknown"] == {"molecule_chembl_id": "CHEMBL1"}  # single-name fallback
+    batch_params = [p for name, p in fake_chembl if "molecule_synonyms__synonyms__in" in p]
+    assert len(batch_params) == 1
+    assert batch_params[0]["molecule_synonyms__synonyms__in"].split(",")[:2] == ["Warfarin", "WARFARIN"]
+
+    chembl.enrich_mechanistic_data_batch(["Warfarin", "coumadin"], {})
+    assert [name for name, _ in fake_chembl].count("molecule.json") == 2  # all cached now
+
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_responses_persist_across_in_memory_cache_resets(fake_chembl, monkeypatch, backend):
+    monkeypatch.setenv("CACHE_BACKEND", backend)
+    first = chembl.get_enzyme_interactions("Drug")
+    calls_after_first = len(fake_chembl)
+
+    monkeypatch.setattr(chembl, "_COMPOUND_CACHE", chembl._TTLCache(maxsize=8, ttl=60), raising=True)
+    chembl._get_activities.cache_clear()  # simulate a fresh process
+
+    assert chembl.get_enzyme_interactions("Drug") == first
+    assert len(fake_chembl) == calls_after_first
+
+
+def test_activity_fetch_requests_only_needed_fields_and_retries_on_400(fake_chembl, monkeypatch):
+    chembl.get_transporter_data("Drug")
+    assert [p for name, p in fake_chembl if name == "activity.json"][0]["only"] == chembl._ACTIVITY_FIELDS
+
+    def rejecting_only(url, params=None, timeout=None):
+        fake_chembl.append((url.rsplit("/", 1)[-1], dict(params or {})))
+        if url.endswith("/activity.json") and "only" in (params or {}):
+            return FakeResponse(400, {})
+        return FakeResponse(200, {"activities": ACTIVITIES})
+
+    monkeypatch.setattr(chembl._SESSION, "get", rejecting_only, raising=False)
+    chembl._get_activities.cache_clear()
+    chembl._get_activities("CHEMBL2")
+
+    assert ["only" in p for name, p in fake_chembl[-2:]] == [True, False]
+
+
+@pytest.mark.parametrize("value, action", [
+    ("0.99", "strong_inhibitor"),
+    ("1", "moderate_inhibitor"),
+    ("9.9", "moderate_inhibitor"),
+    ("10", "weak_inhibitor"),
+    ("bad", "unknown"),
+])
+def test_inhibitor_strength_band_boundaries(value, action):
+    out = chembl._parse_enzyme_interactions([_act("Cytochrome P450 3A4", "IC50", value)], None)
+    assert out[0].action == action
+
+
+@pytest.mark.parametrize("enzyme_name", [None, "CYP3A4"])
+def test_vectorized_enzyme_parsing_matches_record_loop(monkeypatch, enzyme_name):
+    targets = ["Cytochrome P450 3A4", "CYP2C19", "Thrombin", None, "cytochrome p450 1a2"]
+    types = ["Ki", "IC50", "EC50", "Inhibition"]
+    values = ["0.5", "1", "10", "bad", "", None, 0, "nan", 3.2]
+    activities = [
+        {
+            "target_pref_name": targets[i % len(targets)],
+            "standard_type": types[i % len(types)],
+            "standard_relation": "=" if i % 7 else ">",
+            "standard_value": values[i % len(values)],
+            "standard_units": "nM",
+        }
+        for i in range(300)
+    ]
+
+    vectorized = chembl._parse_enzyme_interactions(activities, enzyme_name)
+    monkeypatch.setattr(chembl, "pd", None, raising=True)
+    looped = chembl._parse_enzyme_interactions(activities, enzyme_name)
+
+    assert vectorized and vectorized == looped
+
+
+def test_interaction_records_are_slotted_and_serialize_to_dicts(fake_chembl):
+    records = chembl._enzyme_interactions("Drug")
+
+    assert all(isinstance(r, chembl.Interaction) and not hasattr(r, "__dict__") for r in records)
+    assert [r.to_dict() for r in records] == chembl.get_enzyme_interactions("Drug")
+
+
+@pytest.mark.parametrize("target, hit", [
+    ("P-glycoprotein 1", True),
+    ("Solute carrier organic anion transporter family member 1B1 (OATP1B1)", True),
+    ("Multidrug and toxin extrusion protein 1 (MATE1)", True),
+    ("Cytochrome P450 3A4", False),
+    ("", False),
+])
+def test_transporter_pattern_matches_known_names(target, hit):
+    assert bool(chembl._parse_transporter_data([_act(target, "IC50", "3")])) is hit
+
+
+def test_batch_enrichment_fans_out_on_worker_pool(fake_chembl, monkeypatch):
+    threads = []
+    original = chembl.enrich_mechanistic_data
+
+    def recording(drug, enzymes):
+        threads.append(chembl.threading.current_thread().name)
+        return original(drug, enzymes)
+
+    monkeypatch.setattr(chembl, "enrich_mechanistic_data", recording, raising=True)
+    enzymes = {"substrate": [], "inhibitor": ["cyp3a4"], "inducer": []}
+
+    out = chembl.enrich_mechanistic_data_batch(["Warfarin", "Drug", "Warfarin"], {"Drug": enzymes})
+
+    assert list(out) == ["Warfarin", "Drug"]
+    assert out["Drug"] == original("Drug", enzymes)
+    assert len(threads) == 2 and all(name.startswith("chembl") for name in threads)
+
+
+def test_compound_lookup_is_canonicalized_before_caching(fake_chembl):
+    chembl._get_compound_by_name("Aspirin")
+    chembl._get_compound_by_name(" aspirin ")
+    out = chembl.get_compounds_by_names(["ASPIRIN", "aspirin"])
+
+    assert [name for name, _ in fake_chembl] == ["molecule.json"]
+    assert fake_chembl[0][1]["molecule_synonyms__synonyms__icontains"] == "aspirin"
+    assert out == {"ASPIRIN": {"molecule_chembl_id": "CHEMBL1"}, "aspirin": {"molecule_chembl_id": "CHEMBL1"}}
+
+
+def test_enriched_enzymes_are_a_read_only_snapshot(fake_chembl):
+    enzymes = {"substrate": ["cyp2c9"], "inhibitor": ["cyp3a4"], "inducer": []}
+
+    enriched = chembl.enrich_mechanistic_data("Drug", enzymes)
+    enzymes["inhibitor"].append("cyp1a2")
+
+    assert enriched["enzymes"]["inhibitor"] == ("cyp3a4",)
+    with pytest.raises(TypeError):
+        enriched["enzymes"]["inducer"] = ("cyp2d6",)
+
+
+def test_empty_enrichment_shares_frozen_sections():
+    first = chembl._classify_enrichment({"inhibitor": ["cyp3a4"]}, [])
+    second = chembl._classify_enrichment({}, [])
+
+    assert first["enzyme_strength"] is second["enzyme_strength"] is chembl._EMPTY_STRENGTH
+    assert first["chembl_validation"] == {"found": False, "matches": (), "mismatches": ()}
+    assert first["enzymes"] == {"inhibitor": ("cyp3a4",)}
+
+
+def test_concurrent_async_lookups_share_one_fetch(fake_chembl, monkeypatch):
+    monkeypatch.setattr(chembl, "_ASYNC_ACTIVITY_CACHE", chembl._TTLCache(maxsize=8, ttl=60), raising=True)
+    calls = []
+
+    async def slow_get_json(path, params):
+        calls.append(path)
+        await asyncio.sleep(0.01)
+        if path == "molecule.json":
+            return {"molecules": [{"molecule_chembl_id": "CHEMBL1"}]}
+        return {"activities": ACTIVITIES}
+
+    monkeypatch.setattr(chembl, "_aget_json", slow_get_json, raising=True)
+
+    async def run():
+        return await asyncio.gather(*(chembl.aget_enzyme_interactions(n) for n in ["Drug", "drug ", "DRUG"]))
+
+    results = asyncio.run(run())
+
+    assert calls == ["molecule.json", "activity.json"]
+    assert results[0] == results[1] == results[2] and results[0]
+    assert chembl._INFLIGHT == {}
+
+
+@pytest.mark.skipif(chembl.httpx is None, reason="httpx not installed")
+def test_async_clients_are_kept_per_event_loop(monkeypatch):
+    monkeypatch.setattr(chembl, "_ASYNC_CLIENTS", chembl.weakref.WeakKeyDictionary(), raising=True)
+
+    async def client_pair():
+        return chembl._get_async_client(), chembl._get_async_client()
+
+    first_loop = asyncio.new_event_loop()
+    first, again = first_loop.run_until_complete(client_pair())
+    second_loop = asyncio.new_event_loop()
+    second, _ = second_loop.run_until_complete(client_pair())
+
+    assert first is again and first is not second
+    assert set(chembl._ASYNC_CLIENTS.values()) == {first, second}  # both loops still open
+
+    first_loop.close()
+    third_loop = asyncio.new_event_loop()
+    third, _ = third_loop.run_until_complete(client_pair())
+    assert set(chembl._ASYNC_CLIENTS.values()) == {second, third}  # closed loop's client dropped
+
+    for loop, client in ((second_loop, second), (third_loop, third)):
+        loop.run_until_complete(client.aclose())
+        loop.close()
+
+
+def test_async_activity_cache_is_bounded():
+    assert chembl._ASYNC_ACTIVITY_CACHE.maxsize == 1024
@@ -50,6 +50,19 @@ def test_public_safe_disables_drugbank_even_when_file_exists(monkeypatch):
     assert c.get_available_sources()["drugbank"] is False
     assert c.get_drug_targets("warfarin") == []
 
+
+@pytest.mark.parametrize("raw, expected", [
+    (None, None),
+    ("  Warfarin\xa0Sodium ", "warfarin sodium"),
+    ("\xa0ASPIRIN", "aspirin"),
+    (123, "123"),
+])
+def test_norm_name(raw, expected):
+    from src.retrieval.duckdb_query import _norm_name
+
+    assert _norm_name(raw) == expected
+
+
 @pytest.mark.parametrize("drug, expect_list", [
     ("warfarin", True),
     ("fluconazole", True),
@@ -117,3 +130,635 @@ def test_get_drug_targets_batch(client):
     assert isinstance(out, dict)
     assert "warfarin" in out and "fluconazole" in out
     assert isinstance(out["warfarin"], list)
+
+
+@pytest.fixture
+def tiny_parquet_dir(tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    con = duckdb.connect()
+    base = str(tmp_path).replace("'", "''")
+    con.execute(f"""
+        COPY (SELECT * FROM (VALUES
+            ('warfarin', 'fluconazole', 'bleeding', 3.0),
+            ('warfarin', 'fluconazole', 'bruising', 1.4),
+            ('aspirin', 'warfarin', 'bleeding', 2.0),
+            ('aspirin', 'ibuprofen', 'nausea', 1.1)
+        ) t(drug_a, drug_b, side_effect, prr)) TO '{base}/twosides.parquet' (FORMAT PARQUET)
+    """)
+    con.execute(f"""
+        COPY (SELECT * FROM (VALUES ('warfarin sodium', 0.5), ('fluconazole', 0.8))
+              t(drug_name, dili_score)) TO '{base}/dilirank.parquet' (FORMAT PARQUET)
+    """)
+    con.execute(f"""
+        COPY (SELECT * FROM (VALUES ('warfarin', 0.2), ('fluconazole', 0.45))
+              t(drug_name, score)) TO '{base}/dictrank.parquet' (FORMAT PARQUET)
+    """)
+    con.execute(f"""
+        COPY (SELECT * FROM (VALUES ('fluconazole', 0.9)) t(drug_name, score))
+        TO '{base}/diqt.parquet' (FORMAT PARQUET)
+    """)
+    con.execute(f"""
+        COPY (SELECT
+                'warfarin' AS name_lower, 'Warfarin' AS name,
+                ['coumadin'] AS synonyms, ['VKORC1', 'CYP2C9'] AS targets,
+                ['Q9BQB6'] AS target_uniprot, ['inhibitor'] AS target_actions,
+                ['CYP2C9'] AS enzymes, ['substrate'] AS enzyme_actions,
+                '[{{"enzyme": "CYP2C9", "actions": ["substrate"]}}]' AS enzyme_action_map,
+                ['fluconazole'] AS interactions)
+        TO '{base}/drugbank.parquet' (FORMAT PARQUET)
+    """)
+    con.close()
+    init_duckdb_connection.cache_clear()
+    yield str(tmp_path)
+    init_duckdb_connection.cache_clear()
+
+
+def _tiny_client(path):
+    return DuckDBClient(path, enable_drugbank=True, enable_duckdb=True)
+
+
+def test_risk_bundle_matches_single_drug_lookups(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+
+    bundle = c.get_risk_bundle("Warfarin", "fluconazole")
+
+    assert bundle == {
+        "dili_a": c.get_dilirank_score("warfarin"),
+        "dili_b": c.get_dilirank_score("fluconazole"),
+        "dict_a": c.get_dictrank_score("warfarin"),
+        "dict_b": c.get_dictrank_score("fluconazole"),
+        "diqt_a": c.get_diqt_score("warfarin"),
+        "diqt_b": c.get_diqt_score("fluconazole"),
+        "targets_a": c.get_drug_targets("warfarin"),
+        "targets_b": c.get_drug_targets("fluconazole"),
+    }
+    assert bundle["dili_a"] == 0.5  # partial-match fallback ("warfarin sodium")
+    assert bundle["diqt_a"] is None
+    assert bundle["targets_a"] == ["VKORC1", "CYP2C9"]
+
+
+@pytest.mark.parametrize("preloaded", [True, False])
+def test_drug_profile_matches_single_drug_lookups(tiny_parquet_dir, preloaded):
+    c = _tiny_client(tiny_parquet_dir)
+    expected = {
+        d: (c.get_synonyms(d), c.get_drug_targets(d), c.get_dictrank_score(d),
+            c.get_dilirank_score(d), c.get_diqt_score(d))
+        for d in ("warfarin", "fluconazole", "__none__")
+    }
+    if not preloaded:
+        c._rank_tables = dict.fromkeys(c._rank_tables)
+        c._drugbank_lists = None
+    c._con = _CountingConnection(c._con)
+
+    for d, values in expected.items():
+        p = c.get_drug_profile(d.upper())
+        assert (p.synonyms, p.targets, p.dictrank, p.dilirank, p.diqt) == values
+        assert p.name == d
+    assert len(c._con.statements) == (0 if preloaded else 3)
+
+    batch = c.get_drug_profiles(["Warfarin", "", "fluconazole", "__none__"])
+    assert list(batch) == ["Warfarin", "fluconazole", "__none__"]
+    for name, profile in batch.items():
+        d = name.lower()
+        assert (profile.synonyms, profile.targets, profile.dictrank, profile.dilirank, profile.diqt) == expected[d]
+    assert len(c._con.statements) == (0 if preloaded else 4)
+
+
+def test_side_effect_prrs_batches_single_and_pair_lookups(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+
+    single = c.get_side_effect_prrs("Warfarin", ["bleeding", "bruising", "nausea", "bleeding"])
+    pair = c.get_side_effect_prrs("fluconazole", ["bleeding", "bruising"], drug_b="warfarin")
+
+    assert single == {"bleeding": 3.0, "bruising": 1.4}
+    assert pair == {"bleeding": 3.0, "bruising": 1.4}
+    assert max(pair.values()) == c.get_interaction_score("warfarin", "fluconazole")
+    assert c.get_side_effect_prrs("warfarin", []) == {}
+
+
+def test_chunked_side_effects_batch_matches_single_query(tiny_parquet_dir, monkeypatch):
+    import src.retrieval.duckdb_query as dq
+
+    c = _tiny_client(tiny_parquet_dir)
+    drugs = ["warfarin", "Fluconazole", "aspirin", "ibuprofen", "__none__"]
+    expected = c.get_side_effects_batch(drugs, top_k_per_drug=1)
+
+    monkeypatch.setattr(dq, "_SIDE_EFFECT_CHUNK", 2)
+
+    assert c.get_side_effects_batch(drugs, top_k_per_drug=1) == expected
+    assert expected["warfarin"] == ["bleeding"]
+
+
+def test_side_effects_batch_lists_are_ranked_and_unique(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+
+    batch = c.get_side_effects_batch(["warfarin", "Aspirin", "__none__"], top_k_per_drug=5)
+
+    assert batch == {"warfarin": ["bleeding", "bruising"], "aspirin": ["bleeding", "nausea"], "__none__": []}
+    assert batch["warfarin"] == c.get_side_effects("warfarin", top_k=5)
+
+
+def test_single_drug_side_effects_batch_uses_prepared_statement(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+    full = c.get_side_effects_batch(["warfarin", "aspirin"], top_k_per_drug=1)
+    c._con = _CountingConnection(c._con)
+
+    single = c.get_side_effects_batch(["Warfarin", "warfarin ", None, "WARFARIN"], top_k_per_drug=1)
+
+    assert single == {"warfarin": full["warfarin"]} == {"warfarin": ["bleeding"]}
+    assert c._con.statements == ["EXECUTE q_twosides_side_effects('warfarin', 1.0, 1);"]
+
+
+def test_side_effects_batch_is_a_single_scan_with_fixed_sql(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+    c._con = _CountingConnection(c._con)
+
+    c.get_side_effects_batch(["warfarin", "aspirin", "ibuprofen"])
+
+    c.get_side_effects_batch(["warfarin", "aspirin"])
+
+    assert len(c._con.statements) == 2
+    sql = c._con.statements[0]
+    assert sql.count("FROM twosides_sym") == 1
+    assert "UNION" not in sql and "drug_b" not in sql
+    assert c._con.statements[1] == sql  # one list parameter, whatever the batch size
+
+
+def test_twosides_sym_reads_the_presorted_symmetric_file(tiny_parquet_dir, monkeypatch):
+    import duckdb
+    import src.retrieval.duckdb_query as dq
+
+    base = tiny_parquet_dir.replace("'", "''")
+    duckdb.connect().execute(f"""
+        COPY (SELECT * FROM (SELECT drug_a, drug_b, side_effect, prr FROM read_parquet('{base}/twosides.parquet')
+                             UNION ALL
+                             SELECT drug_b, drug_a, side_effect, prr FROM read_parquet('{base}/twosides.parquet'))
+              ORDER BY drug_a, drug_b) TO '{base}/twosides_sym.parquet' (FORMAT PARQUET)
+    """)
+    monkeypatch.setattr(dq, "_MATERIALIZE_MAX_BYTES", 0)
+    monkeypatch.setattr(dq, "_PERSISTED_MATERIALIZE_MAX_BYTES", 0)
+    c = _tiny_client(tiny_parquet_dir)
+
+    sql = c._con.execute("SELECT sql FROM duckdb_views() WHERE view_name = 'twosides_sym'").fetchone()[0]
+    assert "twosides_sym.parquet" in sql and "UNION" not in sql
+    assert c.get_side_effects("fluconazole", top_k=5) == ["bleeding", "bruising"]
+    assert c.get_interaction_score("fluconazole", "warfarin") == 3.0
+
+
+def test_rank_views_push_name_filters_into_the_parquet_scan(tiny_parquet_dir, monkeypatch):
+    import src.retrieval.duckdb_query as dq
+
+    monkeypatch.setattr(dq, "_MATERIALIZE_MAX_BYTES", 0)
+    monkeypatch.setattr(dq, "_PERSISTED_MATERIALIZE_MAX_BYTES", 0)
+    con = init_duckdb_connection(tiny_parquet_dir, True, True)
+
+    for relation in ("dictrank", "dilirank", "diqt"):
+        plan = con.execute(f"EXPLAIN SELECT * FROM {relation} WHERE drug_name = 'fluconazole'").fetchall()[0][1]
+        assert "drug_name='fluconazole'" in plan.replace(" ", "")
+        assert "lower(" not in plan
+
+
+def test_connection_is_rebuilt_after_parquet_files_change(tiny_parquet_dir, monkeypatch):
+    import duckdb
+    import src.retrieval.duckdb_query as dq
+
+    monkeypatch.setenv("DUCKDB_REFRESH_SECONDS", "60")
+    root = os.path.abspath(tiny_parquet_dir)
+
+    def age_last_check():
+        checked_at, signature = dq._SOURCE_CHECKS[root]
+        dq._SOURCE_CHECKS[root] = (checked_at - 60, signature)
+
+    first = init_duckdb_connection(tiny_parquet_dir, True, True)
+    age_last_check()
+    assert init_duckdb_connection(tiny_parquet_dir, True, True) is first  # nothing changed
+
+    base = tiny_parquet_dir.replace("'", "''")
+    duckdb.connect().execute(f"""
+        COPY (SELECT * FROM (VALUES ('fluconazole', 0.9), ('warfarin', 0.3)) t(drug_name, score))
+        TO '{base}/diqt.parquet' (FORMAT PARQUET)
+    """)
+    assert init_duckdb_connection(tiny_parquet_dir, True, True) is first  # within the TTL
+    age_last_check()
+    assert init_duckdb_connection(tiny_parquet_dir, True, True) is not first
+    assert _tiny_client(tiny_parquet_dir).get_diqt_score("warfarin") == 0.3
+
+
+def test_connection_applies_thread_and_memory_settings(tiny_parquet_dir, monkeypatch):
+    monkeypatch.setenv("DUCKDB_THREADS", "2")
+    monkeypatch.setenv("DUCKDB_MEMORY_LIMIT", "512MB")
+
+    con = init_duckdb_connection(tiny_parquet_dir, True, True)
+
+    assert con.execute("SELECT current_setting('threads')").fetchone()[0] == 2
+    assert con.execute("SELECT current_setting('memory_limit')").fetchone()[0] == "488.2 MiB"  # 512MB
+    assert con.execute("SELECT current_setting('parquet_metadata_cache')").fetchone()[0] is True
+
+
+def test_interaction_scores_batch_matches_pair_lookups(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+    drugs = ["Warfarin", "fluconazole", "aspirin", "ibuprofen", "", "warfarin"]
+
+    scores = c.get_interaction_scores_batch(drugs)
+    fresh = _tiny_client(tiny_parquet_dir)
+
+    assert len(scores) == 10  # C(5, 2): empty names dropped, spellings kept
+    assert scores[("Warfarin", "fluconazole")] == 3.0
+    assert scores[("Warfarin", "aspirin")] == 2.0
+    assert scores[("fluconazole", "ibuprofen")] == 0.0
+    assert scores[("Warfarin", "warfarin")] == 0.0
+    assert all(score == fresh.get_interaction_score(x, y) for (x, y), score in scores.items())
+    assert c._lookup_cache[("q_twosides_pair", "aspirin", "ibuprofen")] == (1.1,)
+
+
+def test_small_lookup_files_are_materialized_as_tables(tiny_parquet_dir):
+    con = init_duckdb_connection(tiny_parquet_dir, True, True)
+
+    kinds = dict(con.execute(
+        "SELECT table_name, table_type FROM information_schema.tables"
+    ).fetchall())
+
+    assert kinds["dictrank"] == "BASE TABLE"
+    assert kinds["drugbank"] == "BASE TABLE"
+    assert kinds["twosides"] == "VIEW"
+
+
+def test_persisted_database_materializes_past_the_in_memory_cap(tiny_parquet_dir, monkeypatch):
+    import src.retrieval.duckdb_query as dq
+
+    monkeypatch.setattr(dq, "_MATERIALIZE_MAX_BYTES", 0)
+    con = init_duckdb_connection(tiny_parquet_dir, True, True)
+    kinds = dict(con.execute("SELECT table_name, table_type FROM information_schema.tables").fetchall())
+    assert kinds["twosides_sym"] == kinds["dictrank"] == "BASE TABLE"
+
+    monkeypatch.setattr(dq, "_PERSISTED_MATERIALIZE_MAX_BYTES", 0)
+    init_duckdb_connection.cache_clear()
+    con = init_duckdb_connection(tiny_parquet_dir, True, True)
+    kinds = dict(con.execute("SELECT table_name, table_type FROM information_schema.tables").fetchall())
+    assert kinds["twosides_sym"] == kinds["dictrank"] == "VIEW"
+    assert _tiny_client(tiny_parquet_dir).get_dictrank_score("warfarin") == 0.2
+
+
+def test_materialized_lookup_tables_are_indexed(tiny_parquet_dir):
+    con = init_duckdb_connection(tiny_parquet_dir, True, True)
+
+    indexes = {row[0] for row in con.execute("SELECT index_name FROM duckdb_indexes()").fetchall()}
+
+    assert {"drugbank_name_lower_idx", "dictrank_drug_name_idx", "dilirank_drug_name_idx", "diqt_drug_name_idx"} <= indexes
+    assert _tiny_client(tiny_parquet_dir).get_dictrank_score("Warfarin") == 0.2
+
+
+def test_twosides_pairs_are_materialized_in_both_orders(tiny_parquet_dir):
+    con = init_duckdb_connection(tiny_parquet_dir, True, True)
+    c = _tiny_client(tiny_parquet_dir)
+
+    rows = con.execute(
+        "SELECT drug_a, drug_b FROM twosides_sym WHERE side_effect = 'nausea' ORDER BY drug_a"
+    ).fetchall()
+
+    assert rows == [("aspirin", "ibuprofen"), ("ibuprofen", "aspirin")]
+    assert "twosides_sym_drug_a_idx" in {r[0] for r in con.execute("SELECT index_name FROM duckdb_indexes()").fetchall()}
+    assert c.get_side_effects("fluconazole", "warfarin") == c.get_side_effects("warfarin", "fluconazole") == ["bleeding", "bruising"]
+    assert c.get_side_effects("ibuprofen", top_k=5) == ["nausea"]
+
+
+def test_initialized_database_persists_across_restarts(tiny_parquet_dir):
+    con = init_duckdb_connection(tiny_parquet_dir, True, True)
+    assert os.path.exists(os.path.join(tiny_parquet_dir, "retrieval.duckdb"))
+    con.execute("INSERT INTO dictrank VALUES ('marker', 0.0, 'low')")
+
+    init_duckdb_connection.cache_clear()
+    con = init_duckdb_connection(tiny_parquet_dir, True, True)
+    assert con.execute("SELECT COUNT(*) FROM dictrank WHERE drug_name = 'marker'").fetchone()[0] == 1
+
+    # A rewritten parquet file rebuilds its table.
+    path = os.path.join(tiny_parquet_dir, "dictrank.parquet")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000_000))
+    init_duckdb_connection.cache_clear()
+    con = init_duckdb_connection(tiny_parquet_dir, True, True)
+    assert con.execute("SELECT COUNT(*) FROM dictrank WHERE drug_name = 'marker'").fetchone()[0] == 0
+
+
+def test_persisted_database_drops_sources_that_are_no_longer_enabled(tiny_parquet_dir):
+    init_duckdb_connection(tiny_parquet_dir, True, True)
+    init_duckdb_connection.cache_clear()
+
+    c = DuckDBClient(tiny_parquet_dir, enable_drugbank=False, enable_duckdb=True)
+
+    assert not c.has_view("drugbank")
+    assert c._con.execute("SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'drugbank'").fetchone()[0] == 0
+
+
+def test_hot_lookups_use_prepared_statements_and_quote_values(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+    prepared = {row[0] for row in c._con.execute("SELECT name FROM duckdb_prepared_statements()").fetchall()}
+
+    assert {"q_dictrank", "q_diqt_like", "q_twosides_pair", "q_drugbank_targets"} <= prepared
+    assert c.get_interaction_score("fluconazole", "warfarin") == 3.0
+    assert c.get_synonyms("Warfarin") == ["coumadin"]
+    assert c.get_dictrank_score("o'brien") is None
+    assert c.get_dict_rank("x' OR '1'='1") == "unknown"
+
+
+class _CountingConnection:
+    def __init__(self, con):
+        self._inner = con
+        self.statements = []
+
+    def execute(self, sql, *args):
+        self.statements.append(sql)
+        return self._inner.execute(sql, *args)
+
+
+def test_repeated_lookups_are_served_from_client_memory(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+    c._con = _CountingConnection(c._con)
+
+    for _ in range(3):
+        assert c.get_dictrank_score("warfarin") == 0.2
+        assert c.get_dilirank_score("warfarin") == 0.5  # exact miss, LIKE fallback
+        assert c.get_drug_targets("warfarin") == ["VKORC1", "CYP2C9"]
+        assert c.get_interaction_score("warfarin", "fluconazole") == c.get_interaction_score("fluconazole", "warfarin")
+
+    executed = c._con.statements
+    assert sum("EXECUTE q_twosides_pair" in sql for sql in executed) == 1
+    # rank tables and DrugBank lists are preloaded on first use, then served from memory
+    preloads = [sql for sql in executed if "dictrank" in sql or "dilirank" in sql or "drugbank" in sql]
+    assert not any(sql.startswith("EXECUTE") for sql in preloads)
+    assert sorted(sql for sql in preloads if "COUNT" in sql) == [
+        "SELECT COUNT(*) FROM dictrank;", "SELECT COUNT(*) FROM dilirank;", "SELECT COUNT(*) FROM drugbank;",
+    ]
+
+
+def test_client_construction_defers_whole_table_preloads(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+    assert c._rank_tables == {} and c._preloads == {} and c._name_index == {}
+
+    assert c.get_synonyms("warfarin") == ["coumadin"]
+    assert c._preloads.keys() == {"drugbank"} and set(c._name_index) == {"drugbank"}
+    assert c._rank_tables == {}
+
+
+def test_drugbank_lists_are_preloaded_and_match_sql(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+    preloaded = (c.get_synonyms("Warfarin"), c.get_drug_targets("warfarin"), c.get_drug_targets(["warfarin", "nothing"]))
+
+    c._drugbank_lists = None
+
+    assert preloaded == (c.get_synonyms("Warfarin"), c.get_drug_targets("warfarin"), c.get_drug_targets(["warfarin", "nothing"]))
+    assert preloaded[0] == ["coumadin"]
+    assert preloaded[2] == {"warfarin": ["VKORC1", "CYP2C9"], "nothing": []}
+
+
+def test_clients_query_through_their_own_cursors(tiny_parquet_dir):
+    first = _tiny_client(tiny_parquet_dir)
+    second = _tiny_client(tiny_parquet_dir)
+
+    assert first._connection is second._connection
+    assert first._con is not second._con and first._con is not first._connection
+    assert first.get_interaction_score("warfarin", "fluconazole") == second.get_interaction_score("fluconazole", "warfarin") == 3.0
+
+
+
+def test_each_thread_queries_through_its_own_cursor(tiny_parquet_dir):
+    from concurrent.futures import ThreadPoolExecutor
+
+    c = _tiny_client(tiny_parquet_dir)
+
+    def lookup(pair):
+        c._lookup_cache.clear()
+        return c._con, c.get_interaction_score(*pair)
+
+    pairs = [("warfarin", "fluconazole"), ("fluconazole", "warfarin")] * 8
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lookup, pairs))
+
+    assert {score for _, score in results} == {3.0}
+    assert all(con is not c._con for con, _ in results)
+
+def test_side_effect_lookups_use_prepared_statements(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+    c._side_effect_index = None  # take the SQL path, as for TwoSides too large to preload
+    c._con = _CountingConnection(c._con)
+
+    assert c.get_side_effects("warfarin", top_k=1) == ["bleeding"]
+    assert c.get_side_effects("fluconazole", "Warfarin", min_prr=1.5) == ["bleeding"]
+
+    assert c.get_side_effects("warfarin", "fluconazole", min_prr=1.5) == ["bleeding"]  # memoized, either order
+
+    assert c._con.statements == [
+        "EXECUTE q_side_effects_single('warfarin', 1.0, 1);",
+        "EXECUTE q_side_effects_pair('fluconazole', 'warfarin', 1.5, 20);",
+    ]
+
+
+def test_lookup_memo_remembers_misses(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+    c._con = _CountingConnection(c._con)
+
+    c._drugbank_lists = None  # take the SQL path, as for a DrugBank too large to preload
+
+    assert c.get_synonyms("nothing") == []
+    assert c.get_synonyms("nothing") == []
+
+    assert c._lookup_cache[("q_drugbank_synonyms", "nothing")] is None
+    assert sum("EXECUTE q_drugbank_synonyms" in sql for sql in c._con.statements) == 1
+
+
+@pytest.mark.parametrize("drug", ["warfarin", "sodium", "rfarin s", "fluconazole", "x_y", "missing"])
+def test_preloaded_rank_partial_match_agrees_with_sql_like(tiny_parquet_dir, drug):
+    c = _tiny_client(tiny_parquet_dir)
+
+    in_memory = c._rank_like("dilirank", drug)
+    via_sql = c._execute_prepared("q_dilirank_like", f"%{drug}%")
+
+    assert in_memory == via_sql
+
+
+def test_batch_rank_lookups_match_single_drug_results(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+    drugs = ["Warfarin", "fluconazole", "__none__", "warfarin"]
+
+    assert c.get_dict_rank(drugs) == {"Warfarin": "mild", "fluconazole": "moderate", "__none__": "unknown", "warfarin": "mild"}
+    assert c.get_dili_risk(drugs) == {"Warfarin": "unknown", "fluconazole": "high", "__none__": "unknown", "warfarin": "unknown"}
+    assert c.get_diqt_score(drugs) == {"Warfarin": None, "fluconazole": 0.9, "__none__": None, "warfarin": None}
+    assert c.get_drug_targets(drugs) == {"Warfarin": ["VKORC1", "CYP2C9"], "fluconazole": [], "__none__": [], "warfarin": ["VKORC1", "CYP2C9"]}
+
+
+@pytest.mark.parametrize("arrow", [True, False])
+def test_batch_queries_agree_with_and_without_arrow(tiny_parquet_dir, monkeypatch, arrow):
+    import src.retrieval.duckdb_query as dq
+
+    monkeypatch.setattr(dq, "HAS_ARROW", arrow, raising=True)
+    c = _tiny_client(tiny_parquet_dir)
+
+    assert c.get_dict_rank(["warfarin", "fluconazole", "nope"]) == {"warfarin": "mild", "fluconazole": "moderate", "nope": "unknown"}
+    assert c.get_side_effects_batch(["warfarin", "ibuprofen"], min_prr=1.0) == {
+        "warfarin": ["bleeding", "bruising"],
+        "ibuprofen": ["nausea"],
+    }
+    assert c.get_drug_targets(["__none__"]) == {"__none__": []}
+
+
+@pytest.mark.parametrize("score, severity, dili", [
+    (None, None, None),
+    (0.0, "low", "low"),
+    (0.099, "low", "low"),
+    (0.1, "mild", "low"),
+    (0.4, "moderate", "medium"),
+    (0.69, "moderate", "medium"),
+    (0.7, "severe", "high"),
+])
+def test_band_labels_are_bucketed_in_sql(score, severity, dili):
+    duckdb = pytest.importorskip("duckdb")
+    import src.retrieval.duckdb_query as dq
+
+    row = duckdb.connect().execute(
+        f"SELECT {dq._band_case_sql('s', dq._DICT_RANK_BANDS)}, {dq._band_case_sql('s', dq._DILI_RISK_BANDS)} "
+        "FROM (SELECT CAST(? AS DOUBLE) AS s)",
+        [score],
+    ).fetchone()
+
+    assert row == (severity, dili)
+
+
+@pytest.mark.parametrize("preloaded", [True, False])
+def test_all_risks_match_single_score_lookups(tiny_parquet_dir, monkeypatch, preloaded):
+    import src.retrieval.duckdb_query as dq
+
+    if not preloaded:
+        monkeypatch.setattr(dq, "_LOOKUP_CACHE_MAX", 0, raising=True)
+    c = _tiny_client(tiny_parquet_dir)
+
+    for drug in ["Warfarin", "fluconazole", "__none__", ""]:
+        assert c.get_all_risks(drug) == (
+            c.get_dictrank_score(drug),
+            c.get_dilirank_score(drug),
+            c.get_diqt_score(drug),
+        )
+    assert c.get_all_risks("warfarin") == (0.2, 0.5, None)
+
+
+def test_unpreloaded_score_lookup_is_one_statement(tiny_parquet_dir, monkeypatch):
+    import src.retrieval.duckdb_query as dq
+
+    monkeypatch.setattr(dq, "_LOOKUP_CACHE_MAX", 0, raising=True)  # nothing preloads
+    c = _tiny_client(tiny_parquet_dir)
+    c._con = _CountingConnection(c._con)
+
+    assert c.get_dilirank_score("warfarin") == 0.5  # exact miss -> partial hit
+    assert c.get_dict_rank("fluconazole") == "moderate"
+    assert c.get_diqt_score("nope") is None
+
+    assert [sql for sql in c._con.statements if "COUNT" not in sql] == [
+        "EXECUTE q_dilirank_best('warfarin', '%warfarin%');",
+        "EXECUTE q_dictrank_best('fluconazole', '%fluconazole%');",
+        "EXECUTE q_diqt_best('nope', '%nope%');",
+    ]
+
+
+def test_drug_enzymes_partial_match_resolves_names_in_memory(tiny_parquet_dir):
+    c = _tiny_client(tiny_parquet_dir)
+    c._con = _CountingConnection(c._con)
+
+    exact = c.get_drug_enzymes("Warfarin")
+    partial = c.get_drug_enzymes("arfar")
+    exact["enzymes"].append("mutated")
+
+    assert partial == {
+        "enzymes": ["CYP2C9"],
+        "enzyme_actions": ["substrate"],
+        "enzyme_action_map": [{"enzyme": "CYP2C9", "actions": ["substrate"]}],
+    }
+    assert c.get_drug_enzymes("warfarin")["enzymes"] == ["CYP2C9"]
+    assert c.get_drug_enzymes("nothing")["enzymes"] == []
+    assert not any("LIKE" in sql for sql in c._con.statements)
+
+
+def test_enzyme_action_map_is_parsed_at_load(tiny_parquet_dir):
+    con = init_duckdb_connection(tiny_parquet_dir, True, True)
+    c = _tiny_client(tiny_parquet_dir)
+
+    stored = con.execute("SELECT enzyme_action_map FROM drugbank WHERE name_lower = 'warfarin'").fetchone()[0]
+    first = c.get_drug_enzymes("warfarin")
+    first["enzyme_action_map"][0]["actions"].append("mutated")
+
+    assert stored == [{"enzyme": "CYP2C9", "actions": ["substrate"]}]
+    assert c.get_drug_enzymes("warfarin")["enzyme_action_map"] == stored
+
+
+def test_drugbank_without_enzyme_action_map_registers_without_schema_probe(tiny_parquet_dir):
+    duckdb = pytest.importorskip("duckdb")
+    path = os.path.join(tiny_parquet_dir, "drugbank.parquet")
+    sql_path = path.replace("'", "''")
+    con = duckdb.connect()
+    con.execute(
+        f"COPY (SELECT * EXCLUDE (enzyme_action_map) FROM read_parquet('{sql_path}')) TO '{sql_path}.tmp' (FORMAT PARQUET)"
+    )
+    con.close()
+    os.replace(f"{path}.tmp", path)
+
+    c = _tiny_client(tiny_parquet_dir)
+
+    assert c.has_view("drugbank")
+    assert c.get_drug_enzymes("warfarin") == {
+        "enzymes": ["CYP2C9"],
+        "enzyme_actions": ["substrate"],
+        "enzyme_action_map": [],
+    }
+
+
+def test_side_effect_index_matches_single_drug_query(tiny_parquet_dir):
+    import duckdb
+
+    base = tiny_parquet_dir.replace("'", "''")
+    con = duckdb.connect()
+    con.execute(f"""
+        COPY (SELECT * FROM (VALUES
+            ('warfarin', 'bleeding', 5.0, 0.1),
+            ('warfarin', 'rash', NULL, 0.1),
+            ('warfarin', 'rash', 0.5, 0.1),
+            ('warfarin', 'nausea', 0.8, 0.1),
+            ('aspirin', 'tinnitus', 1.0, 0.2)
+        ) t(drug_name, side_effect, prr, mean_reporting_frequency)) TO '{base}/offsides.parquet' (FORMAT PARQUET)
+    """)
+    con.execute(f"""
+        COPY (SELECT * FROM (VALUES
+            ('warfarin', 'CID1', 'alopecia', 'label', 'C1'),
+            ('warfarin', 'CID1', 'bleeding', 'label', 'C2')
+        ) t(drug_name, stitch_id, side_effect, source_label, meddra_id))
+        TO '{base}/sider_label_side_effects.parquet' (FORMAT PARQUET)
+    """)
+    con.close()
+    c = DuckDBClient(tiny_parquet_dir, enable_drugbank=True, enable_duckdb=True, enable_sider_nsides_offsides=True)
+    assert c._side_effect_index is not None
+    indexes = {row[0] for row in c._con.execute("SELECT index_name FROM duckdb_indexes()").fetchall()}
+    assert {"offsides_drug_name_idx", "sider_label_side_effects_drug_name_idx"} <= indexes
+
+    for drug in ("warfarin", "aspirin", "fluconazole", "ibuprofen", "__none__"):
+        for min_prr in (0.0, 1.0, 2.5):
+            for top_k in (0, 1, 3, 20):
+                index = c._side_effect_index
+                indexed = c.get_side_effects(drug, top_k=top_k, min_prr=min_prr)
+                c._side_effect_index = None
+                assert indexed == c.get_side_effects(drug, top_k=top_k, min_prr=min_prr), (drug, min_prr, top_k)
+                c._side_effect_index = index
+    assert c.get_side_effects("warfarin", min_prr=1.0) == ["bleeding", "bruising", "rash", "alopecia"]
+
+
+def test_shared_client_is_reused_and_reports_init_failures():
+    from src.retrieval import duckdb_query as dq
+
+    class FakeClient:
+        def __init__(self, *a, **k):
+            pass
+
+    def failing_connect(*a, **k):
+        raise RuntimeError("no parquet")
+
+    caveats = []
+    first = dq.shared_client("unused", caveats, client_cls=FakeClient, connect=lambda *a, **k: None)
+    second = dq.shared_client("unused", caveats, client_cls=FakeClient, connect=failing_connect)
+
+    assert isinstance(first, FakeClient) and second is first
+    assert caveats == ["DuckDB init failed: no parquet"]
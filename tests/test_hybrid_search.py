@@ -4,13 +4,22 @@ Unit tests for hybrid search module.
 """
 
 import pytest
+import src.retrieval.hybrid_search as hs
 from src.retrieval.hybrid_search import (
     hybrid_search_drugs,
     hybrid_search_side_effects,
     adaptive_hybrid_search,
+    configure_query_cache,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_query_cache():
+    configure_query_cache(None)
+    yield
+    configure_query_cache(None)
+
+
 class TestHybridSearchDrugs:
     """Test cases for hybrid_search_drugs function."""
     
@@ -61,6 +70,24 @@ class TestHybridSearchDrugs:
         assert len(results) == 1
         assert results[0][0] == "warfarin"
     
+    def test_keyword_and_semantic_run_concurrently(self):
+        """Test that keyword and semantic searches overlap instead of running back to back."""
+        import threading
+
+        both_running = threading.Barrier(2, timeout=5)
+
+        def keyword_fn(query, k):
+            both_running.wait()
+            return [("warfarin", 1.0)]
+
+        def semantic_fn(query, k, threshold):
+            both_running.wait()
+            return [("coumadin", 0.9)]
+
+        results = hybrid_search_drugs("warfarin", keyword_fn, semantic_fn, top_k=5)
+
+        assert {r[0] for r in results} == {"warfarin", "coumadin"}
+    
     def test_top_k_limit(self):
         """Test that top_k limit is respected."""
         def keyword_fn(query, k):
@@ -105,6 +132,90 @@ class TestHybridSearchSideEffects:
         assert "hemorrhage" in effect_names or "bruising" in effect_names
 
 
+class TestQueryCache:
+    """Test cases for the hybrid search result cache."""
+    
+    def test_repeated_query_skips_backends(self):
+        """Test that case and whitespace variants of a query are served from the cache."""
+        calls = []
+        
+        def keyword_fn(query, k):
+            calls.append(query)
+            return [("warfarin", 1.0)]
+        
+        first = hybrid_search_drugs("Warfarin", keyword_fn, None, top_k=5)
+        second = hybrid_search_drugs("  warfarin ", keyword_fn, None, top_k=5)
+        third = hybrid_search_drugs("warfarin", keyword_fn, None, top_k=3)
+        
+        assert first == second == third
+        # Backends see the normalized query; only a different top_k searches again
+        assert calls == ["warfarin", "warfarin"]
+    
+    def test_cache_namespace_keys_per_call_closures(self):
+        """Test that rebuilt search functions share results under one cache namespace."""
+        calls = []
+
+        def search(namespace):
+            def keyword_fn(query, k):
+                calls.append(query)
+                return [("warfarin", 1.0)]
+            return hybrid_search_drugs("warfarin", keyword_fn, None, top_k=5, cache_namespace=namespace)
+
+        search("db-1")
+        search("db-1")
+        search("db-2")
+
+        assert calls == ["warfarin", "warfarin"]
+    
+    def test_semantic_failure_not_cached(self):
+        """Test that degraded results from a failed semantic search are not reused."""
+        calls = []
+        
+        def keyword_fn(query, k):
+            calls.append(query)
+            return ["bleeding"]
+        
+        def semantic_fn(query, k, threshold):
+            raise ValueError("Semantic search failed")
+        
+        hybrid_search_side_effects("bleeding", keyword_fn, semantic_fn, top_k=5)
+        hybrid_search_side_effects("bleeding", keyword_fn, semantic_fn, top_k=5)
+        
+        assert len(calls) == 2
+    
+    def test_similar_query_hits_with_embedder(self):
+        """Test that a close enough query reuses cached results when an embedder is set."""
+        vectors = {"warfarin": [1.0, 0.0], "warfarine": [0.99, 0.05], "aspirin": [0.0, 1.0]}
+        configure_query_cache(lambda text: vectors[text], similarity_threshold=0.95)
+        calls = []
+        
+        def keyword_fn(query, k):
+            calls.append(query)
+            return [(query, 1.0)]
+        
+        hybrid_search_drugs("warfarin", keyword_fn, None, top_k=5)
+        near = hybrid_search_drugs("warfarine", keyword_fn, None, top_k=5)
+        far = hybrid_search_drugs("aspirin", keyword_fn, None, top_k=5)
+        
+        assert near == [("warfarin", 1.0)]
+        assert far == [("aspirin", 1.0)]
+        assert calls == ["warfarin", "aspirin"]
+    
+    def test_expired_entries_are_refetched(self, monkeypatch):
+        """Test that entries older than the TTL are not returned."""
+        monkeypatch.setattr(hs._QUERY_CACHE, "ttl_seconds", -1.0)
+        calls = []
+        
+        def keyword_fn(query, k):
+            calls.append(query)
+            return [("warfarin", 1.0)]
+        
+        hybrid_search_drugs("warfarin", keyword_fn, None, top_k=5)
+        hybrid_search_drugs("warfarin", keyword_fn, None, top_k=5)
+        
+        assert len(calls) == 2
+
+
 class TestAdaptiveHybridSearch:
     """Test cases for adaptive_hybrid_search function."""
     
@@ -143,6 +254,23 @@ class TestAdaptiveHybridSearch:
         # Should expand if relevance is low
         assert metadata["final_k"] >= metadata["initial_k"]
     
+    def test_expansion_reranks_the_initial_pool(self):
+        """Test that expanding reuses the fetched candidates instead of querying again."""
+        calls = []
+        
+        def keyword_fn(query, k):
+            calls.append(k)
+            return [(f"drug{i}", 0.1) for i in range(k)]
+        
+        results, metadata = adaptive_hybrid_search(
+            "warfarin", keyword_fn, None, initial_k=5, min_relevance_threshold=0.5, max_k=20
+        )
+        
+        assert metadata["expanded"]
+        assert metadata["final_k"] == 10
+        assert len(results) == 10
+        assert calls == [20]
+    
     def test_no_expansion_when_quality_good(self):
         """Test that search doesn't expand when quality is good."""
         def keyword_fn(query, k):
@@ -161,6 +289,27 @@ class TestAdaptiveHybridSearch:
         # Should not expand if quality is good
         assert metadata["final_k"] == metadata["initial_k"] or not metadata["expanded"]
     
+    def test_each_backend_is_called_once_without_expansion(self):
+        """Test that result counts come from the search itself, not repeated calls."""
+        calls = []
+
+        def keyword_fn(query, k):
+            calls.append("keyword")
+            return [("warfarin", 1.0), ("aspirin", 0.9)]
+
+        def semantic_fn(query, k, threshold):
+            calls.append("semantic")
+            return [("coumadin", 0.95)]
+
+        results, metadata = adaptive_hybrid_search(
+            "warfarin", keyword_fn, semantic_fn, initial_k=5, min_relevance_threshold=0.1
+        )
+
+        assert sorted(calls) == ["keyword", "semantic"]
+        assert metadata["keyword_results_count"] == 2
+        assert metadata["semantic_results_count"] == 1
+        assert not metadata["expanded"]
+    
     def test_metadata_completeness(self):
         """Test that metadata contains all expected fields."""
         def keyword_fn(query, k):
@@ -43,6 +43,25 @@ def test_legacy_openfda_cache_is_copied_to_new_default(tmp_path, monkeypatch):
     assert old_file.exists()
 
 
+def test_session_pools_connections_and_retries_throttling(client):
+    adapter = client._session.get_adapter(OpenFDAClient.BASE_URL)
+
+    assert adapter._pool_maxsize == 10
+    assert adapter.max_retries.total == 3
+    assert 429 in adapter.max_retries.status_forcelist
+
+
+def test_request_returns_none_on_error_status(client, monkeypatch):
+    class Resp:
+        status_code = 503
+
+    calls = []
+    monkeypatch.setattr(client._session, "get", lambda *a, **k: calls.append(a) or Resp())
+
+    assert client._request({"search": "x"}) is None
+    assert len(calls) == 1
+
+
 def test_get_top_reactions_real(client):
     # Real API call for a common drug
     reactions = client.get_top_reactions('aspirin', top_k=5)
@@ -78,6 +97,41 @@ def test_fetch_openfda_summary_unknown(client):
     assert load_text(client.cache_dir, cache_key, ttl=client.ttl_seconds) == msg
 
 
+@pytest.mark.parametrize("raw", [
+    {"nausea": 9, "headache": 4, "rash": 4, "dizziness": 1},
+    {"dizziness": 1, "headache": 4, "nausea": 9, "rash": 4},
+])
+def test_top_reactions_ranked_by_count_whatever_the_cached_order(client, monkeypatch, raw):
+    monkeypatch.setattr(client, "_fetch_and_cache_counts", lambda q: raw)
+
+    assert client.get_top_reactions("aspirin", top_k=3) == [("nausea", 9), ("headache", 4), ("rash", 4)]
+
+
+def test_combination_fallback_reuses_single_drug_reaction_queries(client, monkeypatch):
+    keys = []
+
+    def fake_counts(q):
+        keys.append(q.cache_key)
+        if q.suffix == "combo":
+            return {}
+        return {"nausea": 5, "rash": 2} if q.drug == "a" else {"nausea": 3, "fever": 1}
+
+    monkeypatch.setattr(client, "_fetch_and_cache_counts", fake_counts)
+
+    assert client.get_combination_reactions("a", "b") == [("nausea", 3)]
+    single_keys = {FaersQuery("a", "patient.reaction.reactionmeddrapt.exact", suffix="reactions").cache_key,
+                   FaersQuery("b", "patient.reaction.reactionmeddrapt.exact", suffix="reactions").cache_key}
+    assert set(keys[1:]) == single_keys
+
+
+def test_age_distribution_buckets_into_smallest_bound(client, monkeypatch):
+    raw = {"4": 1, "18": 2, "19": 3, "70": 5, "90": 7, "unknown": 11}
+    monkeypatch.setattr(client, "_fetch_and_cache_counts", lambda q: raw)
+
+    assert client.get_age_distribution("aspirin", bins=[65, 18, 80]) == {"<= 18": 3, "<= 65": 3, "<= 80": 5}
+    assert client.get_age_distribution("aspirin") == raw
+
+
 def test_plot_helpers(client):
     fig1 = client.plot_top_reactions('aspirin', top_k=3)
     assert isinstance(fig1, go.Figure)
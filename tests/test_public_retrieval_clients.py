@@ -3,6 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+import pytest
+import requests
+
+from src.retrieval import kegg_client, reactome_client
 from src.retrieval.dailymed_client import DailyMedClient
 from src.retrieval.openfda_label_client import OpenFDALabelClient
 from src.retrieval.research_api_clients import (
@@ -14,6 +18,14 @@ from src.retrieval.research_api_clients import (
     StringDBClient,
 )
 from src.retrieval.rxnorm_client import RxNormClient
+from src.utils.caching import ResultCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_result_caches(monkeypatch):
+    # KEGG/Reactome keep results for the life of the process; don't let them leak across tests.
+    monkeypatch.setattr(kegg_client, "_RESULTS", ResultCache())
+    monkeypatch.setattr(reactome_client, "_RESULTS", ResultCache())
 
 
 @dataclass
@@ -302,3 +314,236 @@ def test_biogrid_client_is_credential_gated(tmp_path):
 
     assert payload["available"] is False
     assert payload["interactions"] == []
+
+
+def test_reactome_target_pathways_accept_lists_and_are_cached(monkeypatch):
+    from src.retrieval import reactome_client as rc
+
+    calls = []
+    monkeypatch.setattr(rc, "_fetch_protein_pathways", lambda uid: calls.append(uid) or [{"pathway_id": f"R-{uid}", "name": uid}])
+
+    first = rc.get_drug_target_pathways("warfarin", ["P1", "P2"])
+    second = rc.get_drug_target_pathways("warfarin", ["P1", "P2"])
+
+    assert first == [{"pathway_id": "R-P1", "name": "P1"}, {"pathway_id": "R-P2", "name": "P2"}]
+    assert second is first
+    assert calls == ["P1", "P2"]
+
+
+def test_reactome_empty_results_expire_and_names_are_normalized(monkeypatch):
+    from src.retrieval import reactome_client as rc
+
+    answers = [[], [{"pathway_id": "R-1"}]]  # no match yet, then the real answer
+    calls = []
+    monkeypatch.setattr(rc, "_search_pathways_by_name", lambda name, limit: calls.append(name) or answers[len(calls) - 1])
+
+    assert rc.search_pathways_by_name("Apoptosis") == []
+    assert rc.search_pathways_by_name(" apoptosis") == []  # empty answer kept briefly
+    rc._RESULTS.empty_ttl = -1.0
+    rc._RESULTS.clear()  # expired
+    assert rc.search_pathways_by_name("APOPTOSIS") == [{"pathway_id": "R-1"}]
+    assert rc.search_pathways_by_name("apoptosis") == [{"pathway_id": "R-1"}]
+
+    assert calls == ["apoptosis", "apoptosis"]
+
+
+def test_reactome_failed_requests_are_not_cached(monkeypatch):
+    from src.retrieval import reactome_client as rc
+
+    monkeypatch.setattr(rc, "REACTOME_RATE_LIMIT", 0.0)
+    calls = []
+
+    def fake_get(url, params=None, timeout=None):
+        calls.append(url)
+        if len(calls) == 1:
+            raise requests.ConnectionError("reactome down")
+        if "/query/mapping/uniprot/" in url:
+            return FakeResponse(200, [{"pathways": [{"stId": "R-HSA-1"}]}])
+        return FakeResponse(200, {"displayName": "Biological oxidations"})
+
+    monkeypatch.setattr(rc.requests, "get", fake_get)
+
+    assert rc.get_drug_target_pathways("warfarin", ["P11712"]) == []
+    pathways = rc.get_drug_target_pathways("warfarin", ["P11712"])
+
+    assert [p["pathway_name"] for p in pathways] == ["Biological oxidations"]
+    assert len(calls) == 3
+
+
+def test_kegg_pathways_fetch_each_pathway_name_once(monkeypatch, tmp_path):
+    from src.retrieval import kegg_client as kg
+
+    monkeypatch.setenv("KEGG_CACHE_DIR", str(tmp_path / "kegg"))
+    monkeypatch.setenv("SQLITE_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    calls = []
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        if "/find/drug/" in url:
+            return FakeResponse(200, {}, "dr:D00564\twarfarin\ndr:D01412\twarfarin sodium\n")
+        if "/link/pathway/" in url:
+            return FakeResponse(200, {}, f"{url.rsplit('/', 1)[1]}\tpath:map00980\n")
+        return FakeResponse(200, {}, "ENTRY       map00980  Pathway\nNAME        Metabolism of xenobiotics by cytochrome P450\n///\n")
+
+    monkeypatch.setattr(kg._SESSION, "get", fake_get)
+    monkeypatch.setattr(kg, "KEGG_RATE_LIMIT", 0.0)
+
+    pathways = kg.get_drug_pathways("warfarin-test")
+
+    assert [p["drug_id"] for p in pathways] == ["dr:D00564", "dr:D01412"]
+    assert {p["pathway_id"] for p in pathways} == {"path:map00980"}
+    assert {p["pathway_name"] for p in pathways} == {"Metabolism of xenobiotics by cytochrome P450"}
+    assert sum("/get/path:map00980" in url for url in calls) == 1
+
+
+def test_kegg_rate_limit_only_sleeps_when_requests_are_close(monkeypatch):
+    from src.retrieval import kegg_client as kg
+
+    sleeps = []
+    monkeypatch.setattr(kg.time, "sleep", sleeps.append)
+    monkeypatch.setattr(kg, "_next_allowed", 0.0)
+
+    kg._rate_limit()
+    kg._rate_limit()
+
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= kg.KEGG_RATE_LIMIT
+
+
+def test_kegg_responses_persist_across_processes(monkeypatch, tmp_path):
+    from src.retrieval import kegg_client as kg
+
+    monkeypatch.setenv("KEGG_CACHE_DIR", str(tmp_path / "kegg"))
+    monkeypatch.setenv("SQLITE_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    calls = []
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        return FakeResponse(200, {}, "ENTRY       map00982  Pathway\nNAME        Drug metabolism - cytochrome P450\n///\n")
+
+    monkeypatch.setattr(kg._SESSION, "get", fake_get)
+    monkeypatch.setattr(kg, "KEGG_RATE_LIMIT", 0.0)
+
+    first = kg.get_pathway_name("path:map00982")
+    # A fresh process starts with empty in-memory caches
+    monkeypatch.setattr(kg, "_RESULTS", ResultCache())
+    second = kg.get_pathway_name("path:map00982")
+
+    assert first == second == "Drug metabolism - cytochrome P450"
+    assert len(calls) == 1
+
+
+def test_kegg_names_are_fetched_ten_ids_per_request(monkeypatch, tmp_path):
+    from src.retrieval import kegg_client as kg
+
+    monkeypatch.setenv("KEGG_CACHE_DIR", str(tmp_path / "kegg"))
+    monkeypatch.setenv("SQLITE_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(kg, "KEGG_RATE_LIMIT", 0.0)
+    calls = []
+
+    def fake_get(url, timeout=None):
+        ids = url.rsplit("/", 1)[1].split("+")
+        calls.append(ids)
+        blocks = [
+            f"ENTRY       EC {i.split(':', 1)[1]}    Enzyme\nNAME        enzyme {i.split(':', 1)[1]};\n            alias\n///"
+            for i in ids
+            if i != "ec:9.9.9.9"
+        ]
+        return FakeResponse(200, {}, "\n".join(blocks) + "\n")
+
+    monkeypatch.setattr(kg._SESSION, "get", fake_get)
+    ids = [f"1.1.1.{n}" for n in range(11)] + ["ec:9.9.9.9"]
+
+    names = kg._batch_get_names(ids, "enzyme")
+
+    assert sorted(len(chunk) for chunk in calls) == [2, 10]
+    assert names["1.1.1.0"] == "enzyme 1.1.1.0;"
+    assert names["ec:9.9.9.9"] == "ec:9.9.9.9"
+    assert kg.get_enzyme_name("ec:1.1.1.3") == "enzyme 1.1.1.3;"
+    assert len(calls) == 2
+
+
+def test_kegg_common_pathways_keeps_distinct_entries_in_order(monkeypatch):
+    from src.retrieval import kegg_client as kg
+
+    pathways = {
+        "a": [
+            {"drug_id": "dr:A", "pathway_id": "path:1", "pathway_name": "one"},
+            {"drug_id": "dr:A", "pathway_id": "path:2", "pathway_name": "two"},
+        ],
+        "b": [
+            {"drug_id": "dr:B", "pathway_id": "path:1", "pathway_name": "one"},
+            {"drug_id": "dr:A", "pathway_id": "path:1", "pathway_name": "one"},
+        ],
+    }
+    monkeypatch.setattr(kg, "get_drug_pathways", lambda drug: pathways[drug])
+
+    common = kg.get_common_pathways("a", "b")
+
+    assert common == [pathways["a"][0], pathways["b"][0]]
+
+
+def test_kegg_metabolism_pathway_keeps_metabolism_related_names(monkeypatch):
+    from src.retrieval import kegg_client as kg
+
+    names = ["Metabolism of xenobiotics by cytochrome P450", "Drug metabolism - CYP", "Calcium signaling", None]
+    monkeypatch.setattr(kg, "get_drug_pathways", lambda drug: [{"pathway_id": str(i), "pathway_name": n} for i, n in enumerate(names)])
+    monkeypatch.setattr(kg, "get_drug_enzymes", lambda drug: [])
+
+    result = kg.get_metabolism_pathway("warfarin")
+
+    assert [p["pathway_id"] for p in result["pathways"]] == ["0", "1"]
+
+
+def test_kegg_failed_requests_are_not_cached(monkeypatch, tmp_path):
+    from src.retrieval import kegg_client as kg
+
+    monkeypatch.setenv("KEGG_CACHE_DIR", str(tmp_path / "kegg"))
+    monkeypatch.setattr(kg, "KEGG_RATE_LIMIT", 0.0)
+    calls = []
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        if len(calls) == 1:
+            raise requests.ConnectionError("KEGG down")
+        if "/find/drug/" in url:
+            return FakeResponse(200, {}, "dr:D00564\twarfarin\n")
+        if "/link/" in url:
+            linked = "path:map00980" if "/link/pathway/" in url else "ec:1.14.14.1"
+            return FakeResponse(200, {}, f"dr:D00564\t{linked}\n")
+        entry = "map00980" if "path:" in url else "EC 1.14.14.1"
+        return FakeResponse(200, {}, f"ENTRY       {entry}    Entry\nNAME        Drug metabolism - cytochrome P450\n///\n")
+
+    monkeypatch.setattr(kg._SESSION, "get", fake_get)
+
+    assert kg.get_drug_pathways("warfarin") == []
+    pathways = kg.get_drug_pathways(" Warfarin")
+    enzymes = kg.get_drug_enzymes("warfarin")
+
+    assert [p["pathway_id"] for p in pathways] == ["path:map00980"]
+    assert [e["enzyme_id"] for e in enzymes] == ["ec:1.14.14.1"]
+    assert len(calls) == 6  # the failed find, one find (then on disk), and link + get per lookup
+    assert kg.get_drug_pathways("warfarin") is pathways
+    assert len(calls) == 6
+
+
+def test_kegg_entry_names_take_the_first_name_line_of_each_entry():
+    from src.retrieval import kegg_client as kg
+
+    text = (
+        "ENTRY       map00980                    Pathway\n"
+        "NAME        Metabolism of xenobiotics by cytochrome P450 (NAME test)\n"
+        "CLASS       Metabolism; Xenobiotics biodegradation and metabolism\n"
+        "///\n"
+        "ENTRY       EC 1.14.14.1                Enzyme\n"
+        "NAME        unspecific monooxygenase;\n"
+        "            microsomal monooxygenase;\n"
+        "///\n"
+        "ENTRY       map99999                    Pathway\n"
+        "///\n"
+    )
+
+    assert kg._entry_names(text) == {
+        "map00980": "Metabolism of xenobiotics by cytochrome P450 (NAME test)",
+        "1.14.14.1": "unspecific monooxygenase;",
+    }
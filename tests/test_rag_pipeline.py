@@ -21,6 +21,7 @@ def clean_cache(tmp_path, monkeypatch):
     monkeypatch.setattr(rp, "CACHE_DIR", str(cache_dir), raising=True)
     monkeypatch.setattr(rp, "CTX_DIR", str(ctx_dir), raising=True)
     monkeypatch.setattr(rp, "RESP_DIR", str(resp_dir), raising=True)
+    monkeypatch.setenv("SQLITE_CACHE_PATH", str(cache_dir / "infermed_cache.sqlite"))
 
     yield
     shutil.rmtree(cache_dir, ignore_errors=True)
@@ -323,6 +324,7 @@ def test_public_safe_rest_enrichment_fills_qlever_gap(monkeypatch):
     ctx = rp.retrieve_and_normalize("ADrug", "BDrug", parquet_dir="/dev/null", openfda_cache="/dev/null")
     mech = ctx["signals"]["mechanistic"]
 
+    assert ctx["caveats"].count("QLever RDF disabled for NVIDIA demo runtime.") == 1
     assert ctx["drugs"]["a"]["ids"]["pubchem_cid"] == "111"
     assert ctx["drugs"]["b"]["ids"]["pubchem_cid"] == "222"
     assert mech["pk_data_a"]["molecular_weight"] == 300.0
@@ -429,6 +431,7 @@ def test_research_enrichment_context_is_attached(monkeypatch):
 
 def test_context_cache_key_is_unordered(monkeypatch, tmp_path):
     _monkeypatch_retrievals(monkeypatch)
+    monkeypatch.setenv("CACHE_BACKEND", "file")
     # Use temp cache dirs already wired in fixture
     c1, k1 = rp.get_context_cached("A", "B")
     c2, k2 = rp.get_context_cached("B", "A")
@@ -438,6 +441,86 @@ def test_context_cache_key_is_unordered(monkeypatch, tmp_path):
     assert c1 == c2
 
 
+def test_sqlite_context_cache_skips_context_files(monkeypatch):
+    _monkeypatch_retrievals(monkeypatch)
+    monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+    calls = []
+    real_retrieve = rp.retrieve_and_normalize
+    monkeypatch.setattr(rp, "retrieve_and_normalize", lambda *a, **k: calls.append(a) or real_retrieve(*a, **k))
+
+    c1, k1 = rp.get_context_cached("A", "B")
+    c2, k2 = rp.get_context_cached("B", "A")
+
+    assert len(calls) == 1
+    assert k1 == k2 == "a_b"
+    assert c2["meta"]["pair_key"] == c1["meta"]["pair_key"]
+    assert os.listdir(rp.CTX_DIR) == []
+    assert rp.load_pkpd_from_cache("B", "A") == c2["pkpd"]
+    assert rp.clear_context_cache("A", "B") is True
+    assert rp.load_pkpd_from_cache("A", "B") is None
+
+
+def test_sqlite_context_clear_only_removes_the_exact_pair(monkeypatch):
+    _monkeypatch_retrievals(monkeypatch)
+    monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+
+    rp.get_context_cached("aspirin", "warfarin")
+    rp.get_context_cached("aspirin", "warfarin sodium")
+    rp.get_context_cached("a_pirin", "warfarin")
+
+    assert rp.clear_context_cache("aspirin", "warfarin") is True
+    assert rp.clear_context_cache("aspirin", "warfarin") is False
+    assert rp.load_pkpd_from_cache("aspirin", "warfarin") is None
+    assert rp.load_pkpd_from_cache("aspirin", "warfarin sodium") is not None
+    assert rp.load_pkpd_from_cache("a_pirin", "warfarin") is not None
+
+
+def test_retrieval_clients_are_reused_across_calls(monkeypatch):
+    _monkeypatch_retrievals(monkeypatch)
+    inits = []
+    base_db, base_ofda = rp.dq.DuckDBClient, rp.OpenFDAClient
+
+    class CountingDB(base_db):
+        def __init__(self, *a, **k):
+            inits.append("db")
+
+    class CountingOpenFDA(base_ofda):
+        def __init__(self, cache_dir=None):
+            inits.append("openfda")
+
+    monkeypatch.setattr(rp.dq, "DuckDBClient", CountingDB, raising=True)
+    monkeypatch.setattr(rp, "OpenFDAClient", CountingOpenFDA, raising=True)
+
+    rp.retrieve_and_normalize("A", "B")
+    rp.retrieve_and_normalize("C", "D")
+
+    assert sorted(inits) == ["db", "openfda"]
+
+
+
+def test_side_effect_search_results_are_reused_across_calls(monkeypatch):
+    from src.retrieval import hybrid_search
+
+    _monkeypatch_retrievals(monkeypatch)
+    hybrid_search.configure_query_cache(None)
+    searched = []
+
+    class CountingDB(rp.dq.DuckDBClient):
+        def get_side_effects(self, d, drug_b=None, **k):
+            if drug_b is None:
+                searched.append(d)
+            return super().get_side_effects(d, drug_b, **k)
+
+    monkeypatch.setattr(rp.dq, "DuckDBClient", CountingDB, raising=True)
+
+    first = rp.retrieve_and_normalize("ADrug", "BDrug")
+    searched_first = list(searched)
+    second = rp.retrieve_and_normalize("ADrug", "BDrug")
+
+    assert searched_first and searched == searched_first
+    assert second["signals"]["tabular"]["side_effects_a"] == first["signals"]["tabular"]["side_effects_a"]
+    hybrid_search.configure_query_cache(None)
+
 def test_run_rag_uses_llm_and_history(monkeypatch):
     _monkeypatch_retrievals(monkeypatch)
 
@@ -469,3 +552,69 @@ def test_run_rag_does_not_force_ollama_model_override(monkeypatch):
     rp.run_rag("A", "B", mode="Doctor")
 
     assert seen["model_name"] is None
+
+
+def test_jsonify_sets_sorts_nested_sets():
+    raw = {"pk_detail": {"roles": {"a": {"substrate": {"cyp3a4", "cyp2c9"}}}, "overlaps": {"inhibition": set()}}}
+    out = rp._jsonify_sets(raw)
+    assert out == {"pk_detail": {"roles": {"a": {"substrate": ["cyp2c9", "cyp3a4"]}}, "overlaps": {"inhibition": []}}}
+
+
+def test_context_cache_write_is_atomic(monkeypatch, tmp_path):
+    ctx_dir = tmp_path / "fresh" / "contexts"
+    monkeypatch.setattr(rp, "CTX_DIR", str(ctx_dir), raising=True)
+
+    path = rp._ctx_path("a_b")
+    rp._write_context_json(path, {"meta": {"version": rp.VERSION}, "pkpd": {"roles": ["cyp3a4"]}})
+
+    assert rp._read_context_file("a_b")["pkpd"]["roles"] == ["cyp3a4"]
+    assert os.listdir(ctx_dir) == ["a_b.json.gz"]  # no temp files left behind
+
+
+def test_pretty_context_cache_writes_plain_json(monkeypatch, tmp_path):
+    ctx_dir = tmp_path / "fresh" / "contexts"
+    monkeypatch.setattr(rp, "CTX_DIR", str(ctx_dir), raising=True)
+    path = rp._ctx_path("a_b")
+    rp._write_context_json(path, {"meta": {"version": rp.VERSION}})
+
+    monkeypatch.setenv("PRETTY_CONTEXT_CACHE", "true")
+    rp._write_context_json(path, {"meta": {"version": rp.VERSION}, "pkpd": {}})
+
+    assert os.listdir(ctx_dir) == ["a_b.json"]  # stale gzip copy removed
+    assert json.loads(open(path, encoding="utf-8").read())["pkpd"] == {}
+    assert rp._read_context_file("a_b")["pkpd"] == {}
+
+
+def test_side_effect_index_build_skipped_for_unchanged_terms(monkeypatch):
+    monkeypatch.setattr(rp, "_SE_INDEX_HASH", None, raising=True)
+    calls = []
+
+    class FakeSearcher:
+        def build_side_effect_index(self, side_effects, force_rebuild=False):
+            calls.append(list(side_effects))
+            return True
+
+    searcher = FakeSearcher()
+    rp._ensure_side_effect_index(searcher, ["Nausea", "Rash"])
+    rp._ensure_side_effect_index(searcher, ["Rash", "Nausea", "Rash"])
+    assert len(calls) == 1
+
+    rp._ensure_side_effect_index(searcher, ["Rash", "Headache"])
+    assert len(calls) == 2
+
+
+def test_normalize_chembl_side_thaws_read_only_enzymes():
+    side = rp._normalize_chembl_side({"enzymes": types.MappingProxyType({"inhibitor": ("cyp3a4",), "inducer": ()})})
+
+    assert side["enzymes"] == {"inhibitor": ["cyp3a4"], "inducer": []}
+    json.dumps(side)
+
+
+def test_normalize_chembl_side_accepts_empty_enrichment_templates():
+    from src.retrieval import chembl_client
+
+    side = rp._normalize_chembl_side(chembl_client._classify_enrichment({"inhibitor": ["cyp3a4"]}, []))
+
+    assert side["enzyme_strength"] == {"strong": [], "moderate": [], "weak": []}
+    assert side["chembl_validation"] == {"found": False, "matches": [], "mismatches": []}
+    json.dumps(side)
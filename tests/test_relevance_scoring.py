@@ -154,6 +154,20 @@ class TestScoreAndRankSideEffects:
         scored = score_and_rank_side_effects([], {}, None)
         assert scored == []
 
+    def test_kernel_path_matches_python_path(self, monkeypatch):
+        """Test that the array kernel ranks exactly like the per-item scorer."""
+        from src.utils import relevance_scoring as rs
+
+        side_effects = ["nausea", "bleeding", "rash", "bruising", "headache"]
+        prr_data = {"bleeding": 2.5, "bruising": 1.7, "nausea": 1.2, "rash": "1.6"}
+        semantic_scores = {"nausea": 0.9, "headache": 0.65}
+
+        monkeypatch.setattr(rs, "_SCORE_KERNEL", None)
+        expected = score_and_rank_side_effects(side_effects, {}, prr_data, semantic_scores)
+
+        monkeypatch.setattr(rs, "_SCORE_KERNEL", rs._side_effect_score_kernel)
+        assert score_and_rank_side_effects(side_effects, {}, prr_data, semantic_scores) == expected
+
 
 class TestScoreAndRankPathways:
     """Test cases for score_and_rank_pathways function."""
@@ -286,6 +300,19 @@ class TestMergeAndRerankEvidence:
         assert len(merged) == 2
         # item1 should rank higher (higher weighted score)
         assert merged[0][0] == "item1"
+    
+    def test_top_k_and_stable_ties(self):
+        """Test that top_k truncates and equal scores keep first-seen order."""
+        keyword_results = [("b", 1.0), ("a", 1.0), ("c", 0.5)]
+        semantic_results = [("d", 1.0)]
+        
+        merged = merge_and_rerank_evidence(
+            keyword_results, semantic_results, keyword_weight=0.6, semantic_weight=0.4, top_k=3
+        )
+        
+        assert [item for item, _ in merged] == ["b", "a", "d"]
+        assert merged[0][1] == pytest.approx(0.6)
+        assert isinstance(merged[0][1], float)
 
 
 if __name__ == "__main__":
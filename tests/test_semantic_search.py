@@ -134,6 +134,20 @@ class TestSemanticSearcher:
         assert results[0][0] == "bleeding"  # Should find itself first
         assert results[0][1] > 0.9
     
+    def test_search_similar_side_effects_batch(self, searcher):
+        """Test that batched side effect search matches per-query search."""
+        side_effects = ["bleeding", "bruising", "nausea", "headache"]
+        searcher.build_side_effect_index(side_effects, force_rebuild=True)
+        queries = ["bleeding", "", "nausea"]
+        
+        batch = searcher.search_similar_side_effects_batch(queries, top_k=2, threshold=0.5)
+        
+        assert len(batch) == 3
+        assert batch[1] == []
+        for query, results in zip(queries, batch):
+            single = searcher.search_similar_side_effects(query, top_k=2, threshold=0.5)
+            assert [name for name, _ in results] == [name for name, _ in single]
+    
     def test_duplicate_drug_names(self, searcher):
         """Test that duplicate drug names are handled correctly."""
         drug_names = ["warfarin", "aspirin", "warfarin", "aspirin", "ibuprofen"]
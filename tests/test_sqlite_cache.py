@@ -22,6 +22,19 @@ def test_sqlite_cache_roundtrip_text(tmp_path):
     assert cache.get_text("summary:drug") == "cached summary"
 
 
+def test_sqlite_cache_reuses_connection_per_thread(tmp_path):
+    import threading
+
+    cache = SQLiteCache(tmp_path / "cache.sqlite")
+    other = []
+    worker = threading.Thread(target=lambda: other.append(cache._connect()))
+    worker.start()
+    worker.join()
+
+    assert cache._connect() is cache._connect()
+    assert other[0] is not cache._connect()
+
+
 def test_sqlite_cache_ttl_expiry(tmp_path, monkeypatch):
     cache = SQLiteCache(tmp_path / "cache.sqlite")
     cache.set_json("old", {"value": True})
@@ -43,3 +56,25 @@ def test_file_cache_helpers_can_use_sqlite_backend(tmp_path, monkeypatch):
     assert load_json(tmp_path / "openfda", "Warfarin") == {"ok": True}
     assert load_text(tmp_path / "openfda", "summary") == "hello"
     assert sqlite_path.exists()
+
+
+def test_file_cache_helpers_share_one_sqlite_store(tmp_path, monkeypatch):
+    from src.utils import caching
+
+    monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_CACHE_PATH", str(tmp_path / "infermed_cache.sqlite"))
+
+    assert caching._sqlite_cache() is caching._sqlite_cache()
+
+
+def test_cached_nan_still_round_trips(tmp_path, monkeypatch):
+    import math
+
+    monkeypatch.setenv("CACHE_BACKEND", "file")
+    cache = SQLiteCache(tmp_path / "cache.sqlite")
+    cache.set_json("scores", {"prr": float("nan"), "n": 3})
+    save_json(tmp_path / "files", "scores", {"prr": float("nan"), "n": 3})
+
+    for loaded in (cache.get_json("scores"), load_json(tmp_path / "files", "scores")):
+        assert math.isnan(loaded["prr"])
+        assert loaded["n"] == 3